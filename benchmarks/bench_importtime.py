@@ -0,0 +1,77 @@
+"""
+Measures how long `import yyyy_mm_dd` takes on a fresh interpreter, using the
+numbers reported by `python -X importtime`, and checks that no heavy optional
+dependency (dateutil, numpy) is pulled in by the import
+
+    python benchmarks/bench_importtime.py
+    python benchmarks/bench_importtime.py --runs 50 --max-us 30000
+
+The bytecode is compiled upfront so only the import itself is measured, and the
+median of the runs is reported to smooth out the noise of starting processes.
+With --max-us the script exits with an error when the median goes above it, so
+it can be used to catch regressions on CI
+"""
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+MODULE = "yyyy_mm_dd"
+
+FORBIDDEN = ("dateutil", "numpy", "pandas")
+
+CHECK = "import sys, %s; print(','.join(m for m in sys.modules if m.split('.')[0] in %r))" % (MODULE, FORBIDDEN)
+
+
+def measure() -> dict:
+    """
+    Runs one import on a new interpreter and returns the cumulative microseconds of
+    each module imported, as reported by -X importtime
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % MODULE],
+        cwd=ROOT, env=env, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--max-us", type=int, default=None)
+    args = parser.parse_args()
+
+    compileall.compile_dir(os.path.join(ROOT, MODULE), quiet=1)
+
+    forbidden = subprocess.run(
+        [sys.executable, "-c", CHECK], cwd=ROOT, stdout=subprocess.PIPE,
+        universal_newlines=True, check=True).stdout.strip()
+    if forbidden:
+        sys.exit("import %s should not import %s" % (MODULE, forbidden))
+
+    runs = [measure() for _ in range(args.runs)]
+    names = [name for name in runs[0] if name == MODULE or name.startswith(MODULE + ".")]
+    print("%-24s %12s %12s" % ("module", "median us", "min us"))
+    for name in names:
+        values = [run[name] for run in runs if name in run]
+        print("%-24s %12.0f %12d" % (name, statistics.median(values), min(values)))
+
+    median = statistics.median(run[MODULE] for run in runs)
+    if args.max_us is not None and median > args.max_us:
+        sys.exit("import %s took %.0fus, above the limit of %dus" % (MODULE, median, args.max_us))
+
+
+if __name__ == "__main__":
+    main()
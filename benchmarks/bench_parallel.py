@@ -0,0 +1,69 @@
+"""
+Measures how parallel_map and the workers option of the _many functions scale from 1
+worker up to the number of cores, on a few million values
+
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --values 10000000 --mode thread
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from yyyy_mm_dd import move_yyyy_mm_many  # noqa: E402
+from yyyy_mm_dd.parallel import parallel_map, shutdown  # noqa: E402
+
+
+def _values(count: int) -> List[str]:
+    rng = random.Random(0)
+    start = datetime.datetime(2000, 1, 1)
+    return [(start + datetime.timedelta(seconds=rng.randrange(10 ** 9))).strftime("%Y-%m-%dT%H:%M:%S")
+            for _ in range(count)]
+
+
+def _best(function: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", type=int, default=2000000)
+    parser.add_argument("--mode", choices=("process", "thread"), default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, 16, 32, 64, cores} & set(range(1, cores + 1)))
+    values = _values(args.values)
+    scalar_values = values[:args.values // 10]
+
+    print("%d cores, %d values, %d for parallel_map" % (cores, len(values), len(scalar_values)))
+    print("%-32s %8s %10s %8s" % ("function", "workers", "seconds", "speedup"))
+    cases = [
+        ("parallel_map(move_yyyy_mm)",
+         lambda n: parallel_map("move_yyyy_mm", scalar_values, 1, workers=n, mode=args.mode)),
+        ("move_yyyy_mm_many",
+         lambda n: move_yyyy_mm_many(values, 1, workers=n)),
+    ]
+    for name, run in cases:
+        run(max(workers))  # starts the pool, so it is not counted
+        baseline = None
+        for n in workers:
+            seconds = _best(lambda: run(n), args.repeat)
+            baseline = baseline or seconds
+            print("%-32s %8d %10.3f %7.1fx" % (name, n, seconds, baseline / seconds))
+    shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Compares the fixed-width fast path of _parse against the regex + strptime path
+for each of the canonical input lengths
+
+    python benchmarks/bench_parse.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from yyyy_mm_dd import _parse, _parse_with_strptime  # noqa: E402
+
+INPUTS = [
+    ("2020", "%Y"),
+    ("2020-05", "%Y"),
+    ("2020-05-14", "%Y"),
+    ("2020-05-14T10", "%Y"),
+    ("2020-05-14T10:20", "%Y"),
+    ("2020-05-14T10:20:30", "%Y"),
+]
+
+NUMBER = 100000
+
+
+def main() -> None:
+    print("%-21s %14s %14s %8s" % ("input", "strptime ns", "fast path ns", "speedup"))
+    for value, at_least in INPUTS:
+        slow = min(timeit.repeat(lambda: _parse_with_strptime(value, at_least), number=NUMBER, repeat=3))
+        fast = min(timeit.repeat(lambda: _parse(value, at_least), number=NUMBER, repeat=3))
+        print("%-21s %14.0f %14.0f %7.1fx" % (
+            repr(value), slow / NUMBER * 1e9, fast / NUMBER * 1e9, slow / fast))
+
+
+if __name__ == "__main__":
+    main()
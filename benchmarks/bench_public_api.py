@@ -0,0 +1,94 @@
+"""
+Times every public function for each supported input shape with pytest-benchmark,
+and records the memory allocated by a single call on the extra_info of each result
+
+    python -m pytest benchmarks/bench_public_api.py --benchmark-max-time 0.1
+    python -m pytest benchmarks/bench_public_api.py -k "move_yyyy_mm and 10-chars"
+
+Combinations a function does not accept, like a 4-chars string on move_yyyy_mm_dd,
+are skipped. To compare two git revisions use benchmarks/compare_revisions.py, which
+runs this same file against a checkout of each revision set on YYYY_MM_DD_ROOT
+"""
+import datetime
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+import pytest
+
+sys.path.insert(0, os.environ.get("YYYY_MM_DD_ROOT", os.path.join(os.path.dirname(__file__), "..")))
+
+import yyyy_mm_dd  # noqa: E402
+
+SHAPES = [
+    ("4-chars", "2020"),
+    ("7-chars", "2020-05"),
+    ("10-chars", "2020-05-14"),
+    ("13-chars", "2020-05-14T10"),
+    ("16-chars", "2020-05-14T10:20"),
+    ("19-chars", "2020-05-14T10:20:30"),
+    ("date", datetime.date(2020, 5, 14)),
+    ("datetime", datetime.datetime(2020, 5, 14, 10, 20, 30)),
+]
+
+UNITS = ["yyyy", "yyyy_mm", "yyyy_mm_dd", "yyyy_mm_dd_hh", "yyyy_mm_dd_hh_mm", "yyyy_mm_dd_hh_mm_ss"]
+
+MOVE = ["move_" + unit for unit in UNITS]
+
+DIFF = ["diff_" + unit for unit in UNITS]
+
+BOUNDARIES = ["start_of_" + unit for unit in UNITS[:5]] + ["end_of_" + unit for unit in UNITS[:3]]
+
+EXTRACTORS = [
+    "yyyy", "yyyy_mm", "yyyy_mm_dd", "hh_mm_ss", "hh_mm",
+    "year", "month", "day", "hour", "to_yyyymmdd", "to_datetime",
+]
+
+CLOCK = ["today", "yesterday", "tomorrow", "now"]
+
+
+def _cases():
+    for name in MOVE:
+        for shape, value in SHAPES:
+            yield pytest.param(name, (value, 1), id="%s-%s" % (name, shape))
+    for name in DIFF:
+        for shape, value in SHAPES:
+            yield pytest.param(name, (value, value), id="%s-%s" % (name, shape))
+    for name in BOUNDARIES + EXTRACTORS:
+        for shape, value in SHAPES:
+            yield pytest.param(name, (value,), id="%s-%s" % (name, shape))
+    yield pytest.param("from_yyyymmdd", ("20200514",), id="from_yyyymmdd-8-chars")
+    for name in CLOCK:
+        yield pytest.param(name, (), id="%s-clock" % name)
+
+
+def _allocations(function: Callable, args: Tuple[Any, ...]) -> Tuple[int, int]:
+    """
+    Returns the peak and the retained bytes allocated by a single call, after a first
+    call to warm up caches and lazy initializations
+    """
+    function(*args)
+    tracemalloc.start()
+    try:
+        function(*args)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, retained
+
+
+@pytest.mark.parametrize("name, args", list(_cases()))
+def test_public_api(benchmark, name: str, args: Tuple[Any, ...]) -> None:
+    function = getattr(yyyy_mm_dd, name, None)
+    if function is None:
+        pytest.skip("%s is not available on this revision" % name)
+    try:
+        function(*args)
+    except (ValueError, TypeError, AttributeError) as e:
+        pytest.skip("unsupported input: %s" % e)
+
+    peak, retained = _allocations(function, args)
+    benchmark.extra_info["peak_bytes"] = peak
+    benchmark.extra_info["retained_bytes"] = retained
+    benchmark(function, *args)
@@ -0,0 +1,62 @@
+"""
+Compares the single-parse start_of_* / end_of_* functions against the previous
+implementations composed out of move_* and start_of_* calls
+
+    python benchmarks/bench_start_end.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from yyyy_mm_dd import (  # noqa: E402
+    end_of_yyyy,
+    end_of_yyyy_mm,
+    end_of_yyyy_mm_dd,
+    move_yyyy,
+    move_yyyy_mm,
+    move_yyyy_mm_dd,
+    move_yyyy_mm_dd_hh_mm_ss,
+    start_of_yyyy,
+    start_of_yyyy_mm,
+    start_of_yyyy_mm_dd,
+)
+
+
+def composed_end_of_yyyy(yyyy_mm_dd):
+    return move_yyyy_mm_dd(start_of_yyyy(move_yyyy(yyyy_mm_dd, 1)), -1)
+
+
+def composed_end_of_yyyy_mm(yyyy_mm_dd):
+    return move_yyyy_mm_dd(start_of_yyyy_mm(move_yyyy_mm(yyyy_mm_dd, 1)), -1)
+
+
+def composed_end_of_yyyy_mm_dd(yyyy_mm_dd):
+    return move_yyyy_mm_dd_hh_mm_ss(start_of_yyyy_mm_dd(move_yyyy_mm_dd(yyyy_mm_dd, 1)), -1)
+
+
+CASES = [
+    ("end_of_yyyy", composed_end_of_yyyy, end_of_yyyy),
+    ("end_of_yyyy_mm", composed_end_of_yyyy_mm, end_of_yyyy_mm),
+    ("end_of_yyyy_mm_dd", composed_end_of_yyyy_mm_dd, end_of_yyyy_mm_dd),
+]
+
+INPUTS = ["2020-05-14", "2020-05-14T10:20:30"]
+
+NUMBER = 50000
+
+
+def main() -> None:
+    print("%-18s %-21s %12s %12s %8s" % ("function", "input", "composed ns", "fused ns", "speedup"))
+    for name, composed, fused in CASES:
+        for value in INPUTS:
+            assert composed(value) == fused(value)
+            before = min(timeit.repeat(lambda: composed(value), number=NUMBER, repeat=3))
+            after = min(timeit.repeat(lambda: fused(value), number=NUMBER, repeat=3))
+            print("%-18s %-21s %12.0f %12.0f %7.1fx" % (
+                name, repr(value), before / NUMBER * 1e9, after / NUMBER * 1e9, before / after))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Runs benchmarks/bench_public_api.py against two git revisions and prints the
+throughput and allocations of each function side by side
+
+    python benchmarks/compare_revisions.py HEAD~1
+    python benchmarks/compare_revisions.py master my-branch -- -k move_yyyy_mm
+
+The first revision is the baseline, the second defaults to the current working tree.
+Each revision is checked out on a temporary git worktree, while the benchmark file
+always comes from the working tree so both sides measure exactly the same cases.
+Anything after -- is forwarded to pytest
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+BENCHMARK = os.path.join(ROOT, "benchmarks", "bench_public_api.py")
+
+
+def run(revision: Optional[str], workdir: str, pytest_args: List[str]) -> Dict[str, dict]:
+    """
+    Benchmarks one revision, None being the working tree, and returns the results by
+    test name
+    """
+    checkout = ROOT
+    if revision is not None:
+        checkout = os.path.join(workdir, "checkout")
+        subprocess.run(["git", "worktree", "add", "--detach", "--quiet", checkout, revision],
+                       cwd=ROOT, check=True)
+    output = os.path.join(workdir, "results.json")
+    try:
+        env = dict(os.environ, YYYY_MM_DD_ROOT=checkout)
+        subprocess.run([sys.executable, "-m", "pytest", BENCHMARK, "-q", "-p", "no:cacheprovider",
+                        "--benchmark-json", output] + pytest_args,
+                       cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    finally:
+        if revision is not None:
+            subprocess.run(["git", "worktree", "remove", "--force", checkout], cwd=ROOT, check=True)
+    with open(output) as f:
+        return {result["name"]: result for result in json.load(f)["benchmarks"]}
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    pytest_args = []  # type: List[str]
+    if "--" in argv:
+        pytest_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("revision", nargs="?", default=None)
+    args = parser.parse_args(argv)
+    pytest_args = pytest_args or ["--benchmark-max-time", "0.1"]
+
+    with tempfile.TemporaryDirectory() as before, tempfile.TemporaryDirectory() as after:
+        baseline = run(args.baseline, before, pytest_args)
+        revision = run(args.revision, after, pytest_args)
+
+    print("%-52s %12s %12s %8s %10s %10s" % (
+        "benchmark", "before ops", "after ops", "speedup", "before B", "after B"))
+    for name in sorted(set(baseline) & set(revision)):
+        a, b = baseline[name], revision[name]
+        print("%-52s %12.0f %12.0f %7.2fx %10d %10d" % (
+            name, a["stats"]["ops"], b["stats"]["ops"], b["stats"]["ops"] / a["stats"]["ops"],
+            a["extra_info"].get("peak_bytes", 0), b["extra_info"].get("peak_bytes", 0)))
+    for name in sorted(set(baseline) ^ set(revision)):
+        print("%-52s only on %s" % (name, "before" if name in baseline else "after"))
+
+
+if __name__ == "__main__":
+    main()
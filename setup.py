@@ -14,5 +14,8 @@ setup(
     url="https://github.com/rogeriochaves/yyyy_mm_dd",
     license='MIT',
     python_requires='>=3.6',
-    install_requires=['python-dateutil'],
+    extras_require={
+        'numpy': ['numpy'], 'pandas': ['numpy', 'pandas'], 'arrow': ['numpy', 'pyarrow'],
+        'tz': ['backports.zoneinfo; python_version < "3.9"', 'tzdata'],
+    },
 )
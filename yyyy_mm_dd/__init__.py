@@ -1,8 +1,9 @@
+import bisect
 import datetime
-from dateutil.relativedelta import relativedelta
+import functools
 import re
 import math
-from typing import Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 
 def today() -> str:
@@ -12,7 +13,7 @@ def today() -> str:
     >>> today() == datetime.date.today().strftime('%Y-%m-%d')
     True
     """
-    return datetime.date.today().strftime("%Y-%m-%d")
+    return _clock_day(0)
 
 
 def yesterday() -> str:
@@ -22,7 +23,7 @@ def yesterday() -> str:
     >>> yesterday() == (datetime.date.today() - datetime.timedelta(1)).strftime('%Y-%m-%d')
     True
     """
-    return yyyy_mm_dd(move_yyyy_mm_dd(today(), -1))
+    return _clock_day(-1)
 
 
 def tomorrow() -> str:
@@ -32,7 +33,7 @@ def tomorrow() -> str:
     >>> tomorrow() == (datetime.date.today() + datetime.timedelta(1)).strftime('%Y-%m-%d')
     True
     """
-    return yyyy_mm_dd(move_yyyy_mm_dd(today(), 1))
+    return _clock_day(1)
 
 
 def now() -> str:
@@ -42,10 +43,34 @@ def now() -> str:
     >>> now() == datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
     True
     """
-    return datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    global _now_cache
+    current = _clock()
+    key = (current.toordinal(), current.hour, current.minute, current.second)
+    cached = _now_cache
+    if cached is None or cached[0] != key:
+        cached = (key, current.strftime("%Y-%m-%dT%H:%M:%S"))
+        _now_cache = cached
+    return cached[1]
 
 
-def move_yyyy(yyyy_mm_dd: Union[str, datetime.date], by: int) -> Union[str, datetime.date]:
+def set_clock(clock: Optional[Callable[[], datetime.datetime]]) -> None:
+    """
+    Replaces the clock used by today(), yesterday(), tomorrow() and now(), which should
+    return the current local datetime. Useful to freeze time on tests and backfills,
+    set it back to None to use the system clock again
+
+    >>> set_clock(lambda: datetime.datetime(2020, 2, 28, 23, 59, 59))
+    >>> today(), yesterday(), tomorrow(), now()
+    ('2020-02-28', '2020-02-27', '2020-02-29', '2020-02-28T23:59:59')
+    >>> set_clock(None)
+    >>> today() == datetime.date.today().strftime('%Y-%m-%d')
+    True
+    """
+    global _clock
+    _clock = clock or datetime.datetime.now
+
+
+def move_yyyy(yyyy_mm_dd: Union[str, datetime.date], by: int, tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Increases or decreases a date by a certain number of years
 
@@ -64,12 +89,19 @@ def move_yyyy(yyyy_mm_dd: Union[str, datetime.date], by: int) -> Union[str, date
     >>> move_yyyy(datetime.datetime(2020, 2, 14, 0, 0), 1)
     datetime.datetime(2021, 2, 14, 0, 0)
     """
+    if isinstance(yyyy_mm_dd, str) and tz is None:
+        moved = _move_months_native(yyyy_mm_dd, 4, by * 12)
+        if moved is not None:
+            return moved
+
     date, pattern = _parse(yyyy_mm_dd, at_least="%Y")
-    date += relativedelta(years=by)
+    if tz is not None:
+        return _from_wall(_add_months(_to_wall(date, tz), by * 12), tz, pattern)
+    date = _add_months(date, by * 12)
     return _strftime(date, pattern)
 
 
-def move_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date], by: int) -> Union[str, datetime.date]:
+def move_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date], by: int, tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Increases or decreases a date by a certain number of months
 
@@ -87,13 +119,57 @@ def move_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date], by: int) -> Union[str, d
     datetime.date(2020, 3, 14)
     >>> move_yyyy_mm(datetime.datetime(2020, 2, 14, 0, 0), 1)
     datetime.datetime(2020, 3, 14, 0, 0)
+    >>> move_yyyy_mm('2020-01-31T10:00:00+02:00', 1)
+    '2020-02-29T10:00:00+02:00'
     """
+    if isinstance(yyyy_mm_dd, str) and tz is None:
+        moved = _move_months_native(yyyy_mm_dd, 7, by)
+        if moved is not None:
+            return moved
+
     date, pattern = _parse(yyyy_mm_dd, at_least="%Y-%m")
-    date += relativedelta(months=by)
+    if tz is not None:
+        return _from_wall(_add_months(_to_wall(date, tz), by), tz, pattern)
+    date = _add_months(date, by)
     return _strftime(date, pattern)
 
 
-def move_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date], by: int) -> Union[str, datetime.date]:
+def move_yyyy_qq(yyyy_mm_dd: Union[str, datetime.date], by: int, tz: Optional[str] = None) -> Union[str, datetime.date]:
+    """
+    Increases or decreases a date by a certain number of quarters, the same as three times
+    as many months, or a quarter like 2020-Q2
+
+    >>> move_yyyy_qq('2020-11-30', 1)
+    '2021-02-28'
+    >>> move_yyyy_qq('2020-Q4', 1)
+    '2021-Q1'
+    >>> move_yyyy_qq(datetime.date(2020, 5, 14), -2)
+    datetime.date(2019, 11, 14)
+    """
+    months = _quarter_start(yyyy_mm_dd)
+    if months is not None:
+        return _format_quarter(months + 3 * by)
+    return move_yyyy_mm(yyyy_mm_dd, 3 * by, tz=tz)
+
+
+def move_yyyy_ww(yyyy_mm_dd: Union[str, datetime.date], by: int, tz: Optional[str] = None) -> Union[str, datetime.date]:
+    """
+    Increases or decreases a date by a certain number of weeks, or an ISO week like 2020-W53
+
+    >>> move_yyyy_ww('2020-12-31', 1)
+    '2021-01-07'
+    >>> move_yyyy_ww('2020-W53', 1)
+    '2021-W01'
+    >>> move_yyyy_ww(datetime.date(2020, 5, 14), -2)
+    datetime.date(2020, 4, 30)
+    """
+    start = _week_start(yyyy_mm_dd)
+    if start is not None:
+        return _format_week(start + 7 * by)
+    return move_yyyy_mm_dd(yyyy_mm_dd, 7 * by, tz=tz)
+
+
+def move_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date], by: int, tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Increases or decreases a date by a certain number of days
 
@@ -107,13 +183,27 @@ def move_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date], by: int) -> Union[str
     datetime.date(2020, 3, 1)
     >>> move_yyyy_mm_dd(datetime.datetime(2020, 2, 29, 0, 0), 1)
     datetime.datetime(2020, 3, 1, 0, 0)
+
+    With a tz, days are moved on the local time of the zone, keeping the time of the day
+    across daylight saving changes
+
+    >>> move_yyyy_mm_dd('2021-03-27T12:00:00', 1, tz='Europe/Berlin')
+    '2021-03-28T12:00:00+02:00'
     """
+    if isinstance(yyyy_mm_dd, str) and tz is None:
+        moved = _move_days_native(yyyy_mm_dd, by)
+        if moved is not None:
+            return moved
+
     date, pattern = _parse(yyyy_mm_dd, at_least="%Y-%m-%d")
-    date += relativedelta(days=by)
+    if tz is not None:
+        return _from_wall(_to_wall(date, tz) + datetime.timedelta(days=by), tz, pattern)
+    date += datetime.timedelta(days=by)
     return _strftime(date, pattern)
 
 
-def move_yyyy_mm_dd_hh(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by: int) -> Union[str, datetime.date]:
+def move_yyyy_mm_dd_hh(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by: int,
+                        tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Increases or decreases a datetime by a certain number of hours
 
@@ -125,13 +215,24 @@ def move_yyyy_mm_dd_hh(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by: i
     '2020-02-29T12:20:30'
     >>> move_yyyy_mm_dd_hh(datetime.datetime(2020, 2, 29, 10, 20, 30), 1)
     datetime.datetime(2020, 2, 29, 11, 20, 30)
+    >>> move_yyyy_mm_dd_hh('2020-12-31T23:00Z', 1)
+    '2021-01-01T00:00Z'
+
+    With a tz, hours are moved on elapsed time, so the local time can jump on daylight
+    saving changes
+
+    >>> move_yyyy_mm_dd_hh('2021-03-28T01:30:00', 1, tz='Europe/Berlin')
+    '2021-03-28T03:30:00+02:00'
     """
     date, pattern = _parse(yyyy_mm_dd_hh_mm_ss, at_least="%Y-%m-%dT%H")
-    date += relativedelta(hours=by)
+    if tz is not None:
+        return _from_utc(_to_utc(date, tz) + datetime.timedelta(hours=by), tz, pattern)
+    date += datetime.timedelta(hours=by)
     return _strftime(date, pattern)
 
 
-def move_yyyy_mm_dd_hh_mm(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by: int) -> Union[str, datetime.date]:
+def move_yyyy_mm_dd_hh_mm(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by: int,
+                           tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Increases or decreases a datetime by a certain number of minutes
 
@@ -145,11 +246,14 @@ def move_yyyy_mm_dd_hh_mm(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by
     datetime.datetime(2020, 2, 29, 10, 21, 30)
     """
     date, pattern = _parse(yyyy_mm_dd_hh_mm_ss, at_least="%Y-%m-%dT%H:%M")
-    date += relativedelta(minutes=by)
+    if tz is not None:
+        return _from_utc(_to_utc(date, tz) + datetime.timedelta(minutes=by), tz, pattern)
+    date += datetime.timedelta(minutes=by)
     return _strftime(date, pattern)
 
 
-def move_yyyy_mm_dd_hh_mm_ss(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by: int) -> Union[str, datetime.date]:
+def move_yyyy_mm_dd_hh_mm_ss(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], by: int,
+                              tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Increases or decreases a datetime by a certain number of seconds
 
@@ -161,11 +265,13 @@ def move_yyyy_mm_dd_hh_mm_ss(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime],
     datetime.datetime(2020, 2, 29, 10, 20, 31)
     """
     date, pattern = _parse(yyyy_mm_dd_hh_mm_ss, at_least="%Y-%m-%dT%H:%M:%S")
-    date += relativedelta(seconds=by)
+    if tz is not None:
+        return _from_utc(_to_utc(date, tz) + datetime.timedelta(seconds=by), tz, pattern)
+    date += datetime.timedelta(seconds=by)
     return _strftime(date, pattern)
 
 
-def diff_yyyy(a: Union[str, datetime.date], b: Union[str, datetime.date]) -> int:
+def diff_yyyy(a: Union[str, datetime.date], b: Union[str, datetime.date], tz: Optional[str] = None) -> int:
     """
     Returns the amount of years between date A and date B
 
@@ -184,10 +290,13 @@ def diff_yyyy(a: Union[str, datetime.date], b: Union[str, datetime.date]) -> int
     """
     date_a, _ = _parse(a, at_least="%Y")
     date_b, _ = _parse(b, at_least="%Y")
-    return relativedelta(date_b, date_a).years
+    if tz is not None or date_a.tzinfo is not None or date_b.tzinfo is not None:
+        date_a, date_b = _align(date_a, date_b, tz, wall=True)
+    months = _diff_months(date_a, date_b)
+    return months // 12 if months >= 0 else -(-months // 12)
 
 
-def diff_yyyy_mm(a: Union[str, datetime.date], b: Union[str, datetime.date]) -> int:
+def diff_yyyy_mm(a: Union[str, datetime.date], b: Union[str, datetime.date], tz: Optional[str] = None) -> int:
     """
     Returns the amount of months between date A and date B
 
@@ -202,10 +311,47 @@ def diff_yyyy_mm(a: Union[str, datetime.date], b: Union[str, datetime.date]) ->
     """
     date_a, _ = _parse(a, at_least="%Y-%m")
     date_b, _ = _parse(b, at_least="%Y-%m")
-    return relativedelta(date_b, date_a).years * 12 + relativedelta(date_b, date_a).months
+    if tz is not None or date_a.tzinfo is not None or date_b.tzinfo is not None:
+        date_a, date_b = _align(date_a, date_b, tz, wall=True)
+    return _diff_months(date_a, date_b)
 
 
-def diff_yyyy_mm_dd(a: Union[str, datetime.date], b: Union[str, datetime.date]) -> int:
+def diff_yyyy_qq(a: Union[str, datetime.date], b: Union[str, datetime.date], tz: Optional[str] = None) -> int:
+    """
+    Returns the amount of whole quarters, of three months, between date A and date B
+
+    >>> diff_yyyy_qq("2020-01-31", "2020-04-30")
+    1
+    >>> diff_yyyy_qq("2020-01-31", "2020-04-29")
+    0
+    >>> diff_yyyy_qq("2021-Q1", "2020-Q2")
+    -3
+    """
+    months = diff_yyyy_mm(_quarter_date(a), _quarter_date(b), tz=tz)
+    return months // 3 if months >= 0 else -(-months // 3)
+
+
+def diff_yyyy_ww(a: Union[str, datetime.date], b: Union[str, datetime.date], tz: Optional[str] = None) -> int:
+    """
+    Returns the amount of whole weeks, of seven days, between date A and date B
+
+    >>> diff_yyyy_ww("2020-05-14", "2020-05-28")
+    2
+    >>> diff_yyyy_ww("2020-05-28T10:00:00", "2020-05-15T10:00:00")
+    -1
+    >>> diff_yyyy_ww("2020-W53", "2021-W02")
+    2
+    """
+    ordinal_a = _date_ordinal(a)
+    ordinal_b = _date_ordinal(b)
+    if ordinal_a is not None and ordinal_b is not None:
+        days = ordinal_b - ordinal_a
+    else:
+        days = diff_yyyy_mm_dd(_week_date(a), _week_date(b), tz=tz)
+    return days // 7 if days >= 0 else -(-days // 7)
+
+
+def diff_yyyy_mm_dd(a: Union[str, datetime.date], b: Union[str, datetime.date], tz: Optional[str] = None) -> int:
     """
     Returns the amount of days between date A and date B
 
@@ -219,13 +365,18 @@ def diff_yyyy_mm_dd(a: Union[str, datetime.date], b: Union[str, datetime.date])
     0
     >>> diff_yyyy_mm_dd(datetime.date(2020, 2, 14), datetime.date(2020, 2, 16))
     2
+    >>> diff_yyyy_mm_dd('2021-03-28T00:00', '2021-03-29T00:00', tz='Europe/Berlin')
+    1
     """
     date_a, _ = _parse(a, at_least="%Y-%m-%d")
     date_b, _ = _parse(b, at_least="%Y-%m-%d")
+    if tz is not None or date_a.tzinfo is not None or date_b.tzinfo is not None:
+        date_a, date_b = _align(date_a, date_b, tz, wall=True)
     return (date_b - date_a).days
 
 
-def diff_yyyy_mm_dd_hh(a: Union[str, datetime.datetime], b: Union[str, datetime.datetime]) -> int:
+def diff_yyyy_mm_dd_hh(a: Union[str, datetime.datetime], b: Union[str, datetime.datetime],
+                        tz: Optional[str] = None) -> int:
     """
     Returns the amount of hours between datetime A and datetime B
 
@@ -239,13 +390,24 @@ def diff_yyyy_mm_dd_hh(a: Union[str, datetime.datetime], b: Union[str, datetime.
     0
     >>> diff_yyyy_mm_dd_hh(datetime.datetime(2020, 2, 14, 10, 20, 30), datetime.datetime(2020, 2, 14, 12, 20, 30))
     2
+    >>> diff_yyyy_mm_dd_hh('2020-01-01T10:00+02:00', '2020-01-01T10:00Z')
+    2
+    >>> diff_yyyy_mm_dd_hh('2021-03-28T00:00', '2021-03-29T00:00', tz='Europe/Berlin')
+    23
+    >>> diff_yyyy_mm_dd_hh('2020-01-01T10:00+02:00', '2020-01-01T10:00')
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not compare dates with and without UTC offset, you should provide both with offset or a tz
     """
     date_a, _ = _parse(a, at_least="%Y-%m-%dT%H")
     date_b, _ = _parse(b, at_least="%Y-%m-%dT%H")
+    if tz is not None or date_a.tzinfo is not None or date_b.tzinfo is not None:
+        date_a, date_b = _align(date_a, date_b, tz, wall=False)
     return math.floor((date_b - date_a).total_seconds() / 3600)
 
 
-def diff_yyyy_mm_dd_hh_mm(a: Union[str, datetime.datetime], b: Union[str, datetime.datetime]) -> int:
+def diff_yyyy_mm_dd_hh_mm(a: Union[str, datetime.datetime], b: Union[str, datetime.datetime],
+                           tz: Optional[str] = None) -> int:
     """
     Returns the amount of minutes between datetime A and datetime B
 
@@ -262,10 +424,13 @@ def diff_yyyy_mm_dd_hh_mm(a: Union[str, datetime.datetime], b: Union[str, dateti
     """
     date_a, _ = _parse(a, at_least="%Y-%m-%dT%H:%M")
     date_b, _ = _parse(b, at_least="%Y-%m-%dT%H:%M")
+    if tz is not None or date_a.tzinfo is not None or date_b.tzinfo is not None:
+        date_a, date_b = _align(date_a, date_b, tz, wall=False)
     return math.floor((date_b - date_a).total_seconds() / 60)
 
 
-def diff_yyyy_mm_dd_hh_mm_ss(a: Union[str, datetime.datetime], b: Union[str, datetime.datetime]) -> int:
+def diff_yyyy_mm_dd_hh_mm_ss(a: Union[str, datetime.datetime], b: Union[str, datetime.datetime],
+                              tz: Optional[str] = None) -> int:
     """
     Returns the amount of seconds between datetime A and datetime B
 
@@ -280,10 +445,59 @@ def diff_yyyy_mm_dd_hh_mm_ss(a: Union[str, datetime.datetime], b: Union[str, dat
     """
     date_a, _ = _parse(a, at_least="%Y-%m-%dT%H:%M:%S")
     date_b, _ = _parse(b, at_least="%Y-%m-%dT%H:%M:%S")
+    if tz is not None or date_a.tzinfo is not None or date_b.tzinfo is not None:
+        date_a, date_b = _align(date_a, date_b, tz, wall=False)
     return math.floor((date_b - date_a).total_seconds())
 
 
-def start_of_yyyy(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.date]:
+class DateDiff(NamedTuple):
+    """
+    Amount of each unit between two dates, as returned by the diff_* function of that
+    unit. Units finer than the dates have are None
+    """
+    years: int
+    months: Optional[int]
+    days: Optional[int]
+    hours: Optional[int]
+    minutes: Optional[int]
+    seconds: Optional[int]
+
+
+def diff_all(a: Union[str, datetime.date], b: Union[str, datetime.date], tz: Optional[str] = None) -> DateDiff:
+    """
+    Returns the amount of years, months, days, hours, minutes and seconds between date A
+    and date B, parsing each of them only once. Each unit is the total on its own, rounded
+    the same way as its diff_* function, not what is left after the bigger units
+
+    >>> diff_all("2020-01-31T10:00:00", "2021-03-01T09:30:00")
+    DateDiff(years=1, months=13, days=394, hours=9479, minutes=568770, seconds=34126200)
+    >>> diff_all("2020-02", "2019-01")
+    DateDiff(years=-1, months=-13, days=None, hours=None, minutes=None, seconds=None)
+    """
+    date_a, pattern_a = _parse(a, at_least="%Y")
+    date_b, pattern_b = _parse(b, at_least="%Y")
+    wall_a, wall_b = utc_a, utc_b = date_a, date_b
+    if tz is not None or date_a.tzinfo is not None or date_b.tzinfo is not None:
+        wall_a, wall_b = _align(date_a, date_b, tz, wall=True)
+        utc_a, utc_b = _align(date_a, date_b, tz, wall=False)
+
+    def has(at_least: str) -> bool:
+        return (pattern_a in ("date", "datetime") or at_least in pattern_a) and \
+            (pattern_b in ("date", "datetime") or at_least in pattern_b)
+
+    months = _diff_months(wall_a, wall_b)
+    seconds = (utc_b - utc_a).total_seconds()
+    return DateDiff(
+        months // 12 if months >= 0 else -(-months // 12),
+        months if has("%Y-%m") else None,
+        (wall_b - wall_a).days if has("%Y-%m-%d") else None,
+        math.floor(seconds / 3600) if has("%Y-%m-%dT%H") else None,
+        math.floor(seconds / 60) if has("%Y-%m-%dT%H:%M") else None,
+        math.floor(seconds) if has("%Y-%m-%dT%H:%M:%S") else None,
+    )
+
+
+def start_of_yyyy(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Returns first day of the year of a given date
 
@@ -294,15 +508,10 @@ def start_of_yyyy(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.
     >>> start_of_yyyy(datetime.date(2020, 5, 14))
     datetime.date(2020, 1, 1)
     """
-    date, pattern = _parse(yyyy_mm_dd, at_least="%Y")
-    date = datetime.datetime(date.year, 1, 1, 0, 0)
-    if pattern not in ["date", "datetime"]:
-        pattern = "%Y-%m-%d"
-
-    return _strftime(date, pattern)
+    return _boundary(yyyy_mm_dd, "%Y", ceiling=False, tz=tz)
 
 
-def start_of_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.date]:
+def start_of_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Returns first day of the month of a given date
 
@@ -313,15 +522,55 @@ def start_of_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, dateti
     >>> start_of_yyyy_mm(datetime.date(2020, 5, 14))
     datetime.date(2020, 5, 1)
     """
-    date, pattern = _parse(yyyy_mm_dd, at_least="%Y-%m")
-    date = datetime.datetime(date.year, date.month, 1, 0, 0)
-    if pattern not in ["date", "datetime"]:
-        pattern = "%Y-%m-%d"
+    return _boundary(yyyy_mm_dd, "%Y-%m", ceiling=False, tz=tz)
 
-    return _strftime(date, pattern)
+
+def start_of_yyyy_qq(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
+    """
+    Returns first day of the quarter of a given date
+
+    >>> start_of_yyyy_qq('2020-05-14')
+    '2020-04-01'
+    >>> start_of_yyyy_qq('2020-Q4')
+    '2020-10-01'
+    >>> start_of_yyyy_qq(datetime.date(2020, 12, 31))
+    datetime.date(2020, 10, 1)
+    """
+    months = _quarter_start(yyyy_mm_dd)
+    if months is None and isinstance(yyyy_mm_dd, str) and tz is None:
+        fields = _split_canonical(yyyy_mm_dd, 7)
+        if fields is not None:
+            months = fields[0] * 12 + (fields[1] - 1) // 3 * 3
+    if months is not None:
+        return _format_yyyy_mm_dd(months // 12, months % 12 + 1, 1)
+    return _boundary(yyyy_mm_dd, "%Y-%m", ceiling=False, tz=tz, unit="Q")
 
 
-def start_of_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.datetime]:
+def start_of_yyyy_ww(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
+    """
+    Returns the Monday of the ISO week of a given date
+
+    >>> start_of_yyyy_ww('2020-05-14')
+    '2020-05-11'
+    >>> start_of_yyyy_ww('2021-01-03T10:20:30')
+    '2020-12-28'
+    >>> start_of_yyyy_ww('2020-W53')
+    '2020-12-28'
+    >>> start_of_yyyy_ww(datetime.date(2020, 5, 14))
+    datetime.date(2020, 5, 11)
+    """
+    start = _week_start(yyyy_mm_dd)
+    if start is None and isinstance(yyyy_mm_dd, str) and tz is None:
+        fields = _split_canonical(yyyy_mm_dd, 10)
+        if fields is not None:
+            ordinal = _ordinal(*fields)
+            start = ordinal - (ordinal + 6) % 7
+    if start is not None:
+        return _format_yyyy_mm_dd(*_from_ordinal(start))
+    return _boundary(yyyy_mm_dd, "%Y-%m-%d", ceiling=False, tz=tz, unit="W")
+
+
+def start_of_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.datetime]:
     """
     Returns first datetime of the day of a given date
 
@@ -331,15 +580,13 @@ def start_of_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, dat
     '2020-05-14T00:00:00'
     >>> start_of_yyyy_mm_dd(datetime.date(2020, 5, 14))
     datetime.datetime(2020, 5, 14, 0, 0)
+    >>> start_of_yyyy_mm_dd('2021-03-28T22:30:00Z', tz='Europe/Berlin')
+    '2021-03-29T00:00:00+02:00'
     """
-    date, pattern = _parse(yyyy_mm_dd, at_least="%Y-%m-%d")
-    date = datetime.datetime(date.year, date.month, date.day, 0, 0)
-    if pattern in ["date", "datetime"]:
-        return date
-    return date.strftime("%Y-%m-%dT%H:%M:%S")
+    return _boundary(yyyy_mm_dd, "%Y-%m-%d", ceiling=False, tz=tz)
 
 
-def start_of_yyyy_mm_dd_hh(yyyy_mm_dd: Union[str, datetime.datetime]) -> Union[str, datetime.datetime]:
+def start_of_yyyy_mm_dd_hh(yyyy_mm_dd: Union[str, datetime.datetime], tz: Optional[str] = None) -> Union[str, datetime.datetime]:
     """
     Returns the start of the hour of a given datetime
 
@@ -347,15 +594,13 @@ def start_of_yyyy_mm_dd_hh(yyyy_mm_dd: Union[str, datetime.datetime]) -> Union[s
     '2020-05-14T13:00:00'
     >>> start_of_yyyy_mm_dd_hh(datetime.datetime(2020, 5, 14, 23, 59))
     datetime.datetime(2020, 5, 14, 23, 0)
+    >>> start_of_yyyy_mm_dd_hh('2020-05-14T13:25:10-03:00')
+    '2020-05-14T13:00:00-03:00'
     """
-    date, pattern = _parse(yyyy_mm_dd, at_least="%Y-%m-%dT%H")
-    date = datetime.datetime(date.year, date.month, date.day, date.hour, 0)
-    if pattern in ["date", "datetime"]:
-        return date
-    return date.strftime("%Y-%m-%dT%H:%M:%S")
+    return _boundary(yyyy_mm_dd, "%Y-%m-%dT%H", ceiling=False, tz=tz)
 
 
-def start_of_yyyy_mm_dd_hh_mm(yyyy_mm_dd: Union[str, datetime.datetime]) -> Union[str, datetime.datetime]:
+def start_of_yyyy_mm_dd_hh_mm(yyyy_mm_dd: Union[str, datetime.datetime], tz: Optional[str] = None) -> Union[str, datetime.datetime]:
     """
     Returns the same datetime but with seconds at 0
 
@@ -364,15 +609,10 @@ def start_of_yyyy_mm_dd_hh_mm(yyyy_mm_dd: Union[str, datetime.datetime]) -> Unio
     >>> start_of_yyyy_mm_dd_hh_mm(datetime.datetime(2020, 5, 14, 23, 59, 59))
     datetime.datetime(2020, 5, 14, 23, 59)
     """
-    date, pattern = _parse(yyyy_mm_dd, at_least="%Y-%m-%dT%H:%M")
-    date = datetime.datetime(date.year, date.month,
-                             date.day, date.hour, date.minute)
-    if pattern in ["date", "datetime"]:
-        return date
-    return date.strftime("%Y-%m-%dT%H:%M:%S")
+    return _boundary(yyyy_mm_dd, "%Y-%m-%dT%H:%M", ceiling=False, tz=tz)
 
 
-def end_of_yyyy(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.date]:
+def end_of_yyyy(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Returns last day of the year of a given date
 
@@ -382,13 +622,13 @@ def end_of_yyyy(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.da
     '2020-12-31'
     >>> end_of_yyyy(datetime.date(2020, 5, 14))
     datetime.date(2020, 12, 31)
+    >>> end_of_yyyy('9999-05-14')
+    '9999-12-31'
     """
-    date, _ = _parse(yyyy_mm_dd, at_least="%Y")
+    return _boundary(yyyy_mm_dd, "%Y", ceiling=True, tz=tz)
 
-    return move_yyyy_mm_dd(start_of_yyyy(move_yyyy(yyyy_mm_dd, 1)), -1)
 
-
-def end_of_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.date]:
+def end_of_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Returns last day of the month of a given date
 
@@ -398,12 +638,57 @@ def end_of_yyyy_mm(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime
     '2020-05-31'
     >>> end_of_yyyy_mm(datetime.date(2020, 5, 14))
     datetime.date(2020, 5, 31)
+    >>> end_of_yyyy_mm(datetime.datetime(2021, 2, 14, 10, 20))
+    datetime.datetime(2021, 2, 28, 0, 0)
+    """
+    return _boundary(yyyy_mm_dd, "%Y-%m", ceiling=True, tz=tz)
+
+
+def end_of_yyyy_qq(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
+    Returns last day of the quarter of a given date
 
-    return move_yyyy_mm_dd(start_of_yyyy_mm(move_yyyy_mm(yyyy_mm_dd, 1)), -1)
+    >>> end_of_yyyy_qq('2020-05-14')
+    '2020-06-30'
+    >>> end_of_yyyy_qq('2020-Q1')
+    '2020-03-31'
+    >>> end_of_yyyy_qq(datetime.date(2020, 12, 1))
+    datetime.date(2020, 12, 31)
+    """
+    months = _quarter_start(yyyy_mm_dd)
+    if months is None and isinstance(yyyy_mm_dd, str) and tz is None:
+        fields = _split_canonical(yyyy_mm_dd, 7)
+        if fields is not None:
+            months = fields[0] * 12 + (fields[1] - 1) // 3 * 3
+    if months is not None:
+        year, month = divmod(months + 2, 12)
+        return _format_yyyy_mm_dd(year, month + 1, _days_in_month(year, month + 1))
+    return _boundary(yyyy_mm_dd, "%Y-%m", ceiling=True, tz=tz, unit="Q")
 
 
-def end_of_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datetime.date]:
+def end_of_yyyy_ww(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
+    """
+    Returns the Sunday of the ISO week of a given date
+
+    >>> end_of_yyyy_ww('2020-05-14')
+    '2020-05-17'
+    >>> end_of_yyyy_ww('2020-W53')
+    '2021-01-03'
+    >>> end_of_yyyy_ww(datetime.datetime(2020, 5, 14, 10, 20))
+    datetime.datetime(2020, 5, 17, 0, 0)
+    """
+    start = _week_start(yyyy_mm_dd)
+    if start is None and isinstance(yyyy_mm_dd, str) and tz is None:
+        fields = _split_canonical(yyyy_mm_dd, 10)
+        if fields is not None:
+            ordinal = _ordinal(*fields)
+            start = ordinal - (ordinal + 6) % 7
+    if start is not None and start + 6 <= _MAX_NATIVE_ORDINAL:
+        return _format_yyyy_mm_dd(*_from_ordinal(start + 6))
+    return _boundary(yyyy_mm_dd, "%Y-%m-%d", ceiling=True, tz=tz, unit="W")
+
+
+def end_of_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date], tz: Optional[str] = None) -> Union[str, datetime.date]:
     """
     Returns last datetime of the day of a given date
 
@@ -414,9 +699,111 @@ def end_of_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date]) -> Union[str, datet
     >>> end_of_yyyy_mm_dd(datetime.date(2020, 5, 14))
     datetime.datetime(2020, 5, 14, 23, 59, 59)
     """
-    date, _ = _parse(yyyy_mm_dd, at_least="%Y")
+    return _boundary(yyyy_mm_dd, "%Y-%m-%d", ceiling=True, tz=tz)
+
+
+class DateRange:
+    """
+    Sequence of dates returned by the range_* functions, dates are generated one at a time
+    while iterating, and len() is computed upfront so it does not materialize the range
+    """
+    __slots__ = ("_start", "_pattern", "_months", "_delta", "_length")
+
+    def __init__(self, start: datetime.datetime, pattern: str, months: Optional[int],
+                 delta: Optional[datetime.timedelta], length: int) -> None:
+        self._start = start
+        self._pattern = pattern
+        self._months = months
+        self._delta = delta
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Union[str, datetime.date]]:
+        if self._delta is None:
+            months = self._months or 0
+            for i in range(self._length):
+                yield _strftime(_add_months(self._start, i * months), self._pattern)
+            return
+
+        date = self._start
+        for i in range(self._length):
+            if i:
+                date += self._delta
+            yield _strftime(date, self._pattern)
+
+    def __repr__(self) -> str:
+        return "<DateRange of %d dates>" % self._length
+
+
+def range_yyyy_mm(start: Union[str, datetime.date], end: Union[str, datetime.date], step: int = 1) -> DateRange:
+    """
+    Returns the dates from start until end (exclusive), moving by a certain number of months,
+    in the same format as start
+
+    >>> list(range_yyyy_mm('2020-01', '2020-04'))
+    ['2020-01', '2020-02', '2020-03']
+    >>> list(range_yyyy_mm('2020-01-31', '2020-05-01'))
+    ['2020-01-31', '2020-02-29', '2020-03-31', '2020-04-30']
+    >>> list(range_yyyy_mm('2020-12', '2020-01', -3))
+    ['2020-12', '2020-09', '2020-06', '2020-03']
+    >>> len(range_yyyy_mm('2020-01', '2020-01'))
+    0
+    """
+    date_start, pattern = _parse(start, at_least="%Y-%m")
+    date_end, _ = _parse(end, at_least="%Y-%m")
+    if step == 0:
+        raise ValueError("step must not be zero")
+
+    length = 0
+    if (step > 0 and date_end > date_start) or (step < 0 and date_end < date_start):
+        last = _diff_months(date_start, date_end) // step
+        length = last + 1
+        if _add_months(date_start, last * step) == date_end:
+            length -= 1
+    return DateRange(date_start, pattern, step, None, length)
 
-    return move_yyyy_mm_dd_hh_mm_ss(start_of_yyyy_mm_dd(move_yyyy_mm_dd(yyyy_mm_dd, 1)), -1)
+
+def range_yyyy_mm_dd(start: Union[str, datetime.date], end: Union[str, datetime.date], step: int = 1) -> DateRange:
+    """
+    Returns the dates from start until end (exclusive), moving by a certain number of days,
+    in the same format as start
+
+    >>> list(range_yyyy_mm_dd('2020-02-27', '2020-03-02'))
+    ['2020-02-27', '2020-02-28', '2020-02-29', '2020-03-01']
+    >>> list(range_yyyy_mm_dd('2020-03-02', '2020-02-27', -2))
+    ['2020-03-02', '2020-02-29']
+    >>> list(range_yyyy_mm_dd(datetime.date(2020, 2, 28), datetime.date(2020, 3, 1)))
+    [datetime.date(2020, 2, 28), datetime.date(2020, 2, 29)]
+    """
+    return _range_by_delta(start, end, step, "%Y-%m-%d", datetime.timedelta(days=step))
+
+
+def range_yyyy_mm_dd_hh(start: Union[str, datetime.datetime], end: Union[str, datetime.datetime], step: int = 1) -> DateRange:
+    """
+    Returns the datetimes from start until end (exclusive), moving by a certain number of hours,
+    in the same format as start
+
+    >>> list(range_yyyy_mm_dd_hh('2020-12-31T22', '2021-01-01T01'))
+    ['2020-12-31T22', '2020-12-31T23', '2021-01-01T00']
+    >>> list(range_yyyy_mm_dd_hh('2020-12-31T22:30:00', '2021-01-01T01', 2))
+    ['2020-12-31T22:30:00', '2021-01-01T00:30:00']
+    >>> len(range_yyyy_mm_dd_hh('2000-01-01T00', '2100-01-01T00'))
+    876600
+    """
+    return _range_by_delta(start, end, step, "%Y-%m-%dT%H", datetime.timedelta(hours=step))
+
+
+def _range_by_delta(start: Union[str, datetime.date], end: Union[str, datetime.date], step: int,
+                    at_least: str, delta: datetime.timedelta) -> DateRange:
+    date_start, pattern = _parse(start, at_least=at_least)
+    date_end, _ = _parse(end, at_least=at_least)
+    if step == 0:
+        raise ValueError("step must not be zero")
+
+    length = max(0, -(-(date_end - date_start) // delta))
+    return DateRange(date_start, pattern, None, delta, length)
 
 
 def yyyy(yyyy_mm_dd: Union[str, datetime.date]) -> str:
@@ -428,6 +815,9 @@ def yyyy(yyyy_mm_dd: Union[str, datetime.date]) -> str:
     >>> yyyy(datetime.date(2020, 5, 14))
     '2020'
     """
+    if isinstance(yyyy_mm_dd, str) and _split_canonical(yyyy_mm_dd, 4) is not None:
+        return yyyy_mm_dd[:4]
+
     date, _ = _parse(yyyy_mm_dd, at_least="%Y")
     return date.strftime("%Y")
 
@@ -441,10 +831,51 @@ def yyyy_mm(yyyy_mm_dd: Union[str, datetime.date]) -> str:
     >>> yyyy_mm(datetime.date(2020, 5, 14))
     '2020-05'
     """
+    if isinstance(yyyy_mm_dd, str) and _split_canonical(yyyy_mm_dd, 7) is not None:
+        return yyyy_mm_dd[:7]
+
     date, _ = _parse(yyyy_mm_dd, at_least="%Y-%m")
     return date.strftime("%Y-%m")
 
 
+def yyyy_qq(yyyy_mm_dd: Union[str, datetime.date]) -> str:
+    """
+    Extracts the year and quarter of a given date
+
+    >>> yyyy_qq('2020-05-14')
+    '2020-Q2'
+    >>> yyyy_qq(datetime.date(2020, 12, 31))
+    '2020-Q4'
+    """
+    if _quarter_start(yyyy_mm_dd) is not None:
+        return str(yyyy_mm_dd)
+
+    fields = _split_canonical(yyyy_mm_dd, 7) if isinstance(yyyy_mm_dd, str) else None
+    if fields is None:
+        date, _ = _parse(yyyy_mm_dd, at_least="%Y-%m")
+        fields = (date.year, date.month, date.day)
+    return str(fields[0]) + "-Q" + "1234"[(fields[1] - 1) // 3]
+
+
+def yyyy_ww(yyyy_mm_dd: Union[str, datetime.date]) -> str:
+    """
+    Extracts the ISO year and week of a given date. Weeks start on Monday, and the first
+    week of a year is the one with its first Thursday, so the first days of January may
+    be on the last week of the year before, and the last days of December on the first
+    week of the next year
+
+    >>> yyyy_ww('2020-05-14')
+    '2020-W20'
+    >>> yyyy_ww('2021-01-03')
+    '2020-W53'
+    >>> yyyy_ww(datetime.date(2024, 12, 30))
+    '2025-W01'
+    """
+    if _week_start(yyyy_mm_dd) is not None:
+        return str(yyyy_mm_dd)
+    return _format_week(_day_ordinal(yyyy_mm_dd))
+
+
 def yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date]) -> str:
     """
     Extracts the date of a given datetime
@@ -454,6 +885,9 @@ def yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date]) -> str:
     >>> yyyy_mm_dd(datetime.date(2020, 5, 14))
     '2020-05-14'
     """
+    if isinstance(yyyy_mm_dd, str) and _split_canonical(yyyy_mm_dd, 10) is not None:
+        return yyyy_mm_dd[:10]
+
     date, _ = _parse(yyyy_mm_dd, at_least="%Y-%m-%d")
     return date.strftime("%Y-%m-%d")
 
@@ -467,6 +901,9 @@ def hh_mm_ss(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime]) -> str:
     >>> hh_mm_ss(datetime.datetime(2020, 5, 14, 10, 20, 30))
     '10:20:30'
     """
+    if isinstance(yyyy_mm_dd_hh_mm_ss, str) and _split_canonical(yyyy_mm_dd_hh_mm_ss, 19) is not None:
+        return yyyy_mm_dd_hh_mm_ss[11:19]
+
     date, _ = _parse(yyyy_mm_dd_hh_mm_ss, at_least="%Y-%m-%dT%H:%M:%S")
     return date.strftime("%H:%M:%S")
 
@@ -480,6 +917,9 @@ def hh_mm(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime]) -> str:
     >>> hh_mm(datetime.datetime(2020, 5, 14, 10, 20, 30))
     '10:20'
     """
+    if isinstance(yyyy_mm_dd_hh_mm_ss, str) and _split_canonical(yyyy_mm_dd_hh_mm_ss, 16) is not None:
+        return yyyy_mm_dd_hh_mm_ss[11:16]
+
     date, _ = _parse(yyyy_mm_dd_hh_mm_ss, at_least="%Y-%m-%dT%H:%M")
     return date.strftime("%H:%M")
 
@@ -491,6 +931,10 @@ def year(yyyy_mm_dd: Union[str, datetime.date]) -> int:
     >>> year('2020-05-14')
     2020
     """
+    fields = _split_canonical(yyyy_mm_dd, 4) if isinstance(yyyy_mm_dd, str) else None
+    if fields is not None:
+        return fields[0]
+
     date, _ = _parse(yyyy_mm_dd, at_least="%Y")
     return date.year
 
@@ -502,6 +946,10 @@ def month(yyyy_mm_dd: Union[str, datetime.date]) -> int:
     >>> month('2020-05-14')
     5
     """
+    fields = _split_canonical(yyyy_mm_dd, 7) if isinstance(yyyy_mm_dd, str) else None
+    if fields is not None:
+        return fields[1]
+
     date, _ = _parse(yyyy_mm_dd, at_least="%Y-%m")
     return date.month
 
@@ -513,10 +961,27 @@ def day(yyyy_mm_dd: Union[str, datetime.date]) -> int:
     >>> day('2020-05-14')
     14
     """
+    fields = _split_canonical(yyyy_mm_dd, 10) if isinstance(yyyy_mm_dd, str) else None
+    if fields is not None:
+        return fields[2]
+
     date, _ = _parse(yyyy_mm_dd, at_least="%Y-%m-%d")
     return date.day
 
 
+def weekday(yyyy_mm_dd: Union[str, datetime.date]) -> int:
+    """
+    Extracts the day of the week of a given date, from 0 on Monday to 6 on Sunday, the same
+    as date.weekday()
+
+    >>> weekday('2020-05-14')
+    3
+    >>> weekday(datetime.date(2020, 5, 17))
+    6
+    """
+    return (_day_ordinal(yyyy_mm_dd) + 6) % 7
+
+
 def hour(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime]) -> int:
     """
     Extracts the hour of a given datetime
@@ -535,6 +1000,11 @@ def from_yyyymmdd(yyyymmdd: str) -> str:
     >>> from_yyyymmdd('20200514')
     '2020-05-14'
     """
+    if type(yyyymmdd) is str and len(yyyymmdd) == 8 and _DIGITS_REGEX.fullmatch(yyyymmdd):
+        year, month, day = int(yyyymmdd[0:4]), int(yyyymmdd[4:6]), int(yyyymmdd[6:8])
+        if year >= 1000 and 1 <= month <= 12 and 1 <= day <= _days_in_month(year, month):
+            return yyyymmdd[0:4] + "-" + yyyymmdd[4:6] + "-" + yyyymmdd[6:8]
+
     return datetime.datetime.strptime(yyyymmdd, "%Y%m%d").strftime("%Y-%m-%d")
 
 
@@ -547,6 +1017,10 @@ def to_yyyymmdd(yyyy_mm_dd: Union[str, datetime.date]) -> str:
     >>> to_yyyymmdd(datetime.date(2020, 5, 14))
     '20200514'
     """
+    fields = _split_canonical(yyyy_mm_dd, 4) if isinstance(yyyy_mm_dd, str) else None
+    if fields is not None:
+        return str(fields[0]) + _TWO_DIGITS[fields[1]] + _TWO_DIGITS[fields[2]]
+
     date, _ = _parse(yyyy_mm_dd, at_least="%Y")
     return date.strftime("%Y%m%d")
 
@@ -566,6 +1040,215 @@ def to_datetime(yyyy_mm_dd: Union[str, datetime.date]) -> datetime.datetime:
     return date
 
 
+def to_timezone(yyyy_mm_dd_hh_mm_ss: Union[str, datetime.datetime], tz: str) -> Union[str, datetime.date]:
+    """
+    Converts a datetime to the local time of a time zone, with its UTC offset. Datetimes
+    without an offset are taken as UTC
+
+    >>> to_timezone('2021-03-28T00:30:00Z', 'Europe/Berlin')
+    '2021-03-28T01:30:00+01:00'
+    >>> to_timezone('2021-03-28T01:30', 'Europe/Berlin')
+    '2021-03-28T03:30+02:00'
+    >>> to_timezone(datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc), 'America/Sao_Paulo')
+    datetime.datetime(2019, 12, 31, 21, 0, tzinfo=datetime.timezone(datetime.timedelta(days=-1, seconds=75600)))
+    """
+    date, pattern = _parse(yyyy_mm_dd_hh_mm_ss, at_least="%Y-%m-%dT%H")
+    return _from_utc(_naive_utc(date), tz, pattern)
+
+
+def try_parse(yyyy_mm_dd: Any, at_least: str = "%Y") -> Optional[datetime.datetime]:
+    """
+    Parses a date the same way all the other functions do, returning None instead of
+    raising when it is not valid or does not have at least the precision of at_least
+
+    >>> try_parse('2020-05-14T10:20')
+    datetime.datetime(2020, 5, 14, 10, 20)
+    >>> try_parse('2020-02-30') is None
+    True
+    >>> try_parse('2020-05', at_least='%Y-%m-%d') is None
+    True
+    """
+    return _try_parse(yyyy_mm_dd, at_least)[0]
+
+
+def is_valid_yyyy(yyyy_mm_dd: Any) -> bool:
+    """
+    Returns whether the yyyy functions accept this value, like move_yyyy
+
+    >>> is_valid_yyyy('2020'), is_valid_yyyy('20')
+    (True, False)
+    """
+    return _try_parse(yyyy_mm_dd, "%Y")[0] is not None
+
+
+def is_valid_yyyy_mm(yyyy_mm_dd: Any) -> bool:
+    """
+    Returns whether the yyyy_mm functions accept this value, like move_yyyy_mm
+
+    >>> is_valid_yyyy_mm('2020-05'), is_valid_yyyy_mm('2020-13')
+    (True, False)
+    """
+    return _try_parse(yyyy_mm_dd, "%Y-%m")[0] is not None
+
+
+def is_valid_yyyy_mm_dd(yyyy_mm_dd: Any) -> bool:
+    """
+    Returns whether the yyyy_mm_dd functions accept this value, like move_yyyy_mm_dd,
+    datetimes are valid too as they have at least the day
+
+    >>> is_valid_yyyy_mm_dd('2020-02-29'), is_valid_yyyy_mm_dd('2021-02-29'), is_valid_yyyy_mm_dd('2020-05')
+    (True, False, False)
+    >>> is_valid_yyyy_mm_dd(datetime.date(2020, 5, 14))
+    True
+    """
+    return _try_parse(yyyy_mm_dd, "%Y-%m-%d")[0] is not None
+
+
+def is_valid_yyyy_mm_dd_hh(yyyy_mm_dd_hh_mm_ss: Any) -> bool:
+    """
+    Returns whether the yyyy_mm_dd_hh functions accept this value, like move_yyyy_mm_dd_hh
+
+    >>> is_valid_yyyy_mm_dd_hh('2020-05-14T10'), is_valid_yyyy_mm_dd_hh('2020-05-14T24')
+    (True, False)
+    """
+    return _try_parse(yyyy_mm_dd_hh_mm_ss, "%Y-%m-%dT%H")[0] is not None
+
+
+def is_valid_yyyy_mm_dd_hh_mm(yyyy_mm_dd_hh_mm_ss: Any) -> bool:
+    """
+    Returns whether the yyyy_mm_dd_hh_mm functions accept this value, like move_yyyy_mm_dd_hh_mm
+
+    >>> is_valid_yyyy_mm_dd_hh_mm('2020-05-14T10:20Z'), is_valid_yyyy_mm_dd_hh_mm('2020-05-14T10')
+    (True, False)
+    """
+    return _try_parse(yyyy_mm_dd_hh_mm_ss, "%Y-%m-%dT%H:%M")[0] is not None
+
+
+def is_valid_yyyy_mm_dd_hh_mm_ss(yyyy_mm_dd_hh_mm_ss: Any) -> bool:
+    """
+    Returns whether the yyyy_mm_dd_hh_mm_ss functions accept this value, like move_yyyy_mm_dd_hh_mm_ss
+
+    >>> is_valid_yyyy_mm_dd_hh_mm_ss('2020-05-14T10:20:30'), is_valid_yyyy_mm_dd_hh_mm_ss('2020-05-14 10:20:30')
+    (True, False)
+    """
+    return _try_parse(yyyy_mm_dd_hh_mm_ss, "%Y-%m-%dT%H:%M:%S")[0] is not None
+
+
+def validate(values: Iterable[Any], at_least: str = "%Y-%m-%d") -> List[Tuple[int, str]]:
+    """
+    Checks a whole column of dates without raising, returning the index and the reason of
+    each value the functions needing at_least would reject, the reasons being:
+
+    - type: not a string, date or datetime
+    - format: a string that does not follow the YYYY-MM-DDTHH:MM:SS format
+    - range: a field out of range, like month 13 or February 30
+    - precision: a valid date without the precision of at_least
+
+    >>> validate(['2020-05-14', '2020-02-30', '2020-05', '14/05/2020', None, datetime.date(2020, 5, 14)])
+    [(1, 'range'), (2, 'precision'), (3, 'format'), (4, 'type')]
+    """
+    invalid = []
+    for index, value in enumerate(values):
+        date, reason = _try_parse(value, at_least)
+        if date is None:
+            invalid.append((index, reason))
+    return invalid
+
+
+def enable_cache(maxsize: int = 4096) -> None:
+    """
+    Turns on memoization of the parsing of strings and of the formatting of results,
+    useful when the same dates repeat many times, like on logs and event tables.
+    The least recently used entries are evicted once maxsize is reached
+
+    >>> enable_cache(maxsize=2)
+    >>> move_yyyy_mm_dd_hh('2020-05-14T10', 1)
+    '2020-05-14T11'
+    >>> move_yyyy_mm_dd_hh('2020-05-14T10', 1)
+    '2020-05-14T11'
+    >>> cache_info()["parse"]
+    CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+    >>> disable_cache()
+    """
+    global _parse_cache, _strftime_cache
+    _parse_cache = functools.lru_cache(maxsize=maxsize)(_parse_string)
+    _strftime_cache = functools.lru_cache(maxsize=maxsize)(_format)
+
+
+def disable_cache() -> None:
+    """
+    Turns off the cache enabled by enable_cache, dropping all cached entries
+
+    >>> disable_cache()
+    >>> cache_info()
+    {'parse': None, 'strftime': None}
+    """
+    global _parse_cache, _strftime_cache
+    _parse_cache = None
+    _strftime_cache = None
+
+
+def cache_info() -> Dict[str, Any]:
+    """
+    Returns the hits, misses, maxsize and current size of the parse and strftime caches,
+    or None for each of them if the cache is not enabled
+
+    >>> enable_cache(maxsize=128)
+    >>> diff_yyyy_mm_dd('2020-05-14', '2020-05-16')
+    2
+    >>> diff_yyyy_mm_dd('2020-05-14', '2020-05-16')
+    2
+    >>> cache_info()
+    {'parse': CacheInfo(hits=2, misses=2, maxsize=128, currsize=2), 'strftime': CacheInfo(hits=0, misses=0, maxsize=128, currsize=0)}
+    >>> disable_cache()
+    """
+    return {
+        "parse": _parse_cache.cache_info() if _parse_cache is not None else None,
+        "strftime": _strftime_cache.cache_info() if _strftime_cache is not None else None,
+    }
+
+
+def cache_clear() -> None:
+    """
+    Empties the caches and resets their statistics, keeping them enabled
+
+    >>> enable_cache()
+    >>> move_yyyy_mm('2020-05', 1)
+    '2020-06'
+    >>> cache_clear()
+    >>> cache_info()["strftime"]
+    CacheInfo(hits=0, misses=0, maxsize=4096, currsize=0)
+    >>> disable_cache()
+    """
+    if _parse_cache is not None:
+        _parse_cache.cache_clear()
+    if _strftime_cache is not None:
+        _strftime_cache.cache_clear()
+
+
+_parse_cache = None  # type: Any
+_strftime_cache = None  # type: Any
+
+_clock = datetime.datetime.now  # type: Callable[[], datetime.datetime]
+_day_cache = {}  # type: Dict[int, Tuple[int, str]]
+_now_cache = None  # type: Optional[Tuple[Tuple[int, int, int, int], str]]
+
+
+def _clock_day(offset: int) -> str:
+    """
+    Formats today moved by offset days, only once per day, as today(), yesterday()
+    and tomorrow() are called a lot but only change when the day changes
+    """
+    current = _clock()
+    ordinal = current.toordinal()
+    cached = _day_cache.get(offset)
+    if cached is None or cached[0] != ordinal:
+        date = datetime.datetime(current.year, current.month, current.day) + datetime.timedelta(days=offset)
+        cached = (ordinal, date.strftime("%Y-%m-%d"))
+        _day_cache[offset] = cached
+    return cached[1]
+
+
 def _parse(yyyy_mm_dd: Union[str, datetime.date, datetime.datetime], at_least: str) -> Tuple[datetime.datetime, str]:
     """
     >>> _parse('foo', '%Y')
@@ -582,18 +1265,426 @@ def _parse(yyyy_mm_dd: Union[str, datetime.date, datetime.datetime], at_least: s
     Traceback (most recent call last):
         ...
     ValueError: unconverted data remains: foobar
+
+    >>> _parse('2020-01-01T10:20Z', '%Y')
+    (datetime.datetime(2020, 1, 1, 10, 20, tzinfo=datetime.timezone.utc), '%Y-%m-%dT%H:%MZ')
     """
     if isinstance(yyyy_mm_dd, datetime.datetime):
         return (yyyy_mm_dd, "datetime")
     if isinstance(yyyy_mm_dd, datetime.date):
         return (datetime.datetime(yyyy_mm_dd.year, yyyy_mm_dd.month, yyyy_mm_dd.day), "datetime" if "%H" in at_least else "date")
+    if _parse_cache is not None:
+        return _parse_cache(yyyy_mm_dd, at_least)
+
+    return _parse_string(yyyy_mm_dd, at_least)
+
+
+def _parse_string(yyyy_mm_dd: str, at_least: str) -> Tuple[datetime.datetime, str]:
+    date, pattern = _try_parse_string(yyyy_mm_dd, at_least)
+    if date is None:
+        # only invalid input gets here, strptime is run again to raise its exact error
+        offset = _split_offset(yyyy_mm_dd)
+        return _parse_with_strptime(offset[0] if offset is not None else yyyy_mm_dd, at_least)
+    return (date, pattern)
+
+
+def _try_parse(yyyy_mm_dd: Any, at_least: str) -> Tuple[Optional[datetime.datetime], str]:
+    """
+    Same as _parse, but returns None and the reason instead of raising
+
+    >>> _try_parse('2020-13-01', '%Y')
+    (None, 'range')
+    >>> _try_parse(20200514, '%Y')
+    (None, 'type')
+    """
+    if isinstance(yyyy_mm_dd, (datetime.date, datetime.datetime)):
+        return _parse(yyyy_mm_dd, at_least)
+    if not isinstance(yyyy_mm_dd, str):
+        return (None, "type")
+    return _try_parse_string(yyyy_mm_dd, at_least)
+
+
+def _try_parse_string(yyyy_mm_dd: str, at_least: str) -> Tuple[Optional[datetime.datetime], str]:
+    """
+    Parses a string returning the date and its pattern, or None and the reason it is not
+    valid, raising nothing for the canonical formats
+
+    >>> _try_parse_string('2020-02-30', '%Y')
+    (None, 'range')
+    >>> _try_parse_string('foo', '%Y')
+    (None, 'format')
+    """
+    pattern = _PATTERNS_BY_LENGTH.get(len(yyyy_mm_dd))
+    if pattern is not None:
+        fields = _split_fixed_width(yyyy_mm_dd)
+        if fields is not None:
+            # the fields are all there, anything strptime would still reject is out of range
+            date = _datetime_or_none(fields)
+            if date is None:
+                return (None, "range")
+            if at_least not in pattern:
+                return (None, "precision")
+            return (date, pattern)
+
+    offset = _split_offset(yyyy_mm_dd)
+    if offset is not None:
+        local, suffix, tzinfo = offset
+        date, pattern = _try_parse_string(local, at_least)
+        if date is None:
+            return (None, pattern)
+        return (date.replace(tzinfo=tzinfo), pattern + suffix)
+
+    pattern = _strptime_pattern(yyyy_mm_dd)
+    if at_least not in pattern:
+        # a date missing fields is short on precision, anything with other characters is not a date
+        return (None, "precision" if pattern.startswith("%Y") and _PARSE_REGEX.fullmatch(yyyy_mm_dd) else "format")
+    try:
+        return (datetime.datetime.strptime(yyyy_mm_dd, pattern), pattern)
+    except ValueError:
+        return (None, "format")
+
+
+def _datetime_or_none(fields: Tuple[int, int, int, int, int, int]) -> Optional[datetime.datetime]:
+    try:
+        return datetime.datetime(*fields)
+    except ValueError:
+        return None
+
+
+def _split_offset(yyyy_mm_dd: str) -> Optional[Tuple[str, str, datetime.timezone]]:
+    """
+    Splits a Z, +HH:MM or +HH:MM:SS suffix from a datetime with at least hours, returning the local
+    part, the suffix pattern to format it back the same way and the timezone
+
+    >>> _split_offset('2020-01-01T10:20:30-03:00')
+    ('2020-01-01T10:20:30', '%:z', datetime.timezone(datetime.timedelta(days=-1, seconds=75600)))
+    >>> _split_offset('1890-01-01T00:00:00+00:53:28')[2]
+    datetime.timezone(datetime.timedelta(seconds=3208))
+    >>> _split_offset('2020-01-01Z') is None
+    True
+    """
+    length = len(yyyy_mm_dd)
+    if yyyy_mm_dd[-1:] == "Z" and length - 1 in _OFFSET_LENGTHS:
+        return (yyyy_mm_dd[:-1], "Z", datetime.timezone.utc)
+    for size in (6, 9):
+        sign = yyyy_mm_dd[-size:-size + 1]
+        if length - size in _OFFSET_LENGTHS and sign in ("+", "-") and yyyy_mm_dd[-3] == ":" and \
+                yyyy_mm_dd[-size + 3] == ":":
+            digits = yyyy_mm_dd[-size + 1:].replace(":", "")
+            if len(digits) == size - size // 3 and _DIGITS_REGEX.fullmatch(digits):
+                parts = [int(digits[i:i + 2]) for i in range(0, len(digits), 2)]
+                if parts[0] < 24 and all(part < 60 for part in parts[1:]):
+                    offset = parts[0] * 3600 + parts[1] * 60 + (parts[2] if size == 9 else 0)
+                    return (yyyy_mm_dd[:-size], "%:z", _timezone(-offset if sign == "-" else offset))
+    return None
+
+
+_PATTERNS_BY_LENGTH = {  # type: Dict[int, str]
+    4: "%Y",
+    7: "%Y-%m",
+    10: "%Y-%m-%d",
+    13: "%Y-%m-%dT%H",
+    16: "%Y-%m-%dT%H:%M",
+    19: "%Y-%m-%dT%H:%M:%S",
+}
+
+_SEPARATORS_BY_LENGTH = {
+    4: "",
+    7: "-",
+    10: "--",
+    13: "--T",
+    16: "--T:",
+    19: "--T::",
+}
+
+_OFFSET_LENGTHS = (13, 16, 19)
+
+_PARSE_REGEX = re.compile(
+    r"(\d{4})?-?(\d{2})?-?(\d{2})?T?(\d{2})?:?(\d{2})?:?(\d{2})?")
+
+
+def _parse_fixed_width(yyyy_mm_dd: str) -> Optional[datetime.datetime]:
+    """
+    Parses one of the canonical lengths by slicing the fields directly, returns None
+    for anything unusual so the caller can fall back to strptime and its error messages
+
+    >>> _parse_fixed_width('2020-05-14T10:20:30')
+    datetime.datetime(2020, 5, 14, 10, 20, 30)
+    >>> _parse_fixed_width('2020-05')
+    datetime.datetime(2020, 5, 1, 0, 0)
+    >>> _parse_fixed_width('2020-02-30') is None
+    True
+    >>> _parse_fixed_width('2020/05/14') is None
+    True
+    """
+    fields = _split_fixed_width(yyyy_mm_dd)
+    if fields is None:
+        return None
+    return _datetime_or_none(fields)
+
+
+def _split_fixed_width(yyyy_mm_dd: str) -> Optional[Tuple[int, int, int, int, int, int]]:
+    separators = yyyy_mm_dd[4:5] + yyyy_mm_dd[7:8] + \
+        yyyy_mm_dd[10:11] + yyyy_mm_dd[13:14] + yyyy_mm_dd[16:17]
+    if separators != _SEPARATORS_BY_LENGTH[len(yyyy_mm_dd)]:
+        return None
+    digits = yyyy_mm_dd[0:4] + yyyy_mm_dd[5:7] + yyyy_mm_dd[8:10] + \
+        yyyy_mm_dd[11:13] + yyyy_mm_dd[14:16] + yyyy_mm_dd[17:19]
+    if not _DIGITS_REGEX.fullmatch(digits):
+        return None
+
+    return (
+        int(digits[0:4]),
+        int(digits[4:6] or 1),
+        int(digits[6:8] or 1),
+        int(digits[8:10] or 0),
+        int(digits[10:12] or 0),
+        int(digits[12:14] or 0),
+    )
+
+
+def _split_canonical(yyyy_mm_dd: str, at_least_length: int) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns year, month and day of a valid canonical string with at least at_least_length chars,
+    for the functions that can work on the string directly without building a datetime.
+    Returns None for anything else, including years before 1000, which strftime does not zero pad,
+    so the caller falls back to _parse and gets exactly the same results and errors
+
+    >>> _split_canonical('2020-05-14T10:20:30', 10)
+    (2020, 5, 14)
+    >>> _split_canonical('2020-05', 10) is None
+    True
+    >>> _split_canonical('2020-02-30', 10) is None
+    True
+    """
+    length = len(yyyy_mm_dd)
+    if length < at_least_length or length not in _SEPARATORS_BY_LENGTH:
+        return None
+    fields = _split_fixed_width(yyyy_mm_dd)
+    if fields is None:
+        return None
+
+    year, month, day, hour, minute, second = fields
+    if year < 1000 or month < 1 or month > 12 or day < 1 or (day > 28 and day > _days_in_month(year, month)) \
+            or hour > 23 or minute > 59 or second > 59:
+        return None
+    return (year, month, day)
+
+
+def _ordinal(year: int, month: int, day: int) -> int:
+    """
+    Proleptic Gregorian ordinal of a date, the same as date.toordinal()
+
+    >>> _ordinal(2020, 5, 14) == datetime.date(2020, 5, 14).toordinal()
+    True
+    """
+    previous = year - 1
+    ordinal = previous * 365 + previous // 4 - previous // 100 + previous // 400 + _DAYS_BEFORE_MONTH[month] + day
+    if month > 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        ordinal += 1
+    return ordinal
+
+
+def _from_ordinal(ordinal: int) -> Tuple[int, int, int]:
+    """
+    Year, month and day of a proleptic Gregorian ordinal, the same as date.fromordinal()
+
+    >>> _from_ordinal(datetime.date(2020, 2, 29).toordinal())
+    (2020, 2, 29)
+    >>> _from_ordinal(datetime.date(2000, 12, 31).toordinal())
+    (2000, 12, 31)
+    """
+    n400, n = divmod(ordinal - 1, 146097)
+    n100, n = divmod(n, 36524)
+    n4, n = divmod(n, 1461)
+    n1, n = divmod(n, 365)
+    year = n400 * 400 + n100 * 100 + n4 * 4 + n1 + 1
+    if n1 == 4 or n100 == 4:
+        return (year - 1, 12, 31)
+
+    leap = n1 == 3 and (n4 != 24 or n100 == 3)
+    month = (n + 50) >> 5
+    preceding = _DAYS_BEFORE_MONTH[month] + (month > 2 and leap)
+    if preceding > n:
+        month -= 1
+        preceding -= _DAYS_IN_MONTH[month] + (month == 2 and leap)
+    return (year, month, n - preceding + 1)
+
+
+def _epoch_seconds(date: datetime.datetime) -> int:
+    """
+    Seconds since 1970-01-01T00:00:00 of the fields of a datetime, leaving out its offset
+    and microseconds
+
+    >>> _epoch_seconds(datetime.datetime(1970, 1, 2, 0, 0, 1))
+    86401
+    """
+    return (date.toordinal() - _EPOCH_ORDINAL) * 86400 + date.hour * 3600 + date.minute * 60 + date.second
+
+
+def _format_yyyy_mm_dd(year: int, month: int, day: int) -> str:
+    return str(year) + "-" + _TWO_DIGITS[month] + "-" + _TWO_DIGITS[day]
+
+
+def _day_ordinal(yyyy_mm_dd: Union[str, datetime.date]) -> int:
+    fields = _split_canonical(yyyy_mm_dd, 10) if isinstance(yyyy_mm_dd, str) else None
+    if fields is not None:
+        return _ordinal(*fields)
+    date, _ = _parse(yyyy_mm_dd, at_least="%Y-%m-%d")
+    return date.toordinal()
+
+
+def _weeks_one() -> List[int]:
+    """
+    Ordinal of the Monday of the first ISO week of each year, the week with the 4th of
+    January, indexed by year. Built on first use, then the ISO year of any day is a binary
+    search on it and its week a subtraction, instead of a datetime and isocalendar() per call
+
+    >>> _weeks_one()[2021] == datetime.date(2021, 1, 4).toordinal()
+    True
+    """
+    global _WEEKS_ONE
+    if _WEEKS_ONE is None:
+        weeks_one = []
+        for year in range(10001):
+            fourth = _ordinal(year, 1, 4)
+            weeks_one.append(fourth - (fourth + 6) % 7)
+        _WEEKS_ONE = weeks_one
+    return _WEEKS_ONE
+
+
+def _format_week(ordinal: int) -> str:
+    """
+    >>> _format_week(datetime.date(2021, 1, 3).toordinal())
+    '2020-W53'
+    """
+    if not 1 <= ordinal <= _MAX_NATIVE_ORDINAL:
+        raise OverflowError("date value out of range")
+    weeks_one = _weeks_one()
+    year = bisect.bisect_right(weeks_one, ordinal) - 1
+    return str(year) + "-W" + _TWO_DIGITS[(ordinal - weeks_one[year]) // 7 + 1]
+
+
+def _format_quarter(months: int) -> str:
+    year, month = divmod(months, 12)
+    if not 1 <= year <= 9999:
+        raise ValueError("year %d is out of range" % year)
+    return str(year) + "-Q" + "1234"[month // 3]
+
+
+def _week_start(yyyy_ww: Any) -> Optional[int]:
+    """
+    Ordinal of the Monday of an ISO week like 2020-W20, None for anything else
+
+    >>> _week_start('2020-W53') == datetime.date(2020, 12, 28).toordinal()
+    True
+    >>> _week_start('2021-W53') is None
+    True
+    """
+    match = _WEEK_REGEX.fullmatch(yyyy_ww) if isinstance(yyyy_ww, str) and len(yyyy_ww) == 8 else None
+    if match is None:
+        return None
+    weeks_one = _weeks_one()
+    year = int(match.group(1))
+    start = weeks_one[year] + (int(match.group(2)) - 1) * 7
+    if start < weeks_one[year] or start >= weeks_one[year + 1]:
+        return None
+    return start
+
+
+def _quarter_start(yyyy_qq: Any) -> Optional[int]:
+    """
+    Months since the year 0 of the first month of a quarter like 2020-Q2, None for anything else
+
+    >>> _quarter_start('2020-Q2') == 2020 * 12 + 3
+    True
+    """
+    match = _QUARTER_REGEX.fullmatch(yyyy_qq) if isinstance(yyyy_qq, str) and len(yyyy_qq) == 7 else None
+    if match is None:
+        return None
+    return int(match.group(1)) * 12 + (int(match.group(2)) - 1) * 3
+
+
+def _date_ordinal(yyyy_mm_dd: Any) -> Optional[int]:
+    # ordinal of the values that are a whole day, ISO weeks and naive yyyy-mm-dd strings
+    start = _week_start(yyyy_mm_dd)
+    if start is None and isinstance(yyyy_mm_dd, str) and len(yyyy_mm_dd) == 10:
+        fields = _split_canonical(yyyy_mm_dd, 10)
+        if fields is not None:
+            return _ordinal(*fields)
+    return start
+
+
+def _week_date(yyyy_mm_dd: Any) -> Any:
+    start = _week_start(yyyy_mm_dd)
+    return yyyy_mm_dd if start is None else datetime.date.fromordinal(start)
 
+
+def _quarter_date(yyyy_mm_dd: Any) -> Any:
+    months = _quarter_start(yyyy_mm_dd)
+    return yyyy_mm_dd if months is None else datetime.date(months // 12, months % 12 + 1, 1)
+
+
+def _move_days_native(yyyy_mm_dd: str, by: int) -> Optional[str]:
+    fields = _split_canonical(yyyy_mm_dd, 10)
+    if fields is None or type(by) is not int:
+        return None
+
+    year, month, day = fields
+    day += by
+    if day < 1 or (day > 28 and day > _days_in_month(year, month)):
+        ordinal = _ordinal(year, month, 1) + day - 1
+        if ordinal < _MIN_NATIVE_ORDINAL or ordinal > _MAX_NATIVE_ORDINAL:
+            return None
+        year, month, day = _from_ordinal(ordinal)
+    return _format_yyyy_mm_dd(year, month, day) + yyyy_mm_dd[10:]
+
+
+def _move_months_native(yyyy_mm_dd: str, at_least_length: int, months: int) -> Optional[str]:
+    fields = _split_canonical(yyyy_mm_dd, at_least_length)
+    if fields is None or type(months) is not int:
+        return None
+
+    year, month, day = fields
+    year, month = divmod(year * 12 + month - 1 + months, 12)
+    month += 1
+    if year < 1000 or year > 9999:
+        return None
+    if len(yyyy_mm_dd) == 4:
+        return str(year)
+    if len(yyyy_mm_dd) == 7:
+        return str(year) + "-" + _TWO_DIGITS[month]
+    if day > 28:
+        day = min(day, _days_in_month(year, month))
+    return _format_yyyy_mm_dd(year, month, day) + yyyy_mm_dd[10:]
+
+
+def _parse_with_strptime(yyyy_mm_dd: str, at_least: str) -> Tuple[datetime.datetime, str]:
+    """
+    Slow path for any input the fixed-width parser does not recognize
+
+    >>> _parse_with_strptime('2020-01-01', '%Y')
+    (datetime.datetime(2020, 1, 1, 0, 0), '%Y-%m-%d')
+    """
+    pattern = _strptime_pattern(yyyy_mm_dd)
+    if at_least not in pattern:
+        raise ValueError(
+            "Could not parse date for operation, you should provide at least %s" % at_least)
+
+    return (datetime.datetime.strptime(yyyy_mm_dd, pattern), pattern)
+
+
+def _strptime_pattern(yyyy_mm_dd: str) -> str:
+    """
+    Pattern of the fields found on the string, for strptime to validate
+
+    >>> _strptime_pattern('2020-05-14T10'), _strptime_pattern('foo')
+    ('%Y-%m-%dT%H', '')
+    """
     pattern = ""
-    match = re.match(
-        r"(\d{4})?-?(\d{2})?-?(\d{2})?T?(\d{2})?:?(\d{2})?:?(\d{2})?", yyyy_mm_dd)
+    match = _PARSE_REGEX.match(yyyy_mm_dd)
     if not match:
-        raise ValueError(
-            "Could not parse date, it should be in YYYY-MM-DDTHH:MM:SS format")
+        return pattern
     year, month, day, hour, minute, second = match.groups()
     if year is not None:
         pattern += "%Y"
@@ -607,11 +1698,240 @@ def _parse(yyyy_mm_dd: Union[str, datetime.date, datetime.datetime], at_least: s
         pattern += ":%M"
     if second is not None:
         pattern += ":%S"
-    if at_least not in pattern:
+    return pattern
+
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+_DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+_TWO_DIGITS = tuple("%02d" % number for number in range(100))
+
+_MIN_NATIVE_ORDINAL = datetime.date(1000, 1, 1).toordinal()
+
+_MAX_NATIVE_ORDINAL = datetime.date(9999, 12, 31).toordinal()
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# str.isascii() only exists from Python 3.7, and str.isdigit() takes other scripts' digits too
+_DIGITS_REGEX = re.compile(r"[0-9]+")
+
+_WEEK_REGEX = re.compile(r"([1-9][0-9]{3})-W([0-9]{2})")
+
+_QUARTER_REGEX = re.compile(r"([1-9][0-9]{3})-Q([1-4])")
+
+_WEEKS_ONE = None  # type: Optional[List[int]]
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """
+    >>> _days_in_month(2020, 2)
+    29
+    >>> _days_in_month(1900, 2)
+    28
+    """
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+
+def _add_months(date: datetime.datetime, months: int) -> datetime.datetime:
+    """
+    Moves a date by a number of months with integer arithmetic, clamping the day to
+    the end of the month the same way dateutil's relativedelta does
+
+    >>> _add_months(datetime.datetime(2020, 1, 31, 10, 20), 1)
+    datetime.datetime(2020, 2, 29, 10, 20)
+    >>> _add_months(datetime.datetime(2020, 2, 29), -12)
+    datetime.datetime(2019, 2, 28, 0, 0)
+    >>> _add_months(datetime.datetime(9999, 12, 1), 1)
+    Traceback (most recent call last):
+        ...
+    ValueError: year 10000 is out of range
+    """
+    year, month = divmod(date.year * 12 + date.month - 1 + months, 12)
+    month += 1
+    day = date.day
+    if day > 28:
+        day = min(day, _days_in_month(year, month))
+    return date.replace(year=year, month=month, day=day)
+
+
+def _diff_months(a: datetime.datetime, b: datetime.datetime) -> int:
+    """
+    Returns the amount of whole months from A to B, rounding towards zero the same way
+    dateutil's relativedelta does
+
+    >>> _diff_months(datetime.datetime(2020, 1, 31), datetime.datetime(2020, 2, 29))
+    1
+    >>> _diff_months(datetime.datetime(2020, 2, 14, 10), datetime.datetime(2020, 3, 14, 9))
+    0
+    >>> _diff_months(datetime.datetime(2020, 3, 31), datetime.datetime(2020, 2, 29))
+    -1
+    """
+    months = (b.year - a.year) * 12 + b.month - a.month
+    shifted = _add_months(a, months)
+    if b >= a:
+        if b < shifted:
+            months -= 1
+    elif b > shifted:
+        months += 1
+    return months
+
+
+def _boundary(yyyy_mm_dd: Union[str, datetime.date], at_least: str, ceiling: bool, tz: Optional[str] = None,
+              unit: Optional[str] = None) -> Any:
+    """
+    Truncates a date to the start of its year, month, day, hour or minute, depending on at_least,
+    or of its quarter or ISO week when unit is Q or W, or to the end of it when ceiling is True,
+    parsing and formatting only once. Dates with an offset are truncated on their own offset, or
+    on the local time of tz when given
+
+    >>> _boundary('2020-02-14T10:20:30', '%Y-%m', ceiling=True)
+    '2020-02-29'
+    >>> _boundary('2020-02-14T10:20:30', '%Y-%m-%dT%H', ceiling=True)
+    '2020-02-14T10:59:59'
+    >>> _boundary(datetime.date(2020, 2, 14), '%Y-%m-%d', ceiling=False)
+    datetime.datetime(2020, 2, 14, 0, 0)
+    >>> _boundary('2020-02-14T10:20:30Z', '%Y-%m', ceiling=True, unit='Q')
+    '2020-03-31'
+    """
+    date, pattern = _parse(yyyy_mm_dd, at_least=at_least)
+    tzinfo = date.tzinfo
+    if tz is not None:
+        date = _to_wall(date, tz)
+    if unit == "W":
+        ordinal = date.toordinal() - date.weekday() + (6 if ceiling else 0)
+        date = datetime.datetime(*_from_ordinal(ordinal))
+    elif unit == "Q":
+        month = (date.month - 1) // 3 * 3 + (3 if ceiling else 1)
+        date = datetime.datetime(date.year, month, _days_in_month(date.year, month) if ceiling else 1)
+    elif at_least == "%Y":
+        date = datetime.datetime(date.year, 12, 31) if ceiling else datetime.datetime(date.year, 1, 1)
+    elif at_least == "%Y-%m":
+        day = _days_in_month(date.year, date.month) if ceiling else 1
+        date = datetime.datetime(date.year, date.month, day)
+    elif at_least == "%Y-%m-%d":
+        date = datetime.datetime(date.year, date.month, date.day, 23, 59, 59) if ceiling \
+            else datetime.datetime(date.year, date.month, date.day)
+    elif at_least == "%Y-%m-%dT%H":
+        date = datetime.datetime(date.year, date.month, date.day, date.hour, 59, 59) if ceiling \
+            else datetime.datetime(date.year, date.month, date.day, date.hour)
+    else:
+        date = datetime.datetime(date.year, date.month, date.day, date.hour, date.minute, 59 if ceiling else 0)
+
+    if at_least in ("%Y", "%Y-%m") or unit is not None:
+        if pattern not in ("date", "datetime"):
+            pattern = "%Y-%m-%d"
+    elif pattern in ("date", "datetime"):
+        pattern = "datetime"
+    else:
+        pattern = "%Y-%m-%dT%H:%M:%S" + _offset_suffix(pattern)
+
+    if tz is not None:
+        return _from_wall(date, tz, pattern)
+    if tzinfo is not None:
+        date = date.replace(tzinfo=tzinfo)
+    return _strftime(date, pattern)
+
+
+def _to_wall(date: datetime.datetime, tz: str) -> datetime.datetime:
+    """
+    Naive local time of a date on a time zone, dates without offset are already taken as local
+    """
+    if date.tzinfo is None:
+        return date
+    utc = _naive_utc(date)
+    return utc + datetime.timedelta(seconds=_zone_table(tz).utcoffset(utc))
+
+
+def _to_utc(date: datetime.datetime, tz: str) -> datetime.datetime:
+    """
+    Naive UTC time of a date, dates without offset are taken as local time on tz
+    """
+    if date.tzinfo is not None:
+        return _naive_utc(date)
+    return date - datetime.timedelta(seconds=_zone_table(tz).wall_offset(date))
+
+
+def _naive_utc(date: datetime.datetime) -> datetime.datetime:
+    offset = date.utcoffset()
+    date = date.replace(tzinfo=None)
+    return date - offset if offset is not None else date
+
+
+def _from_wall(wall: datetime.datetime, tz: str, pattern: str) -> Union[str, datetime.date]:
+    offset = _zone_table(tz).wall_offset(wall)
+    return _strftime(wall.replace(tzinfo=_timezone(offset)), _with_offset(pattern))
+
+
+def _from_utc(utc: datetime.datetime, tz: str, pattern: str) -> Union[str, datetime.date]:
+    offset = _zone_table(tz).utcoffset(utc)
+    local = utc + datetime.timedelta(seconds=offset)
+    return _strftime(local.replace(tzinfo=_timezone(offset)), _with_offset(pattern))
+
+
+def _align(date_a: datetime.datetime, date_b: datetime.datetime, tz: Optional[str],
+           wall: bool) -> Tuple[datetime.datetime, datetime.datetime]:
+    """
+    Brings two dates with offsets or on a tz to naive datetimes that can be compared, on local
+    time for the calendar units, or on UTC for hours, minutes and seconds
+    """
+    if tz is not None:
+        if wall:
+            return (_to_wall(date_a, tz), _to_wall(date_b, tz))
+        return (_to_utc(date_a, tz), _to_utc(date_b, tz))
+    if date_a.tzinfo is None or date_b.tzinfo is None:
         raise ValueError(
-            "Could not parse date for operation, you should provide at least %s" % at_least)
+            "Could not compare dates with and without UTC offset, you should provide both with offset or a tz")
+    if wall:
+        return (date_a.replace(tzinfo=None), date_b.astimezone(date_a.tzinfo).replace(tzinfo=None))
+    return (_naive_utc(date_a), _naive_utc(date_b))
 
-    return (datetime.datetime.strptime(yyyy_mm_dd, pattern), pattern)
+
+def _timezone(offset: int) -> datetime.timezone:
+    tzinfo = _TIMEZONES.get(offset)
+    if tzinfo is None:
+        tzinfo = datetime.timezone(datetime.timedelta(seconds=offset)) if offset else datetime.timezone.utc
+        _TIMEZONES[offset] = tzinfo
+    return tzinfo
+
+
+_TIMEZONES = {}  # type: Dict[int, datetime.timezone]
+
+
+def _offset_suffix(pattern: str) -> str:
+    if pattern.endswith("%:z"):
+        return "%:z"
+    if pattern.endswith("Z"):
+        return "Z"
+    return ""
+
+
+def _with_offset(pattern: str) -> str:
+    """
+    Pattern of a result on a time zone, strings with time always get the UTC offset
+
+    >>> _with_offset('%Y-%m-%dT%H:%MZ'), _with_offset('%Y-%m-%d')
+    ('%Y-%m-%dT%H:%M%:z', '%Y-%m-%d')
+    """
+    if "%H" not in pattern:
+        return pattern
+    return pattern[:len(pattern) - len(_offset_suffix(pattern))] + "%:z"
+
+
+def _format_offset(offset: Optional[datetime.timedelta]) -> str:
+    """
+    >>> _format_offset(datetime.timedelta(hours=-3))
+    '-03:00'
+    >>> _format_offset(datetime.timedelta(minutes=53, seconds=28))
+    '+00:53:28'
+    """
+    seconds = offset.days * 86400 + offset.seconds if offset is not None else 0
+    minutes, seconds = divmod(abs(seconds), 60)
+    text = ("-" if offset is not None and offset.days < 0 else "+") + \
+        _TWO_DIGITS[minutes // 60] + ":" + _TWO_DIGITS[minutes % 60]
+    return text + ":" + _TWO_DIGITS[seconds] if seconds else text
 
 
 def _strftime(date: datetime.datetime, pattern: str) -> Union[str, datetime.date]:
@@ -619,4 +1939,62 @@ def _strftime(date: datetime.datetime, pattern: str) -> Union[str, datetime.date
         return datetime.date(date.year, date.month, date.day)
     if pattern == "datetime":
         return date
+    # aware datetimes on different offsets compare equal, so they cannot share a cache entry
+    if _strftime_cache is not None and date.tzinfo is None:
+        return _strftime_cache(date, pattern)
+    return _format(date, pattern)
+
+
+def _format(date: datetime.datetime, pattern: str) -> str:
+    if pattern.endswith("%:z"):
+        return date.strftime(pattern[:-3]) + _format_offset(date.utcoffset())
     return date.strftime(pattern)
+
+
+from yyyy_mm_dd.column import DateColumn, DateTimeColumn  # noqa: E402
+from yyyy_mm_dd.business import BusinessCalendar, diff_business_yyyy_mm_dd, move_business_yyyy_mm_dd  # noqa: E402
+from yyyy_mm_dd.index import DateIndex  # noqa: E402
+from yyyy_mm_dd.period import Period  # noqa: E402
+from yyyy_mm_dd.zones import zone_table as _zone_table  # noqa: E402
+from yyyy_mm_dd.many import (  # noqa: E402
+    diff_yyyy_many,
+    diff_yyyy_mm_dd_hh_many,
+    diff_yyyy_mm_dd_hh_mm_many,
+    diff_yyyy_mm_dd_hh_mm_ss_many,
+    diff_yyyy_mm_dd_many,
+    diff_yyyy_mm_many,
+    diff_yyyy_qq_many,
+    diff_yyyy_ww_many,
+    day_many,
+    end_of_yyyy_many,
+    end_of_yyyy_mm_dd_many,
+    end_of_yyyy_mm_many,
+    end_of_yyyy_qq_many,
+    end_of_yyyy_ww_many,
+    hour_many,
+    month_many,
+    move_yyyy_many,
+    move_yyyy_mm_dd_hh_many,
+    move_yyyy_mm_dd_hh_mm_many,
+    move_yyyy_mm_dd_hh_mm_ss_many,
+    move_yyyy_mm_dd_many,
+    move_yyyy_mm_many,
+    move_yyyy_qq_many,
+    move_yyyy_ww_many,
+    start_of_yyyy_many,
+    start_of_yyyy_mm_dd_hh_many,
+    start_of_yyyy_mm_dd_hh_mm_many,
+    start_of_yyyy_mm_dd_many,
+    start_of_yyyy_mm_many,
+    start_of_yyyy_qq_many,
+    start_of_yyyy_ww_many,
+    to_timezone_many,
+    to_yyyymmdd_many,
+    weekday_many,
+    year_many,
+    yyyy_many,
+    yyyy_mm_dd_many,
+    yyyy_mm_many,
+    yyyy_qq_many,
+    yyyy_ww_many,
+)
@@ -0,0 +1,215 @@
+"""
+Applies yyyy_mm_dd functions to columns of a CSV, TSV or any delimited input, streaming
+it row by row so files of any size can be transformed with constant memory:
+
+    python -m yyyy_mm_dd move_yyyy_mm_dd_hh:-3 -c 2 < events.csv > shifted.csv
+    python -m yyyy_mm_dd from_yyyymmdd start_of_yyyy_mm -c day --header -d '\\t' -i export.tsv
+    python -m yyyy_mm_dd to_yyyymmdd -c 1,4 --workers 4 -i huge.csv -o out.csv
+
+Each function is given by its name followed by its extra arguments separated by colons,
+when more than one is given they are applied in order. With --workers the rows are sent
+in chunks to a pool of processes, with a limited number of chunks in flight at a time,
+and written back in the same order as they were read.
+"""
+import argparse
+import csv
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Any, Callable, Deque, Iterator, List, Optional, Sequence, Tuple
+
+import yyyy_mm_dd
+
+Spec = Tuple[str, Tuple[Any, ...]]
+
+# the functions that transform a single date, leaving out the _many, range, cache and clock ones
+_FUNCTIONS = re.compile(
+    r"(move|diff|start_of|end_of)(_business)?_yyyy(_(qq|ww|mm|dd|hh|ss))*|yyyy(_(qq|ww|mm|dd))*|hh_mm(_ss)?"
+    r"|year|month|day|hour|weekday|to_yyyymmdd|from_yyyymmdd|to_timezone|is_valid_yyyy(_(mm|dd|hh|ss))*")
+
+
+def main(argv: Optional[Sequence[str]] = None, stdin: Optional[IO[str]] = None,
+         stdout: Optional[IO[str]] = None) -> None:
+    """
+    >>> import io
+    >>> main(['move_yyyy_mm:1', '-c', '2'], io.StringIO('a,2020-01-31\\nb,2020-02-29\\n'), sys.stdout)
+    a,2020-02-29
+    b,2020-03-29
+    >>> main(['from_yyyymmdd', 'start_of_yyyy_mm', '-c', 'day', '--header', '-d', '\\\\t'],
+    ...      io.StringIO('id\\tday\\n1\\t20200514\\n'), sys.stdout)
+    id\tday
+    1\t2020-05-01
+    """
+    args = _parser().parse_args(argv)
+    specs = [_parse_spec(spec) for spec in args.functions]
+    delimiter = args.delimiter.replace("\\t", "\t")
+
+    source = open(args.input, newline="", encoding=args.encoding) if args.input else (stdin or sys.stdin)
+    target = open(args.output, "w", newline="", encoding=args.encoding) if args.output else (stdout or sys.stdout)
+    try:
+        reader = csv.reader(source, delimiter=delimiter)
+        writer = csv.writer(target, delimiter=delimiter, lineterminator="\n")
+        columns_spec = args.columns.split(",")
+        if args.header:
+            header = next(reader, None)
+            if header is None:
+                return
+            writer.writerow(header)
+            columns = _resolve_columns(columns_spec, header)
+        else:
+            columns = _resolve_columns(columns_spec, None)
+
+        chunks = _chunks(reader, args.chunk_size)
+        if args.workers > 1:
+            transformed = _transform_parallel(chunks, specs, columns, args.keep_invalid, args.workers)
+        else:
+            transformed = (_transform_rows(chunk, specs, columns, args.keep_invalid) for chunk in chunks)
+        for chunk in transformed:
+            writer.writerows(chunk)
+    except (ValueError, OverflowError) as e:
+        raise SystemExit("error: %s" % e)
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            target.close()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m yyyy_mm_dd",
+        description="Applies yyyy_mm_dd functions to columns of a delimited input, row by row")
+    parser.add_argument("functions", nargs="+", metavar="FUNCTION[:ARG...]",
+                        help="function to apply with its extra arguments, e.g. move_yyyy_mm_dd:1")
+    parser.add_argument("-c", "--columns", default="1",
+                        help="comma separated columns to transform, 1-based indexes or header names (default: 1)")
+    parser.add_argument("-d", "--delimiter", default=",", help="field delimiter, use \\t for tabs (default: ,)")
+    parser.add_argument("--header", action="store_true", help="pass the first row through untouched")
+    parser.add_argument("-i", "--input", help="file to read from (default: stdin)")
+    parser.add_argument("-o", "--output", help="file to write to (default: stdout)")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--keep-invalid", action="store_true",
+                        help="leave values that cannot be transformed as they are, instead of failing")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows sent to a process at a time")
+    return parser
+
+
+def _parse_spec(spec: str) -> Spec:
+    """
+    Splits a function spec in its name and arguments, arguments that look like integers
+    are converted to int
+
+    >>> _parse_spec('move_yyyy_mm_dd:-1')
+    ('move_yyyy_mm_dd', (-1,))
+    >>> _parse_spec('diff_yyyy_mm:2020-01')
+    ('diff_yyyy_mm', ('2020-01',))
+    >>> _parse_spec('_parse')
+    Traceback (most recent call last):
+        ...
+    SystemExit: Unknown function _parse
+    >>> _parse_spec('enable_cache:100')
+    Traceback (most recent call last):
+        ...
+    SystemExit: Unknown function enable_cache
+    """
+    name, *arguments = spec.split(":")
+    if not _FUNCTIONS.fullmatch(name) or not callable(getattr(yyyy_mm_dd, name, None)):
+        raise SystemExit("Unknown function %s" % name)
+    return (name, tuple(_parse_argument(argument) for argument in arguments))
+
+
+def _parse_argument(argument: str) -> Any:
+    try:
+        return int(argument)
+    except ValueError:
+        return argument
+
+
+def _resolve_columns(columns: List[str], header: Optional[List[str]]) -> List[int]:
+    """
+    >>> _resolve_columns(['1', 'day'], ['id', 'day'])
+    [0, 1]
+    >>> _resolve_columns(['day'], None)
+    Traceback (most recent call last):
+        ...
+    SystemExit: Column day is not an index, use --header to select columns by name
+    """
+    indexes = []
+    for column in columns:
+        if column.isdigit() and int(column) > 0:
+            indexes.append(int(column) - 1)
+        elif header is not None and column in header:
+            indexes.append(header.index(column))
+        elif header is None:
+            raise SystemExit("Column %s is not an index, use --header to select columns by name" % column)
+        else:
+            raise SystemExit("Column %s not found on the header" % column)
+    return indexes
+
+
+def _chunks(reader: Iterator[List[str]], size: int) -> Iterator[List[List[str]]]:
+    while True:
+        chunk = list(islice(reader, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _transform_rows(rows: List[List[str]], specs: List[Spec], columns: List[int],
+                    keep_invalid: bool) -> List[List[str]]:
+    """
+    Applies the functions to the columns of each row, in place
+
+    >>> _transform_rows([['2020-01-31', 'x']], [('move_yyyy_mm', (1,))], [0], False)
+    [['2020-02-29', 'x']]
+    >>> _transform_rows([['', 'x']], [('move_yyyy_mm', (1,))], [0, 5], True)
+    [['', 'x']]
+    >>> _transform_rows([['', 'x']], [('move_yyyy_mm', (1,))], [0], False)
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not parse date for operation, you should provide at least %Y-%m, got '' on column 1
+    >>> _transform_rows([['9999-12-31']], [('move_yyyy_mm_dd', (1,))], [0], False)
+    Traceback (most recent call last):
+        ...
+    ValueError: date value out of range, got '9999-12-31' on column 1
+    """
+    functions = [(getattr(yyyy_mm_dd, name), arguments) for name, arguments in specs]
+    for row in rows:
+        for column in columns:
+            if column >= len(row):
+                continue
+            try:
+                row[column] = _apply(functions, row[column])
+            except (ValueError, OverflowError) as e:
+                if not keep_invalid:
+                    raise ValueError("%s, got %r on column %d" % (e, row[column], column + 1))
+    return rows
+
+
+def _apply(functions: List[Tuple[Callable, Tuple[Any, ...]]], value: Any) -> str:
+    for function, arguments in functions:
+        value = function(value, *arguments)
+    return str(value)
+
+
+def _transform_parallel(chunks: Iterator[List[List[str]]], specs: List[Spec], columns: List[int],
+                        keep_invalid: bool, workers: int) -> Iterator[List[List[str]]]:
+    """
+    Sends the chunks to a process pool keeping at most two chunks per worker in flight,
+    and yields the results in the order they were read
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()  # type: Deque[Any]
+        for chunk in chunks:
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+            in_flight.append(pool.submit(_transform_rows, chunk, specs, columns, keep_invalid))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+pandas integration, importing this module registers a `.yyyy` accessor on Series, with
+the functions of `yyyy_mm_dd` under the same names, computed in bulk by `yyyy_mm_dd.many`
+on the underlying datetime64 buffer instead of calling a Python function for every row:
+
+>>> import pandas
+>>> import yyyy_mm_dd.accessor
+>>> moved = pandas.Series(['2020-01-31', None, '2020-03-31']).yyyy.move_yyyy_mm(1)
+>>> moved[0], bool(moved.isna()[1]), moved[2]
+('2020-02-29', True, '2020-04-30')
+>>> pandas.Series(pandas.to_datetime(['2020-02-14 10:20', None])).yyyy.end_of_yyyy_mm()
+0   2020-02-29
+1          NaT
+dtype: datetime64[us]
+>>> dates = pandas.Series(['2020-01-01', '2020-06-01'])
+>>> dates.yyyy.diff_yyyy_mm_dd(pandas.Series(['2020-01-02', None]))
+0       1
+1    <NA>
+dtype: Int64
+>>> pandas.Series(['2021-03-28T01:30'], dtype='string').yyyy.move_yyyy_mm_dd_hh(1, tz='Europe/Berlin')
+0    2021-03-28T03:30+02:00
+dtype: string
+>>> dates.yyyy.yyyy_ww().tolist(), dates.yyyy.month().tolist()
+(['2020-W01', '2020-W23'], [1, 6])
+
+String columns come back as strings in the same format, datetime64 columns as datetime64,
+and missing values stay missing. Arguments can be scalars or Series of the same length,
+matched by position. pandas is only imported when this module is.
+"""
+from typing import Any, Optional
+
+import numpy
+import pandas  # type: ignore
+
+from yyyy_mm_dd import many
+
+
+@pandas.api.extensions.register_series_accessor("yyyy")
+class YyyyAccessor:
+    def __init__(self, series: Any) -> None:
+        self._series = series
+
+    def move_yyyy(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy`"""
+        return _apply(many.move_yyyy_many, self._series, by, tz=tz)
+
+    def move_yyyy_mm(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy_mm`"""
+        return _apply(many.move_yyyy_mm_many, self._series, by, tz=tz)
+
+    def move_yyyy_qq(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy_qq`"""
+        return _apply(many.move_yyyy_qq_many, self._series, by, tz=tz)
+
+    def move_yyyy_ww(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy_ww`"""
+        return _apply(many.move_yyyy_ww_many, self._series, by, tz=tz)
+
+    def move_yyyy_mm_dd(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy_mm_dd`"""
+        return _apply(many.move_yyyy_mm_dd_many, self._series, by, tz=tz)
+
+    def move_yyyy_mm_dd_hh(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy_mm_dd_hh`"""
+        return _apply(many.move_yyyy_mm_dd_hh_many, self._series, by, tz=tz)
+
+    def move_yyyy_mm_dd_hh_mm(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy_mm_dd_hh_mm`"""
+        return _apply(many.move_yyyy_mm_dd_hh_mm_many, self._series, by, tz=tz)
+
+    def move_yyyy_mm_dd_hh_mm_ss(self, by: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.move_yyyy_mm_dd_hh_mm_ss`"""
+        return _apply(many.move_yyyy_mm_dd_hh_mm_ss_many, self._series, by, tz=tz)
+
+    def diff_yyyy(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy`"""
+        return _apply(many.diff_yyyy_many, self._series, other, tz=tz)
+
+    def diff_yyyy_mm(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy_mm`"""
+        return _apply(many.diff_yyyy_mm_many, self._series, other, tz=tz)
+
+    def diff_yyyy_qq(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy_qq`"""
+        return _apply(many.diff_yyyy_qq_many, self._series, other, tz=tz)
+
+    def diff_yyyy_ww(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy_ww`"""
+        return _apply(many.diff_yyyy_ww_many, self._series, other, tz=tz)
+
+    def diff_yyyy_mm_dd(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy_mm_dd`"""
+        return _apply(many.diff_yyyy_mm_dd_many, self._series, other, tz=tz)
+
+    def diff_yyyy_mm_dd_hh(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy_mm_dd_hh`"""
+        return _apply(many.diff_yyyy_mm_dd_hh_many, self._series, other, tz=tz)
+
+    def diff_yyyy_mm_dd_hh_mm(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy_mm_dd_hh_mm`"""
+        return _apply(many.diff_yyyy_mm_dd_hh_mm_many, self._series, other, tz=tz)
+
+    def diff_yyyy_mm_dd_hh_mm_ss(self, other: Any, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.diff_yyyy_mm_dd_hh_mm_ss`"""
+        return _apply(many.diff_yyyy_mm_dd_hh_mm_ss_many, self._series, other, tz=tz)
+
+    def start_of_yyyy(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.start_of_yyyy`"""
+        return _apply(many.start_of_yyyy_many, self._series, tz=tz)
+
+    def start_of_yyyy_mm(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.start_of_yyyy_mm`"""
+        return _apply(many.start_of_yyyy_mm_many, self._series, tz=tz)
+
+    def start_of_yyyy_qq(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.start_of_yyyy_qq`"""
+        return _apply(many.start_of_yyyy_qq_many, self._series, tz=tz)
+
+    def start_of_yyyy_ww(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.start_of_yyyy_ww`"""
+        return _apply(many.start_of_yyyy_ww_many, self._series, tz=tz)
+
+    def start_of_yyyy_mm_dd(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.start_of_yyyy_mm_dd`"""
+        return _apply(many.start_of_yyyy_mm_dd_many, self._series, tz=tz)
+
+    def start_of_yyyy_mm_dd_hh(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.start_of_yyyy_mm_dd_hh`"""
+        return _apply(many.start_of_yyyy_mm_dd_hh_many, self._series, tz=tz)
+
+    def start_of_yyyy_mm_dd_hh_mm(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.start_of_yyyy_mm_dd_hh_mm`"""
+        return _apply(many.start_of_yyyy_mm_dd_hh_mm_many, self._series, tz=tz)
+
+    def end_of_yyyy(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.end_of_yyyy`"""
+        return _apply(many.end_of_yyyy_many, self._series, tz=tz)
+
+    def end_of_yyyy_mm(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.end_of_yyyy_mm`"""
+        return _apply(many.end_of_yyyy_mm_many, self._series, tz=tz)
+
+    def end_of_yyyy_qq(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.end_of_yyyy_qq`"""
+        return _apply(many.end_of_yyyy_qq_many, self._series, tz=tz)
+
+    def end_of_yyyy_ww(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.end_of_yyyy_ww`"""
+        return _apply(many.end_of_yyyy_ww_many, self._series, tz=tz)
+
+    def end_of_yyyy_mm_dd(self, tz: Optional[str] = None) -> Any:
+        """See `yyyy_mm_dd.end_of_yyyy_mm_dd`"""
+        return _apply(many.end_of_yyyy_mm_dd_many, self._series, tz=tz)
+
+    def yyyy(self) -> Any:
+        """See `yyyy_mm_dd.yyyy`"""
+        return _apply(many.yyyy_many, self._series)
+
+    def yyyy_mm(self) -> Any:
+        """See `yyyy_mm_dd.yyyy_mm`"""
+        return _apply(many.yyyy_mm_many, self._series)
+
+    def yyyy_mm_dd(self) -> Any:
+        """See `yyyy_mm_dd.yyyy_mm_dd`"""
+        return _apply(many.yyyy_mm_dd_many, self._series)
+
+    def yyyy_qq(self) -> Any:
+        """See `yyyy_mm_dd.yyyy_qq`"""
+        return _apply(many.yyyy_qq_many, self._series)
+
+    def yyyy_ww(self) -> Any:
+        """See `yyyy_mm_dd.yyyy_ww`"""
+        return _apply(many.yyyy_ww_many, self._series)
+
+    def year(self) -> Any:
+        """See `yyyy_mm_dd.year`"""
+        return _apply(many.year_many, self._series)
+
+    def month(self) -> Any:
+        """See `yyyy_mm_dd.month`"""
+        return _apply(many.month_many, self._series)
+
+    def day(self) -> Any:
+        """See `yyyy_mm_dd.day`"""
+        return _apply(many.day_many, self._series)
+
+    def hour(self) -> Any:
+        """See `yyyy_mm_dd.hour`"""
+        return _apply(many.hour_many, self._series)
+
+    def weekday(self) -> Any:
+        """See `yyyy_mm_dd.weekday`"""
+        return _apply(many.weekday_many, self._series)
+
+    def to_yyyymmdd(self) -> Any:
+        """See `yyyy_mm_dd.to_yyyymmdd`"""
+        return _apply(many.to_yyyymmdd_many, self._series)
+
+
+def _apply(function: Any, series: Any, *arguments: Any, **options: Any) -> Any:
+    mask = series.isna().to_numpy()
+    for argument in arguments:
+        if isinstance(argument, pandas.Series):
+            mask = mask | argument.isna().to_numpy()
+    present = ~mask if mask.any() else slice(None)
+
+    result = function(_values(series, present), *[
+        _values(argument, present) if isinstance(argument, pandas.Series) else
+        numpy.asarray(argument)[present] if numpy.ndim(argument) > 0 else argument
+        for argument in arguments
+    ], **options)
+    if not mask.any():
+        return _series(result, series)
+
+    if result.dtype.kind in "iu":
+        values = numpy.zeros(len(mask), dtype=numpy.int64)
+        values[present] = result
+        return pandas.Series(pandas.arrays.IntegerArray(values, mask), index=series.index, name=series.name)
+    if result.dtype.kind == "M":
+        values = numpy.full(len(mask), numpy.datetime64("NaT"), dtype=result.dtype)
+    else:
+        values = numpy.full(len(mask), None, dtype=object)
+    values[present] = result
+    return _series(values, series)
+
+
+def _series(values: Any, like: Any) -> Any:
+    # strings keep the string dtype of the input, which depends on the pandas version
+    result = pandas.Series(values, index=like.index, name=like.name)
+    if values.dtype.kind in "UO" and isinstance(like.dtype, pandas.StringDtype):
+        return result.astype(like.dtype)
+    return result
+
+
+def _values(series: Any, present: Any) -> Any:
+    """
+    Returns the values of the series as a numpy array many can compute in bulk,
+    datetime64 for datetime columns and a fixed width unicode array for strings
+    """
+    if series.dtype.kind == "M":
+        return series.to_numpy()[present]
+    values = series.to_numpy(dtype=object)[present]
+    if pandas.api.types.infer_dtype(values, skipna=False) == "string":
+        return values.astype(str)
+    return values
@@ -0,0 +1,216 @@
+"""
+Counting, summing and taking the min and max of values per year, month, day, hour or
+minute, streaming through (timestamp, value) pairs without keeping them.
+
+Truncating each timestamp with a start_of function and using the result as a dict key
+costs a parse and a format per event. A `BucketAggregator` instead slices the fields of
+canonical strings, turns them into an integer per bucket, like the hours since year 0, and
+keeps four numbers per bucket. Labels are formatted only once per bucket, at the end, the
+same as the start_of function of the unit would return:
+
+>>> events = [('2020-05-14T10:20:30', 3), ('2020-05-14T10:59:59', 5), ('2020-05-14T11:00:00', 1)]
+>>> aggregate_by(events, 'yyyy_mm_dd_hh')
+{'2020-05-14T10:00:00': Bucket(count=2, sum=8, min=3, max=5), '2020-05-14T11:00:00': Bucket(count=1, sum=1, min=1, max=1)}
+
+Timestamps with a UTC offset are bucketed on their own local time, and the labels of hours,
+minutes and days keep that offset, or Z for UTC, the same way start_of does, so timestamps
+with different offsets fall on different buckets.
+"""
+import datetime
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from yyyy_mm_dd import (
+    _TWO_DIGITS, _format_offset, _format_yyyy_mm_dd, _from_ordinal, _ordinal, _parse, _split_canonical,
+)
+
+Number = Union[int, float]
+
+_AT_LEAST = {
+    "yyyy": "%Y",
+    "yyyy_mm": "%Y-%m",
+    "yyyy_mm_dd": "%Y-%m-%d",
+    "yyyy_mm_dd_hh": "%Y-%m-%dT%H",
+    "yyyy_mm_dd_hh_mm": "%Y-%m-%dT%H:%M",
+}  # type: Dict[str, str]
+
+# what may follow a prefix of each length on a valid canonical string
+_RESTS = {
+    10: re.compile(r"(T([01][0-9]|2[0-3])(:[0-5][0-9](:[0-5][0-9])?)?)?"),
+    13: re.compile(r"(:[0-5][0-9](:[0-5][0-9])?)?"),
+    16: re.compile(r"(:[0-5][0-9])?"),
+}
+
+# prefixes whose key is kept, beyond that the cache starts over
+_MAX_KEYS = 4096
+
+# one key per offset in seconds, on the units whose labels show the offset
+_OFFSETS = 2 * 86400
+
+
+class Bucket:
+    """
+    Totals of the values that fell on a bucket
+    """
+    __slots__ = ("count", "sum", "min", "max")
+
+    def __init__(self, count: int, sum: Number, min: Number, max: Number) -> None:
+        self.count = count
+        self.sum = sum
+        self.min = min
+        self.max = max
+
+    def __repr__(self) -> str:
+        return "Bucket(count=%r, sum=%r, min=%r, max=%r)" % (self.count, self.sum, self.min, self.max)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Bucket):
+            return NotImplemented
+        return (self.count, self.sum, self.min, self.max) == (other.count, other.sum, other.min, other.max)
+
+
+class BucketAggregator:
+    """
+    Running count, sum, min and max of values per bucket of unit, one of yyyy, yyyy_mm,
+    yyyy_mm_dd, yyyy_mm_dd_hh or yyyy_mm_dd_hh_mm
+
+    >>> aggregator = BucketAggregator('yyyy_mm')
+    >>> aggregator.add('2020-05-14', 10)
+    >>> aggregator.add(datetime.date(2020, 5, 31), 20)
+    >>> aggregator.update([('2020-04-30T23:59:59', 5)])
+    >>> aggregator.counts()
+    {'2020-04-01': 1, '2020-05-01': 2}
+    >>> aggregator.results()['2020-05-01'].sum
+    30
+    """
+    __slots__ = ("unit", "_length", "_prefix", "_rest", "_keys", "_buckets", "_aware")
+
+    def __init__(self, unit: str = "yyyy_mm_dd_hh") -> None:
+        if unit not in _AT_LEAST:
+            raise ValueError("Bucket unit should be one of %s, got %r" % (", ".join(_AT_LEAST), unit))
+        self.unit = unit
+        self._length = len(_AT_LEAST[unit]) + 2
+        self._prefix = max(self._length, 10)
+        self._rest = _RESTS[self._prefix].fullmatch
+        self._keys = {}  # type: Dict[str, int]
+        self._buckets = {}  # type: Dict[int, List[Number]]
+        self._aware = None  # type: Optional[bool]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __repr__(self) -> str:
+        return "<BucketAggregator by %s with %d buckets>" % (self.unit, len(self._buckets))
+
+    def add(self, timestamp: Union[str, datetime.date], value: Number = 1) -> None:
+        key = self._key(timestamp)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [1, value, value, value]
+            return
+        bucket[0] += 1
+        bucket[1] += value
+        if value < bucket[2]:
+            bucket[2] = value
+        if value > bucket[3]:
+            bucket[3] = value
+
+    def update(self, pairs: Iterable[Tuple[Union[str, datetime.date], Number]]) -> None:
+        """
+        Adds every (timestamp, value) pair, consuming them one at a time
+        """
+        add = self.add
+        for timestamp, value in pairs:
+            add(timestamp, value)
+
+    def results(self) -> Dict[str, Bucket]:
+        """
+        Totals per bucket, sorted by bucket and keyed by its start
+        """
+        return {self._label(key): Bucket(int(self._buckets[key][0]), *self._buckets[key][1:]) for key in sorted(self._buckets)}
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Amount of values per bucket, sorted by bucket and keyed by its start
+        """
+        return {self._label(key): int(self._buckets[key][0]) for key in sorted(self._buckets)}
+
+    def _key(self, timestamp: Union[str, datetime.date]) -> int:
+        """
+        Integer of the bucket of a timestamp. Canonical strings are mostly repeated days or
+        hours, so the key of their prefix down to the bucket, or to the day for years and
+        months, is kept and the rest is only checked for being valid, up to _MAX_KEYS of them
+        """
+        if isinstance(timestamp, str):
+            key = self._keys.get(timestamp[:self._prefix])
+            if key is not None and self._rest(timestamp, self._prefix):
+                return key
+            split = _split_canonical(timestamp, self._length)
+            if split is not None:
+                fields = split + (int(timestamp[11:13] or 0), int(timestamp[14:16] or 0))
+        else:
+            split = None
+        offset = None
+        if split is None:
+            date, _ = _parse(timestamp, at_least=_AT_LEAST[self.unit])
+            offset = date.utcoffset()
+            fields = (date.year, date.month, date.day, date.hour, date.minute)
+        aware = offset is not None
+        if aware != self._aware:
+            if self._aware is not None:
+                raise ValueError(
+                    "Could not compare dates with and without UTC offset, you should provide both with offset or a tz")
+            self._aware = aware
+
+        year, month, day, hour, minute = fields
+        unit = self.unit
+        if unit == "yyyy":
+            key = year
+        elif unit == "yyyy_mm":
+            key = year * 12 + month - 1
+        elif unit == "yyyy_mm_dd":
+            key = _ordinal(year, month, day)
+        elif unit == "yyyy_mm_dd_hh":
+            key = _ordinal(year, month, day) * 24 + hour
+        else:
+            key = (_ordinal(year, month, day) * 24 + hour) * 60 + minute
+        if offset is not None:
+            if self._length > 7:
+                key = key * _OFFSETS + offset.days * 86400 + offset.seconds + 86400
+        elif isinstance(timestamp, str) and len(timestamp) >= self._prefix:
+            if len(self._keys) >= _MAX_KEYS:
+                self._keys.clear()
+            self._keys[timestamp[:self._prefix]] = key
+        return key
+
+    def _label(self, key: int) -> str:
+        unit = self.unit
+        suffix = ":00"
+        if self._aware and self._length > 7:
+            key, offset = divmod(key, _OFFSETS)
+            suffix += "Z" if offset == 86400 else _format_offset(datetime.timedelta(seconds=offset - 86400))
+        if unit == "yyyy":
+            return str(key) + "-01-01"
+        if unit == "yyyy_mm":
+            year, month = divmod(key, 12)
+            return str(year) + "-" + _TWO_DIGITS[month + 1] + "-01"
+        minute = hour = 0
+        if unit == "yyyy_mm_dd_hh_mm":
+            key, minute = divmod(key, 60)
+        if unit != "yyyy_mm_dd":
+            key, hour = divmod(key, 24)
+        return _format_yyyy_mm_dd(*_from_ordinal(key)) + "T" + _TWO_DIGITS[hour] + ":" + _TWO_DIGITS[minute] + suffix
+
+
+def aggregate_by(pairs: Iterable[Tuple[Union[str, datetime.date], Number]],
+                 unit: str = "yyyy_mm_dd_hh") -> Dict[str, Bucket]:
+    """
+    Count, sum, min and max of the values of (timestamp, value) pairs per bucket of unit
+
+    >>> aggregate_by([('2020-05-14T10:00:00Z', 1), ('2020-05-14T12:30:00+02:00', 2), ('2020-05-14T10:59Z', 3)], 'yyyy_mm_dd_hh')
+    {'2020-05-14T10:00:00Z': Bucket(count=2, sum=4, min=1, max=3), '2020-05-14T12:00:00+02:00': Bucket(count=1, sum=2, ...)}
+    """
+    aggregator = BucketAggregator(unit)
+    aggregator.update(pairs)
+    return aggregator.results()
+
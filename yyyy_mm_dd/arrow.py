@@ -0,0 +1,278 @@
+"""
+pyarrow integration, with the functions of `yyyy_mm_dd` under the same names taking and
+returning Arrow arrays, computed in bulk by `yyyy_mm_dd.many` on the underlying buffers:
+
+>>> import pyarrow
+>>> from yyyy_mm_dd import arrow
+>>> arrow.move_yyyy_mm(pyarrow.array(['2020-01-31', None]), 1).to_pylist()
+['2020-02-29', None]
+>>> arrow.start_of_yyyy_mm(pyarrow.array([datetime.date(2020, 5, 14)]))
+<pyarrow.lib.Date32Array object at ...>
+[
+  2020-05-01
+]
+>>> arrow.diff_yyyy_mm_dd(pyarrow.array(['2020-01-01']), '2020-02-01').to_pylist()
+[31]
+>>> arrow.yyyy_qq(pyarrow.array(['2020-05-14T10:20:30', None])).to_pylist()
+['2020-Q2', None]
+>>> arrow.start_of_yyyy_mm_dd(pyarrow.array(['2021-03-28T12:00Z']), tz='Europe/Berlin').to_pylist()
+['2021-03-28T00:00:00+01:00']
+
+Timestamp and date arrays keep their type, strings come back in the same format and nulls
+stay null. Chunked arrays are combined into a single array first. pyarrow is only imported
+when this module is.
+"""
+import datetime  # noqa: F401
+from typing import Any, Optional
+
+import numpy
+import pyarrow  # type: ignore
+
+from yyyy_mm_dd import many
+
+
+def move_yyyy(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy`"""
+    return _apply(many.move_yyyy_many, array, by, tz=tz)
+
+
+def move_yyyy_mm(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy_mm`"""
+    return _apply(many.move_yyyy_mm_many, array, by, tz=tz)
+
+
+def move_yyyy_qq(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy_qq`"""
+    return _apply(many.move_yyyy_qq_many, array, by, tz=tz)
+
+
+def move_yyyy_ww(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy_ww`"""
+    return _apply(many.move_yyyy_ww_many, array, by, tz=tz)
+
+
+def move_yyyy_mm_dd(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy_mm_dd`"""
+    return _apply(many.move_yyyy_mm_dd_many, array, by, tz=tz)
+
+
+def move_yyyy_mm_dd_hh(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy_mm_dd_hh`"""
+    return _apply(many.move_yyyy_mm_dd_hh_many, array, by, tz=tz)
+
+
+def move_yyyy_mm_dd_hh_mm(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy_mm_dd_hh_mm`"""
+    return _apply(many.move_yyyy_mm_dd_hh_mm_many, array, by, tz=tz)
+
+
+def move_yyyy_mm_dd_hh_mm_ss(array: Any, by: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.move_yyyy_mm_dd_hh_mm_ss`"""
+    return _apply(many.move_yyyy_mm_dd_hh_mm_ss_many, array, by, tz=tz)
+
+
+def diff_yyyy(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy`"""
+    return _apply(many.diff_yyyy_many, array, other, tz=tz)
+
+
+def diff_yyyy_mm(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy_mm`"""
+    return _apply(many.diff_yyyy_mm_many, array, other, tz=tz)
+
+
+def diff_yyyy_qq(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy_qq`"""
+    return _apply(many.diff_yyyy_qq_many, array, other, tz=tz)
+
+
+def diff_yyyy_ww(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy_ww`"""
+    return _apply(many.diff_yyyy_ww_many, array, other, tz=tz)
+
+
+def diff_yyyy_mm_dd(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy_mm_dd`"""
+    return _apply(many.diff_yyyy_mm_dd_many, array, other, tz=tz)
+
+
+def diff_yyyy_mm_dd_hh(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy_mm_dd_hh`"""
+    return _apply(many.diff_yyyy_mm_dd_hh_many, array, other, tz=tz)
+
+
+def diff_yyyy_mm_dd_hh_mm(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy_mm_dd_hh_mm`"""
+    return _apply(many.diff_yyyy_mm_dd_hh_mm_many, array, other, tz=tz)
+
+
+def diff_yyyy_mm_dd_hh_mm_ss(array: Any, other: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.diff_yyyy_mm_dd_hh_mm_ss`"""
+    return _apply(many.diff_yyyy_mm_dd_hh_mm_ss_many, array, other, tz=tz)
+
+
+def start_of_yyyy(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.start_of_yyyy`"""
+    return _apply(many.start_of_yyyy_many, array, tz=tz)
+
+
+def start_of_yyyy_mm(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.start_of_yyyy_mm`"""
+    return _apply(many.start_of_yyyy_mm_many, array, tz=tz)
+
+
+def start_of_yyyy_qq(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.start_of_yyyy_qq`"""
+    return _apply(many.start_of_yyyy_qq_many, array, tz=tz)
+
+
+def start_of_yyyy_ww(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.start_of_yyyy_ww`"""
+    return _apply(many.start_of_yyyy_ww_many, array, tz=tz)
+
+
+def start_of_yyyy_mm_dd(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.start_of_yyyy_mm_dd`"""
+    return _apply(many.start_of_yyyy_mm_dd_many, array, tz=tz)
+
+
+def start_of_yyyy_mm_dd_hh(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.start_of_yyyy_mm_dd_hh`"""
+    return _apply(many.start_of_yyyy_mm_dd_hh_many, array, tz=tz)
+
+
+def start_of_yyyy_mm_dd_hh_mm(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.start_of_yyyy_mm_dd_hh_mm`"""
+    return _apply(many.start_of_yyyy_mm_dd_hh_mm_many, array, tz=tz)
+
+
+def end_of_yyyy(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.end_of_yyyy`"""
+    return _apply(many.end_of_yyyy_many, array, tz=tz)
+
+
+def end_of_yyyy_mm(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.end_of_yyyy_mm`"""
+    return _apply(many.end_of_yyyy_mm_many, array, tz=tz)
+
+
+def end_of_yyyy_qq(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.end_of_yyyy_qq`"""
+    return _apply(many.end_of_yyyy_qq_many, array, tz=tz)
+
+
+def end_of_yyyy_ww(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.end_of_yyyy_ww`"""
+    return _apply(many.end_of_yyyy_ww_many, array, tz=tz)
+
+
+def end_of_yyyy_mm_dd(array: Any, tz: Optional[str] = None) -> Any:
+    """See `yyyy_mm_dd.end_of_yyyy_mm_dd`"""
+    return _apply(many.end_of_yyyy_mm_dd_many, array, tz=tz)
+
+
+def yyyy(array: Any) -> Any:
+    """See `yyyy_mm_dd.yyyy`"""
+    return _apply(many.yyyy_many, array)
+
+
+def yyyy_mm(array: Any) -> Any:
+    """See `yyyy_mm_dd.yyyy_mm`"""
+    return _apply(many.yyyy_mm_many, array)
+
+
+def yyyy_mm_dd(array: Any) -> Any:
+    """See `yyyy_mm_dd.yyyy_mm_dd`"""
+    return _apply(many.yyyy_mm_dd_many, array)
+
+
+def yyyy_qq(array: Any) -> Any:
+    """See `yyyy_mm_dd.yyyy_qq`"""
+    return _apply(many.yyyy_qq_many, array)
+
+
+def yyyy_ww(array: Any) -> Any:
+    """See `yyyy_mm_dd.yyyy_ww`"""
+    return _apply(many.yyyy_ww_many, array)
+
+
+def year(array: Any) -> Any:
+    """See `yyyy_mm_dd.year`"""
+    return _apply(many.year_many, array)
+
+
+def month(array: Any) -> Any:
+    """See `yyyy_mm_dd.month`"""
+    return _apply(many.month_many, array)
+
+
+def day(array: Any) -> Any:
+    """See `yyyy_mm_dd.day`"""
+    return _apply(many.day_many, array)
+
+
+def hour(array: Any) -> Any:
+    """See `yyyy_mm_dd.hour`"""
+    return _apply(many.hour_many, array)
+
+
+def weekday(array: Any) -> Any:
+    """See `yyyy_mm_dd.weekday`"""
+    return _apply(many.weekday_many, array)
+
+
+def to_yyyymmdd(array: Any) -> Any:
+    """See `yyyy_mm_dd.to_yyyymmdd`"""
+    return _apply(many.to_yyyymmdd_many, array)
+
+
+def _apply(function: Any, array: Any, *arguments: Any, **options: Any) -> Any:
+    array = _combine(array)
+    mask = array.is_null().to_numpy(zero_copy_only=False)
+    arguments = tuple(_combine(argument) for argument in arguments)
+    for argument in arguments:
+        if isinstance(argument, pyarrow.Array):
+            mask = mask | argument.is_null().to_numpy(zero_copy_only=False)
+    present = ~mask if mask.any() else slice(None)
+
+    values = _values(array, present)
+    result = function(values, *[
+        _values(argument, present) if isinstance(argument, pyarrow.Array) else
+        numpy.asarray(argument)[present] if numpy.ndim(argument) > 0 else argument
+        for argument in arguments
+    ], **options)
+
+    arrow_type = None
+    if result.dtype.kind == "M" and pyarrow.types.is_timestamp(array.type):
+        result = result.astype(values.dtype)
+        arrow_type = array.type
+    elif result.dtype.kind == "U" and _is_string(array.type):
+        arrow_type = array.type
+    if mask.any():
+        expanded = numpy.zeros(len(mask), dtype=result.dtype)
+        expanded[present] = result
+        result = expanded
+    return pyarrow.array(result, mask=mask if mask.any() else None, type=arrow_type)
+
+
+def _combine(array: Any) -> Any:
+    if isinstance(array, pyarrow.ChunkedArray):
+        return array.combine_chunks()
+    return array
+
+
+def _values(array: Any, present: Any) -> Any:
+    """
+    Returns the values of the array as a numpy array many can compute in bulk,
+    datetime64 for timestamps and dates and a fixed width unicode array for strings
+    """
+    if pyarrow.types.is_timestamp(array.type) and array.type.tz is not None:
+        raise TypeError("Timezone aware timestamps are not supported, got %s" % array.type)
+    values = array.to_numpy(zero_copy_only=False)[present]
+    if _is_string(array.type):
+        return values.astype(str)
+    return values
+
+
+def _is_string(arrow_type: Any) -> bool:
+    return pyarrow.types.is_string(arrow_type) or pyarrow.types.is_large_string(arrow_type)
@@ -0,0 +1,219 @@
+"""
+Conversion between yyyymmdd and yyyy-mm-dd over whole buffers, like the contents of a flat
+file or a memory-mapped one, without creating a string per date.
+
+The dates are either separated by a delimiter, one per line by default, or found at the
+same offset of records of a fixed size. Each position of the dates, and of the rest of the
+records, is moved into a preallocated output with a single strided slice assignment, so
+every byte is copied in C. Validation, when enabled, is a single pass of a regular
+expression over the buffer, checking the digits, the month and the day, leap years included:
+
+>>> from_yyyymmdd_bytes(b'20200514\\n20200229\\n')
+bytearray(b'2020-05-14\\n2020-02-29\\n')
+>>> to_yyyymmdd_bytes(b'id=1;2020-05-14;id=2;2020-02-29;', record_size=16, offset=5)
+bytearray(b'id=1;20200514;id=2;20200229;')
+>>> from_yyyymmdd_bytes(b'20200514,20190229', delimiter=b',')
+Traceback (most recent call last):
+    ...
+ValueError: Could not convert record 1, expected a yyyymmdd date, got b'20190229'
+"""
+import functools
+import mmap
+import os
+import re
+import sys
+from typing import Any, Optional, Pattern, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# positions of the digits on yyyymmdd and on yyyy-mm-dd
+_DIGITS = (0, 1, 2, 3, 4, 5, 6, 7)
+
+_DASHED_DIGITS = (0, 1, 2, 3, 5, 6, 8, 9)
+
+# the records do not overlap, so there is nothing to backtrack into, and a possessive
+# repeat, from Python 3.11, validates about three times as fast
+_REPEAT = b"*+" if sys.version_info >= (3, 11) else b"*"
+
+
+def from_yyyymmdd_bytes(data: Buffer, delimiter: bytes = b"\n", record_size: Optional[int] = None, offset: int = 0,
+                        validate: bool = True, out: Optional[Any] = None) -> Any:
+    """
+    Converts the yyyymmdd dates of a buffer to yyyy-mm-dd, the same as from_yyyymmdd on
+    each of them. Without record_size, the buffer has only dates, each followed by the
+    delimiter except for maybe the last one. With it, the buffer is made of records of
+    record_size bytes with a date at offset, and the rest of them is kept as it is.
+
+    The result is a new bytearray, or a memoryview of the start of out when given, which
+    can be any writable buffer large enough, like a bytearray reused between calls
+
+    >>> from_yyyymmdd_bytes(b'2020051420201231', delimiter=b'')
+    bytearray(b'2020-05-142020-12-31')
+    >>> from_yyyymmdd_bytes(b'20200514\\n20200230\\n')
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not convert record 1, expected a yyyymmdd date, got b'20200230\\n'
+    """
+    return _convert(data, delimiter, record_size, offset, validate, out, _DIGITS, _DASHED_DIGITS)
+
+
+def to_yyyymmdd_bytes(data: Buffer, delimiter: bytes = b"\n", record_size: Optional[int] = None, offset: int = 0,
+                      validate: bool = True, out: Optional[Any] = None) -> Any:
+    """
+    Converts the yyyy-mm-dd dates of a buffer to yyyymmdd, laid out the same way as for
+    from_yyyymmdd_bytes
+
+    >>> to_yyyymmdd_bytes(b'2020-05-14\\r\\n2020-12-31', delimiter=b'\\r\\n')
+    bytearray(b'20200514\\r\\n20201231')
+    """
+    return _convert(data, delimiter, record_size, offset, validate, out, _DASHED_DIGITS, _DIGITS)
+
+
+def from_yyyymmdd_file(source: str, target: str, delimiter: bytes = b"\n", record_size: Optional[int] = None,
+                       offset: int = 0, validate: bool = True, chunk_size: int = 1 << 22) -> None:
+    """
+    Rewrites a file of yyyymmdd dates laid out as for from_yyyymmdd_bytes to a file of
+    yyyy-mm-dd, in a single pass of chunks of about chunk_size bytes. On an invalid record
+    target is left as it was
+
+    >>> import os, tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> source, target = os.path.join(directory, 'source'), os.path.join(directory, 'target')
+    >>> _ = open(source, 'wb').write(b'20200514\\n20201331\\n')
+    >>> from_yyyymmdd_file(source, target)
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not convert record 1, expected a yyyymmdd date, got b'20201331\\n'
+    >>> os.listdir(directory)
+    ['source']
+    """
+    _convert_file(source, target, delimiter, record_size, offset, validate, chunk_size, _DIGITS, _DASHED_DIGITS)
+
+
+def to_yyyymmdd_file(source: str, target: str, delimiter: bytes = b"\n", record_size: Optional[int] = None,
+                     offset: int = 0, validate: bool = True, chunk_size: int = 1 << 22) -> None:
+    """
+    Rewrites a file of yyyy-mm-dd dates laid out as for to_yyyymmdd_bytes to a file of
+    yyyymmdd, in a single pass of chunks of about chunk_size bytes
+    """
+    _convert_file(source, target, delimiter, record_size, offset, validate, chunk_size, _DASHED_DIGITS, _DIGITS)
+
+
+def _convert(data: Buffer, delimiter: bytes, record_size: Optional[int], offset: int, validate: bool,
+             out: Optional[Any], source: Tuple[int, ...], target: Tuple[int, ...], first: int = 0) -> Any:
+    """
+    Moves the digits of the dates from their source positions to their target positions,
+    first is the number of the first record, for the error messages
+    """
+    size = source[-1] + 1
+    target_size = target[-1] + 1
+    stride, records, missing = _layout(len(data), size, delimiter, record_size, offset)
+    if validate:
+        _validate(data, size, stride, offset, delimiter if record_size is None else None, first)
+
+    out_stride = stride + target_size - size
+    length = records * out_stride - missing
+    given = out is not None
+    if out is None:
+        out = bytearray(length)
+    elif len(out) < length:
+        raise ValueError("Output buffer should have at least %d bytes, got %d" % (length, len(out)))
+
+    # bytes around the date, then the digits, then the dashes when there are any
+    moves = [(position, position) for position in range(offset)]
+    moves += [(position, position + target_size - size) for position in range(offset + size, stride)]
+    moves += [(offset + source_position, offset + target_position) for source_position, target_position in zip(source, target)]
+    for source_position, target_position in moves:
+        out[target_position:length:out_stride] = data[source_position::stride]
+    if target_size == 10:
+        dashes = b"-" * records
+        out[offset + 4:length:out_stride] = dashes
+        out[offset + 7:length:out_stride] = dashes
+    return memoryview(out)[:length] if given else out
+
+
+def _layout(length: int, size: int, delimiter: bytes, record_size: Optional[int], offset: int) -> Tuple[int, int, int]:
+    """
+    Size of each record, amount of records, and amount of bytes missing from the last
+    one, which is the delimiter when it is not at the end
+
+    >>> _layout(17, 8, b'\\n', None, 0)
+    (9, 2, 1)
+    """
+    if record_size is None:
+        if offset:
+            raise ValueError("The offset of the dates can only be given along with a record_size")
+        stride = size + len(delimiter)
+        if length % stride == 0:
+            return (stride, length // stride, 0)
+        if (length + len(delimiter)) % stride == 0:
+            return (stride, (length + len(delimiter)) // stride, len(delimiter))
+        raise ValueError("Buffer of %d bytes is not made of dates of %d bytes separated by %r" % (length, size, delimiter))
+
+    if offset < 0 or offset + size > record_size:
+        raise ValueError("Date at offset %d does not fit on records of %d bytes" % (offset, record_size))
+    if length % record_size:
+        raise ValueError("Buffer of %d bytes is not made of records of %d bytes" % (length, record_size))
+    return (record_size, length // record_size, 0)
+
+
+def _validate(data: Buffer, size: int, stride: int, offset: int, delimiter: Optional[bytes], first: int) -> None:
+    pattern = _pattern(size, stride, offset, delimiter)
+    if pattern.fullmatch(data) is None:
+        # the pattern is made of fixed size records, so the longest match ends on the first invalid one
+        match = pattern.match(data)
+        index = (match.end() if match is not None else 0) // stride
+        record = bytes(data[index * stride:(index + 1) * stride]) if delimiter is not None \
+            else bytes(data[index * stride + offset:index * stride + offset + size])
+        raise ValueError("Could not convert record %d, expected a %s date, got %r" % (
+            first + index, "yyyy-mm-dd" if size == 10 else "yyyymmdd", record))
+
+
+@functools.lru_cache(maxsize=None)
+def _pattern(size: int, stride: int, offset: int, delimiter: Optional[bytes]) -> Pattern[bytes]:
+    date = _date_pattern(b"-" if size == 10 else b"")
+    if delimiter is not None:
+        return re.compile(b"(?:%s%s)%s(?:%s)?" % (date, re.escape(delimiter), _REPEAT, date))
+    return re.compile(b"(?:.{%d}%s.{%d})%s" % (offset, date, stride - offset - size, _REPEAT), re.DOTALL)
+
+
+def _date_pattern(dash: bytes) -> bytes:
+    """
+    Valid dates from the year 1000, with the year, month and day separated by dash
+
+    >>> [bool(re.fullmatch(_date_pattern(b''), date)) for date in (b'20000229', b'21000229', b'20200431')]
+    [True, False, False]
+    """
+    month_day = b"(?:(?:0[13578]|1[02])%s(?:0[1-9]|[12][0-9]|3[01])|(?:0[469]|11)%s(?:0[1-9]|[12][0-9]|30)" \
+        b"|02%s(?:0[1-9]|1[0-9]|2[0-8]))" % (dash, dash, dash)
+    leap_year = b"(?:[1-9][0-9](?:0[48]|[2468][048]|[13579][26])|(?:[2468][048]|[13579][26])00)"
+    return b"(?:[1-9][0-9]{3}%s%s|%s%s02%s29)" % (dash, month_day, leap_year, dash, dash)
+
+
+def _convert_file(source: str, target: str, delimiter: bytes, record_size: Optional[int], offset: int,
+                  validate: bool, chunk_size: int, source_positions: Tuple[int, ...],
+                  target_positions: Tuple[int, ...]) -> None:
+    """
+    Reads whole records a chunk at a time, converting them into the same output buffer.
+    Writes to a temporary file next to target, which only replaces target once every
+    record was converted, and is removed when one fails
+    """
+    stride = record_size if record_size is not None else source_positions[-1] + 1 + len(delimiter)
+    chunk = max(1, chunk_size // stride) * stride
+    out = bytearray(chunk + chunk // stride * 2)
+    records = 0
+    temporary = "%s.%d.tmp" % (target, os.getpid())
+    try:
+        with open(source, "rb") as reader, open(temporary, "wb") as writer:
+            while True:
+                data = reader.read(chunk)
+                if not data:
+                    break
+                writer.write(_convert(data, delimiter, record_size, offset, validate, out,
+                                      source_positions, target_positions, records))
+                records += chunk // stride
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
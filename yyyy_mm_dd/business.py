@@ -0,0 +1,198 @@
+"""
+Business days, skipping weekends and holidays, with moves and diffs that take the same
+time however far apart the dates are.
+
+A `BusinessCalendar` compiles its holidays into a bitmap of open days over a span of
+whole years, with the running count of business days before each day and the list of
+business days in order. A diff is then the difference of two counts, and a move is an
+index into the list. The span grows by whole years as dates outside of it are used, building only the new years.
+
+>>> calendar = BusinessCalendar(['2020-12-25', '2021-01-01'])
+>>> move_business_yyyy_mm_dd('2020-12-24', 1, calendar)
+'2020-12-28'
+>>> diff_business_yyyy_mm_dd('2020-12-21', '2021-01-04', calendar)
+8
+"""
+import datetime
+import itertools
+from array import array
+from typing import Iterable, Optional, Tuple, Union
+
+from yyyy_mm_dd import _day_ordinal, _ordinal, move_yyyy_mm_dd
+
+_FIRST_ORDINAL = datetime.date.min.toordinal()
+
+_LAST_ORDINAL = datetime.date.max.toordinal()
+
+
+class BusinessCalendar:
+    """
+    Holidays and weekend days, by default Saturday and Sunday, as numbered by date.weekday()
+
+    >>> BusinessCalendar(weekend=(4, 5)).is_business_day('2020-05-15')
+    False
+    """
+    __slots__ = ("weekend", "_holidays", "_span")
+
+    def __init__(self, holidays: Iterable[Union[str, datetime.date]] = (), weekend: Iterable[int] = (5, 6)) -> None:
+        self._holidays = frozenset(_day_ordinal(holiday) for holiday in holidays)
+        self.weekend = frozenset(weekend)
+        if not self.weekend < frozenset(range(7)):
+            raise ValueError("The weekend should be some of the weekdays from 0 to 6, leaving at least one business day")
+        # the first day, open days, counts and business days of the span, replaced as a whole
+        # when it grows, so calendars shared between threads never see half of a span
+        self._span = (0, bytearray(), array("l", [0]), array("l"), 0)  # type: _Span
+
+    @classmethod
+    def from_file(cls, path: str, weekend: Iterable[int] = (5, 6), encoding: str = "utf-8") -> "BusinessCalendar":
+        """
+        Loads the holidays from a plain text file with one date per line, anything after
+        the date is ignored, and so are blank lines and lines starting with #
+        """
+        holidays = []
+        with open(path, encoding=encoding) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    holidays.append(line.split()[0])
+        return cls(holidays, weekend)
+
+    def __repr__(self) -> str:
+        return "<BusinessCalendar with %d holidays>" % len(self._holidays)
+
+    def is_business_day(self, yyyy_mm_dd: Union[str, datetime.date]) -> bool:
+        ordinal = _day_ordinal(yyyy_mm_dd)
+        first, is_open, _, _, _ = self._cover(ordinal, ordinal)
+        return bool(is_open[ordinal - first])
+
+    def move(self, ordinal: int, by: int) -> int:
+        """
+        Ordinal of the business day by business days after ordinal, or before it when by is
+        negative. Days that are not business days count from the next or previous one
+
+        >>> calendar = BusinessCalendar()
+        >>> [datetime.date.fromordinal(calendar.move(datetime.date(2020, 5, 16).toordinal(), by)) for by in (1, -1)]
+        [datetime.date(2020, 5, 18), datetime.date(2020, 5, 15)]
+        >>> datetime.date.fromordinal(calendar.move(datetime.date(2020, 5, 16).toordinal(), -600))
+        datetime.date(2018, 1, 29)
+        """
+        if by == 0:
+            return ordinal
+        # covers about as many days as needed up front, so far moves build the span only once
+        reach = abs(by) * 7 // (7 - len(self.weekend)) + 7
+        span = self._cover(max(ordinal - reach, _FIRST_ORDINAL) if by < 0 else ordinal,
+                           min(ordinal + reach, _LAST_ORDINAL) if by > 0 else ordinal)
+        while True:
+            first, is_open, counts, days, base = span
+            if by > 0:
+                index = counts[ordinal + 1 - first] - base + by - 1
+            else:
+                index = counts[ordinal - first] - base + by
+            if 0 <= index < len(days):
+                return days[index]
+            if index < 0:
+                if first == _FIRST_ORDINAL:
+                    raise OverflowError("date value out of range")
+                span = self._cover(first - 1, first)
+            else:
+                last = first + len(is_open) - 1
+                if last == _LAST_ORDINAL:
+                    raise OverflowError("date value out of range")
+                span = self._cover(last, last + 1)
+
+    def diff(self, a: int, b: int) -> int:
+        """
+        Amount of business days from ordinal a up to, but not including, b, negative when
+        b comes before a
+        """
+        first, _, counts, _, _ = self._cover(min(a, b), max(a, b))
+        return counts[b - first] - counts[a - first]
+
+    def _cover(self, first: int, last: int) -> "_Span":
+        """
+        Extends the span to the whole years from first to last, building only the years
+        it did not have yet, and returns it
+        """
+        span = self._span
+        covered_first, is_open, counts, days, base = span
+        covered_last = covered_first + len(is_open) - 1
+        if is_open and covered_first <= first and last <= covered_last:
+            return span
+        start = _ordinal(datetime.date.fromordinal(first).year, 1, 1)
+        end = _ordinal(datetime.date.fromordinal(last).year, 12, 31)
+        if not is_open:
+            is_open, days = self._build(start, end)
+            counts = array("l", itertools.accumulate(itertools.chain((0,), is_open)))
+            covered_first = start
+        else:
+            if start < covered_first:
+                # counts keep their values, the ones before them go below, down from base
+                built_open, built_days = self._build(start, covered_first - 1)
+                base -= len(built_days)
+                built_counts = array("l", itertools.accumulate(itertools.chain((base,), built_open)))
+                is_open = built_open + is_open
+                counts = built_counts[:-1] + counts
+                days = built_days + days
+                covered_first = start
+            if end > covered_last:
+                built_open, built_days = self._build(covered_last + 1, end)
+                built_counts = array("l", itertools.accumulate(itertools.chain((counts[-1],), built_open)))
+                is_open = is_open + built_open
+                counts = counts + built_counts[1:]
+                days = days + built_days
+        span = (covered_first, is_open, counts, days, base)
+        self._span = span
+        return span
+
+    def _build(self, first: int, last: int) -> Tuple[bytearray, array]:
+        """
+        Open days and business days from first to last
+        """
+        weekday = (first + 6) % 7
+        is_open = bytearray(last - first + 1)
+        days = array("l")
+        for offset in range(last - first + 1):
+            ordinal = first + offset
+            if (weekday + offset) % 7 not in self.weekend and ordinal not in self._holidays:
+                is_open[offset] = 1
+                days.append(ordinal)
+        return (is_open, days)
+
+
+# counts are business days before each day plus base, the index of each day on days
+_Span = Tuple[int, bytearray, array, array, int]
+
+
+def move_business_yyyy_mm_dd(yyyy_mm_dd: Union[str, datetime.date], by: int,
+                             calendar: Optional[BusinessCalendar] = None) -> Union[str, datetime.date]:
+    """
+    Increases or decreases the date by a certain number of business days, on Saturdays
+    and Sundays only when no calendar is given, keeping the format and the time of the day
+
+    >>> move_business_yyyy_mm_dd('2020-05-15', 1)
+    '2020-05-18'
+    >>> move_business_yyyy_mm_dd('2020-05-18T10:20:30', -1)
+    '2020-05-15T10:20:30'
+    >>> move_business_yyyy_mm_dd(datetime.date(2020, 5, 16), 10)
+    datetime.date(2020, 5, 29)
+    """
+    ordinal = _day_ordinal(yyyy_mm_dd)
+    target = (calendar or _WEEKDAYS).move(ordinal, by)
+    return move_yyyy_mm_dd(yyyy_mm_dd, target - ordinal)
+
+
+def diff_business_yyyy_mm_dd(a: Union[str, datetime.date], b: Union[str, datetime.date],
+                             calendar: Optional[BusinessCalendar] = None) -> int:
+    """
+    Returns the amount of business days from the day of A up to, but not including, the
+    day of B, on Saturdays and Sundays only when no calendar is given
+
+    >>> diff_business_yyyy_mm_dd('2020-05-15', '2020-05-18')
+    1
+    >>> diff_business_yyyy_mm_dd('2020-05-18T23:59', '2020-05-15T00:00')
+    -1
+    """
+    return (calendar or _WEEKDAYS).diff(_day_ordinal(a), _day_ordinal(b))
+
+
+_WEEKDAYS = BusinessCalendar()
@@ -0,0 +1,399 @@
+"""
+Compact columns of dates, storing each value as an integer in an `array` instead of a
+string or a `datetime` object, and only turning them back into strings when iterated.
+
+`DateColumn` keeps days since 1970-01-01 in an `array('i')`, `DateTimeColumn` keeps
+seconds since 1970-01-01T00:00:00 in an `array('q')`. Both remember the format of the
+values they were built from, the same way the rest of the library does, so results come
+back in the same format they came in. Values are naive and down to the second, values with
+a UTC offset or microseconds are rejected instead of losing them.
+"""
+import abc
+import datetime
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from yyyy_mm_dd import (
+    _EPOCH_ORDINAL as _EPOCH,
+    _PATTERNS_BY_LENGTH,
+    _TWO_DIGITS,
+    _days_in_month,
+    _epoch_seconds,
+    _from_ordinal,
+    _ordinal,
+    _parse,
+    _split_canonical,
+    _strftime,
+)
+
+_MIN_ORDINAL = datetime.date.min.toordinal()
+
+_MAX_ORDINAL = datetime.date.max.toordinal()
+
+_DATE_PATTERNS = ("%Y", "%Y-%m", "%Y-%m-%d", "date")
+
+
+class _Column(abc.ABC):
+    __slots__ = ("_values", "_pattern")
+
+    _typecode = "q"
+    _per_day = 1
+    _default_pattern = "%Y-%m-%d"
+
+    def __init__(self, values: Iterable[Union[str, datetime.date]] = ()) -> None:
+        self._values = array(self._typecode)
+        self._pattern = None  # type: Optional[str]
+        for value in values:
+            integer, pattern = self._to_integer(value)
+            if self._pattern is None:
+                self._pattern = pattern
+            elif pattern != self._pattern:
+                raise ValueError(
+                    "All values of a column should have the same format, expected %s but got %r" % (self._pattern, value))
+            self._values.append(integer)
+        if self._pattern is None:
+            self._pattern = self._default_pattern
+
+    @classmethod
+    def from_epoch(cls, values: Iterable[int], pattern: Optional[str] = None) -> Any:
+        """
+        Builds a column straight from epoch days (or seconds for DateTimeColumn), which
+        will be formatted with pattern, or as date/datetime objects for "date"/"datetime"
+        """
+        column = cls.__new__(cls)
+        column._values = array(cls._typecode, values)
+        column._pattern = pattern or cls._default_pattern
+        return column
+
+    @property
+    def values(self) -> array:
+        """
+        The underlying array of epoch days, or epoch seconds for DateTimeColumn
+        """
+        return self._values
+
+    @property
+    def pattern(self) -> str:
+        """
+        The format of the values, as given by the library's parsing, like "%Y-%m" or "date"
+        """
+        return self._pattern or self._default_pattern
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[Union[str, datetime.date]]:
+        pattern = self.pattern
+        for value in self._values:
+            yield self._format(value, pattern)
+
+    def __getitem__(self, index: int) -> Union[str, datetime.date]:
+        return self._format(self._values[index], self.pattern)
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self._values == other._values and \
+            self.pattern == other.pattern  # type: ignore
+
+    def __repr__(self) -> str:
+        return "%s(%r)" % (type(self).__name__, self.to_list())
+
+    def to_list(self) -> List[Union[str, datetime.date]]:
+        """
+        Formats all the values, in the same format they came in
+        """
+        return list(self)
+
+    def move_yyyy(self, by: int) -> Any:
+        return self._move_months(by * 12, "%Y")
+
+    def move_yyyy_mm(self, by: int) -> Any:
+        return self._move_months(by, "%Y-%m")
+
+    def move_yyyy_mm_dd(self, by: int) -> Any:
+        self._check("%Y-%m-%d")
+        return self._derive(self._add(by * self._per_day), self.pattern)
+
+    def diff_yyyy(self, other: Any) -> array:
+        months = self._diff_months(other, "%Y")
+        return array("q", (month // 12 if month >= 0 else -(-month // 12) for month in months))
+
+    def diff_yyyy_mm(self, other: Any) -> array:
+        return array("q", self._diff_months(other, "%Y-%m"))
+
+    def diff_yyyy_mm_dd(self, other: Any) -> array:
+        return self._diff_seconds(other, "%Y-%m-%d", 86400)
+
+    def start_of_yyyy(self) -> Any:
+        return self._boundary("%Y", ceiling=False)
+
+    def start_of_yyyy_mm(self) -> Any:
+        return self._boundary("%Y-%m", ceiling=False)
+
+    def start_of_yyyy_mm_dd(self) -> Any:
+        return self._boundary("%Y-%m-%d", ceiling=False)
+
+    def end_of_yyyy(self) -> Any:
+        return self._boundary("%Y", ceiling=True)
+
+    def end_of_yyyy_mm(self) -> Any:
+        return self._boundary("%Y-%m", ceiling=True)
+
+    def end_of_yyyy_mm_dd(self) -> Any:
+        return self._boundary("%Y-%m-%d", ceiling=True)
+
+    def yyyy_mm(self) -> List[str]:
+        self._check("%Y-%m")
+        result = []
+        for value in self._values:
+            year, month, _ = _from_ordinal(value // self._per_day + _EPOCH)
+            result.append(str(year) + "-" + _TWO_DIGITS[month] if year >= 1000
+                          else datetime.date(year, month, 1).strftime("%Y-%m"))
+        return result
+
+    def year(self) -> array:
+        self._check("%Y")
+        return array("i", (_from_ordinal(value // self._per_day + _EPOCH)[0] for value in self._values))
+
+    def month(self) -> array:
+        self._check("%Y-%m")
+        return array("i", (_from_ordinal(value // self._per_day + _EPOCH)[1] for value in self._values))
+
+    def day(self) -> array:
+        self._check("%Y-%m-%d")
+        return array("i", (_from_ordinal(value // self._per_day + _EPOCH)[2] for value in self._values))
+
+    @abc.abstractmethod
+    def _to_integer(self, value: Union[str, datetime.date]) -> Tuple[int, str]:
+        """
+        Epoch days, or seconds, of a value and its pattern
+        """
+
+    def _format(self, value: int, pattern: str) -> Union[str, datetime.date]:
+        days, seconds = divmod(value, self._per_day)
+        year, month, day = _from_ordinal(days + _EPOCH)
+        if self._per_day == 86400:
+            hour, seconds = divmod(seconds, 3600)
+            minute, second = divmod(seconds, 60)
+        else:
+            hour = minute = second = 0
+
+        if year < 1000 or pattern in ("date", "datetime"):
+            return _strftime(datetime.datetime(year, month, day, hour, minute, second), pattern)
+        text = str(year) + "-" + _TWO_DIGITS[month] + "-" + _TWO_DIGITS[day] + "T" + \
+            _TWO_DIGITS[hour] + ":" + _TWO_DIGITS[minute] + ":" + _TWO_DIGITS[second]
+        return text[:_LENGTHS_BY_PATTERN[pattern]]
+
+    def _check(self, at_least: str) -> None:
+        if self.pattern not in ("date", "datetime") and at_least not in self.pattern:
+            raise ValueError(
+                "Could not parse date for operation, you should provide at least %s" % at_least)
+
+    def _add(self, step: int) -> array:
+        result = array(self._typecode, (value + step for value in self._values))
+        if result and (min(result) < (_MIN_ORDINAL - _EPOCH) * self._per_day or
+                       max(result) >= (_MAX_ORDINAL + 1 - _EPOCH) * self._per_day):
+            raise OverflowError("date value out of range")
+        return result
+
+    def _derive(self, values: array, pattern: str) -> Any:
+        return type(self).from_epoch(values, pattern)
+
+    def _move_months(self, months: int, at_least: str) -> Any:
+        self._check(at_least)
+        per_day = self._per_day
+        result = array(self._typecode)
+        for value in self._values:
+            days, seconds = divmod(value, per_day)
+            year, month, day = _from_ordinal(days + _EPOCH)
+            year, month = divmod(year * 12 + month - 1 + months, 12)
+            month += 1
+            if year < 1 or year > 9999:
+                raise ValueError("year %d is out of range" % year)
+            if day > 28:
+                day = min(day, _days_in_month(year, month))
+            result.append((_ordinal(year, month, day) - _EPOCH) * per_day + seconds)
+        return self._derive(result, self.pattern)
+
+    def _other_seconds(self, other: Any, at_least: str) -> Iterable[int]:
+        if isinstance(other, _Column):
+            if len(other) != len(self):
+                raise ValueError("Could not diff columns of %d and %d dates" % (len(self), len(other)))
+            other._check(at_least)
+            return (value * (86400 // other._per_day) for value in other._values)
+
+        date, _ = _parse(other, at_least=at_least)
+        seconds = _to_epoch_seconds(date, other)
+        return (seconds for _ in range(len(self._values)))
+
+    def _diff_seconds(self, other: Any, at_least: str, unit: int) -> array:
+        self._check(at_least)
+        scale = 86400 // self._per_day
+        return array("q", ((b - a * scale) // unit for a, b in zip(self._values, self._other_seconds(other, at_least))))
+
+    def _diff_months(self, other: Any, at_least: str) -> List[int]:
+        self._check(at_least)
+        scale = 86400 // self._per_day
+        result = []
+        for a, b in zip(self._values, self._other_seconds(other, at_least)):
+            days_a, seconds_a = divmod(a * scale, 86400)
+            days_b, seconds_b = divmod(b, 86400)
+            year_a, month_a, day_a = _from_ordinal(days_a + _EPOCH)
+            year_b, month_b, _ = _from_ordinal(days_b + _EPOCH)
+            months = (year_b - year_a) * 12 + month_b - month_a
+            year, month = divmod(year_a * 12 + month_a - 1 + months, 12)
+            month += 1
+            shifted = ((_ordinal(year, month, min(day_a, _days_in_month(year, month))) - _EPOCH) * 86400 + seconds_a)
+            if b >= a * scale:
+                if b < shifted:
+                    months -= 1
+            elif b > shifted:
+                months += 1
+            result.append(months)
+        return result
+
+    def _boundary(self, at_least: str, ceiling: bool) -> Any:
+        self._check(at_least)
+        per_day = self._per_day
+        days_only = at_least in ("%Y", "%Y-%m")
+        result = array("i" if days_only else "q")
+        for value in self._values:
+            days, seconds = divmod(value, per_day)
+            year, month, day = _from_ordinal(days + _EPOCH)
+            if at_least == "%Y":
+                days = _ordinal(year, 12, 31) - _EPOCH if ceiling else _ordinal(year, 1, 1) - _EPOCH
+            elif at_least == "%Y-%m":
+                days = _ordinal(year, month, _days_in_month(year, month) if ceiling else 1) - _EPOCH
+            elif at_least == "%Y-%m-%d":
+                seconds = 86399 if ceiling else 0
+            elif at_least == "%Y-%m-%dT%H":
+                seconds = seconds - seconds % 3600 + (3599 if ceiling else 0)
+            else:
+                seconds = seconds - seconds % 60 + (59 if ceiling else 0)
+            result.append(days if days_only else days * 86400 + seconds)
+
+        if days_only:
+            if self.pattern == "datetime":
+                return DateTimeColumn.from_epoch((days * 86400 for days in result), "datetime")
+            return DateColumn.from_epoch(result, "date" if self.pattern == "date" else "%Y-%m-%d")
+        if self.pattern in ("date", "datetime"):
+            return DateTimeColumn.from_epoch(result, "datetime")
+        return DateTimeColumn.from_epoch(result, "%Y-%m-%dT%H:%M:%S")
+
+
+class DateColumn(_Column):
+    """
+    Column of dates stored as days since 1970-01-01 in an `array('i')`
+
+    >>> column = DateColumn(['2020-01-31', '2020-02-29', '2020-12-31'])
+    >>> column.values
+    array('i', [18292, 18321, 18627])
+    >>> column.move_yyyy_mm(1)
+    DateColumn(['2020-02-29', '2020-03-29', '2021-01-31'])
+    >>> column.end_of_yyyy_mm().to_list()
+    ['2020-01-31', '2020-02-29', '2020-12-31']
+    >>> column.diff_yyyy_mm_dd('2021-01-01')
+    array('q', [336, 307, 1])
+    >>> column.yyyy_mm()
+    ['2020-01', '2020-02', '2020-12']
+    >>> DateColumn([datetime.date(2020, 5, 14)]).start_of_yyyy_mm_dd().to_list()
+    [datetime.datetime(2020, 5, 14, 0, 0)]
+    >>> DateColumn(['2020-05', '2020-06']).move_yyyy_mm_dd(1)
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not parse date for operation, you should provide at least %Y-%m-%d
+    """
+    __slots__ = ()
+
+    _typecode = "i"
+    _per_day = 1
+    _default_pattern = "%Y-%m-%d"
+
+    def _to_integer(self, value: Union[str, datetime.date]) -> Tuple[int, str]:
+        if isinstance(value, str):
+            fields = _split_canonical(value, 4)
+            if fields is not None and len(value) <= 10:
+                return (_ordinal(*fields) - _EPOCH, _PATTERNS_BY_LENGTH[len(value)])
+
+        date, pattern = _parse(value, at_least="%Y")
+        if pattern not in _DATE_PATTERNS:
+            raise ValueError("DateColumn can only hold dates, use DateTimeColumn for %r" % (value,))
+        return (date.toordinal() - _EPOCH, pattern)
+
+
+class DateTimeColumn(_Column):
+    """
+    Column of datetimes stored as seconds since 1970-01-01T00:00:00 in an `array('q')`
+
+    >>> column = DateTimeColumn(['2020-12-31T23:59:59', '2020-02-29T10:20:30'])
+    >>> column.values
+    array('q', [1609459199, 1582971630])
+    >>> column.move_yyyy_mm_dd_hh_mm_ss(1).to_list()
+    ['2021-01-01T00:00:00', '2020-02-29T10:20:31']
+    >>> column.start_of_yyyy_mm_dd_hh()
+    DateTimeColumn(['2020-12-31T23:00:00', '2020-02-29T10:00:00'])
+    >>> column.diff_yyyy_mm_dd_hh('2021-01-01T00:59:59')
+    array('q', [1, 7358])
+    >>> column.diff_yyyy_mm(DateTimeColumn(['2021-01-31T23:59:58', '2020-03-29T10:20:30']))
+    array('q', [0, 1])
+    >>> column.diff_yyyy_mm(DateTimeColumn(['2021-01-31T23:59:58']))
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not diff columns of 2 and 1 dates
+    >>> column.hour()
+    array('i', [23, 10])
+    >>> DateTimeColumn(['2020-01-01T10:00:00Z'])
+    Traceback (most recent call last):
+        ...
+    ValueError: Columns only hold naive dates down to the second, got '2020-01-01T10:00:00Z'
+    """
+    __slots__ = ()
+
+    _typecode = "q"
+    _per_day = 86400
+    _default_pattern = "%Y-%m-%dT%H:%M:%S"
+
+    def move_yyyy_mm_dd_hh(self, by: int) -> "DateTimeColumn":
+        return self._shift(by * 3600, "%Y-%m-%dT%H")
+
+    def move_yyyy_mm_dd_hh_mm(self, by: int) -> "DateTimeColumn":
+        return self._shift(by * 60, "%Y-%m-%dT%H:%M")
+
+    def move_yyyy_mm_dd_hh_mm_ss(self, by: int) -> "DateTimeColumn":
+        return self._shift(by, "%Y-%m-%dT%H:%M:%S")
+
+    def diff_yyyy_mm_dd_hh(self, other: Any) -> array:
+        return self._diff_seconds(other, "%Y-%m-%dT%H", 3600)
+
+    def diff_yyyy_mm_dd_hh_mm(self, other: Any) -> array:
+        return self._diff_seconds(other, "%Y-%m-%dT%H:%M", 60)
+
+    def diff_yyyy_mm_dd_hh_mm_ss(self, other: Any) -> array:
+        return self._diff_seconds(other, "%Y-%m-%dT%H:%M:%S", 1)
+
+    def start_of_yyyy_mm_dd_hh(self) -> "DateTimeColumn":
+        return self._boundary("%Y-%m-%dT%H", ceiling=False)
+
+    def start_of_yyyy_mm_dd_hh_mm(self) -> "DateTimeColumn":
+        return self._boundary("%Y-%m-%dT%H:%M", ceiling=False)
+
+    def hour(self) -> array:
+        self._check("%Y-%m-%dT%H")
+        return array("i", (value % 86400 // 3600 for value in self._values))
+
+    def _shift(self, seconds: int, at_least: str) -> "DateTimeColumn":
+        self._check(at_least)
+        pattern = "datetime" if self.pattern == "date" else self.pattern
+        return DateTimeColumn.from_epoch(self._add(seconds), pattern)
+
+    def _to_integer(self, value: Union[str, datetime.date]) -> Tuple[int, str]:
+        date, pattern = _parse(value, at_least="%Y")
+        return (_to_epoch_seconds(date, value), pattern)
+
+
+def _to_epoch_seconds(date: datetime.datetime, value: Any) -> int:
+    if date.tzinfo is not None or date.microsecond:
+        raise ValueError("Columns only hold naive dates down to the second, got %r" % (value,))
+    return _epoch_seconds(date)
+
+
+_LENGTHS_BY_PATTERN = {pattern: length for length, pattern in _PATTERNS_BY_LENGTH.items()}
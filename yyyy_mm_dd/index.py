@@ -0,0 +1,237 @@
+"""
+A sorted index of dates for range queries and bucketing in O(log n), instead of
+scanning a list comparing each date.
+
+`DateIndex` keeps the values sorted along with their microseconds since 1970-01-01 in an
+`array('q')`, and answers every query with a binary search on it. Values with a UTC
+offset are indexed by their UTC time, and must all have the same offset, so they are
+bucketed on their own local year, month or day, the same way start_of and end_of do.
+"""
+import bisect
+import datetime
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from yyyy_mm_dd import (
+    _EPOCH_ORDINAL as _EPOCH, _TWO_DIGITS, _days_in_month, _epoch_seconds, _format_yyyy_mm_dd, _from_ordinal, _naive_utc,
+    _ordinal, _parse,
+)
+
+
+class DateIndex:
+    """
+    Sorted index of dates or datetimes, in any of the formats the library accepts
+
+    >>> index = DateIndex(['2020-05-14', '2020-01-31', '2020-05-01', '2021-02-28'])
+    >>> index.between('2020-05', '2020-06')
+    ['2020-05-01', '2020-05-14']
+    >>> index.floor('2020-05-13'), index.ceil('2020-05-15'), index.ceil('2022')
+    ('2020-05-01', '2021-02-28', None)
+    >>> index.same_yyyy_mm('2020-05-31T23:59:59')
+    ['2020-05-01', '2020-05-14']
+    >>> index.group_by_yyyy()
+    {'2020': ['2020-01-31', '2020-05-01', '2020-05-14'], '2021': ['2021-02-28']}
+    """
+    __slots__ = ("_keys", "_values", "_aware", "_offset")
+
+    def __init__(self, values: Iterable[Union[str, datetime.date]] = ()) -> None:
+        pairs = []  # type: List[Tuple[int, Union[str, datetime.date]]]
+        # None until the first value, then whether the values have an offset, and which one
+        self._aware = None  # type: Optional[bool]
+        self._offset = 0
+        for value in values:
+            key, offset = _instant(value)
+            if self._aware is None:
+                self._aware, self._offset = offset is not None, offset or 0
+            elif (offset is not None) != self._aware:
+                raise ValueError(_MIXED)
+            elif offset is not None and offset != self._offset:
+                raise ValueError("Could not index dates with different UTC offsets, got %r" % (value,))
+            pairs.append((key, value))
+        pairs.sort(key=lambda pair: pair[0])
+        self._keys = array("q", (key for key, _ in pairs))
+        self._values = [value for _, value in pairs]
+
+    @property
+    def keys(self) -> array:
+        """
+        The sorted microseconds since 1970-01-01 of the values, in UTC for values with an offset
+        """
+        return self._keys
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[Union[str, datetime.date]]:
+        return iter(self._values)
+
+    def __getitem__(self, index: int) -> Union[str, datetime.date]:
+        return self._values[index]
+
+    def __repr__(self) -> str:
+        return "DateIndex(%r)" % (self._values,)
+
+    def between(self, start: Union[str, datetime.date], end: Union[str, datetime.date]) -> List[Union[str, datetime.date]]:
+        """
+        Values from start up to, but not including, end, the same way the range functions do
+
+        >>> DateIndex(['2020-05-14T10:00', '2020-05-14T11:00']).between('2020-05-14T10', '2020-05-14T11')
+        ['2020-05-14T10:00']
+        """
+        low = bisect.bisect_left(self._keys, self._key(start))
+        high = bisect.bisect_left(self._keys, self._key(end))
+        return self._values[low:high]
+
+    def floor(self, yyyy_mm_dd: Union[str, datetime.date]) -> Optional[Union[str, datetime.date]]:
+        """
+        The latest value at or before the given date, None when there is none
+        """
+        position = bisect.bisect_right(self._keys, self._key(yyyy_mm_dd))
+        return self._values[position - 1] if position > 0 else None
+
+    def ceil(self, yyyy_mm_dd: Union[str, datetime.date]) -> Optional[Union[str, datetime.date]]:
+        """
+        The earliest value at or after the given date, None when there is none
+        """
+        position = bisect.bisect_left(self._keys, self._key(yyyy_mm_dd))
+        return self._values[position] if position < len(self._values) else None
+
+    def same_yyyy(self, yyyy_mm_dd: Union[str, datetime.date]) -> List[Union[str, datetime.date]]:
+        """
+        Values on the same year of the given date, from its start_of_yyyy to its end_of_yyyy
+        """
+        return self._slice(*self._query_bucket(yyyy_mm_dd, "%Y"))
+
+    def same_yyyy_mm(self, yyyy_mm_dd: Union[str, datetime.date]) -> List[Union[str, datetime.date]]:
+        """
+        Values on the same month of the given date, from its start_of_yyyy_mm to its end_of_yyyy_mm
+        """
+        return self._slice(*self._query_bucket(yyyy_mm_dd, "%Y-%m"))
+
+    def same_yyyy_mm_dd(self, yyyy_mm_dd: Union[str, datetime.date]) -> List[Union[str, datetime.date]]:
+        """
+        Values on the same day of the given date, from its start_of_yyyy_mm_dd to its end_of_yyyy_mm_dd
+
+        >>> DateIndex(['2020-05-14T00:00:00', '2020-05-14T23:59:59', '2020-05-15T00:00:00']).same_yyyy_mm_dd('2020-05-14')
+        ['2020-05-14T00:00:00', '2020-05-14T23:59:59']
+        >>> DateIndex(['2020-05-14T22:30-03:00', '2020-05-15T01:00-03:00']).same_yyyy_mm_dd('2020-05-14T23:00-03:00')
+        ['2020-05-14T22:30-03:00']
+        """
+        return self._slice(*self._query_bucket(yyyy_mm_dd, "%Y-%m-%d"))
+
+    def group_by_yyyy(self) -> Dict[str, List[Union[str, datetime.date]]]:
+        """
+        Values grouped by year, in order, keyed by yyyy
+        """
+        return self._group_by("%Y")
+
+    def group_by_yyyy_mm(self) -> Dict[str, List[Union[str, datetime.date]]]:
+        """
+        Values grouped by month, in order, keyed by yyyy_mm
+
+        >>> DateIndex(['2020-05-14', '2020-01-31', '2020-05-01']).group_by_yyyy_mm()
+        {'2020-01': ['2020-01-31'], '2020-05': ['2020-05-01', '2020-05-14']}
+        """
+        return self._group_by("%Y-%m")
+
+    def group_by_yyyy_mm_dd(self) -> Dict[str, List[Union[str, datetime.date]]]:
+        """
+        Values grouped by day, in order, keyed by yyyy_mm_dd, on the local day of values with an offset
+
+        >>> DateIndex(['2020-05-14T22:30-03:00', '2020-05-15T01:00-03:00']).group_by_yyyy_mm_dd()
+        {'2020-05-14': ['2020-05-14T22:30-03:00'], '2020-05-15': ['2020-05-15T01:00-03:00']}
+        >>> DateIndex(['2020-05-14T22:30-03:00', '2020-05-15T01:00Z'])
+        Traceback (most recent call last):
+            ...
+        ValueError: Could not index dates with different UTC offsets, got '2020-05-15T01:00Z'
+        """
+        return self._group_by("%Y-%m-%d")
+
+    def _key(self, value: Union[str, datetime.date]) -> int:
+        return self._query(value)[0]
+
+    def _query(self, value: Union[str, datetime.date]) -> Tuple[int, int]:
+        """
+        Key of a value to look up and its offset in microseconds, which only has to agree
+        with the values on having one or not, an empty index takes anything
+        """
+        key, offset = _instant(value)
+        if self._aware is not None and (offset is not None) != self._aware:
+            raise ValueError(_MIXED)
+        return (key, offset or 0)
+
+    def _query_bucket(self, value: Union[str, datetime.date], unit: str) -> Tuple[int, int]:
+        key, offset = self._query(value)
+        start, end = _bucket(key + offset, unit)
+        return (start - offset, end - offset)
+
+    def _slice(self, start: int, end: int) -> List[Union[str, datetime.date]]:
+        return self._values[bisect.bisect_left(self._keys, start):bisect.bisect_left(self._keys, end)]
+
+    def _group_by(self, unit: str) -> Dict[str, List[Union[str, datetime.date]]]:
+        """
+        Jumps from bucket to bucket with a binary search, so it takes O(log n) per bucket
+        instead of going through every value
+        """
+        groups = {}  # type: Dict[str, List[Union[str, datetime.date]]]
+        position = 0
+        while position < len(self._keys):
+            start, end = _bucket(self._keys[position] + self._offset, unit)
+            following = bisect.bisect_left(self._keys, end - self._offset, position)
+            groups[_label(start, unit)] = self._values[position:following]
+            position = following
+        return groups
+
+
+_MIXED = "Could not compare dates with and without UTC offset, you should provide both with offset or a tz"
+
+_DAY = 86400 * 1000000
+
+
+def _instant(value: Union[str, datetime.date]) -> Tuple[int, Optional[int]]:
+    """
+    Microseconds since 1970-01-01 of a value, in UTC when it has an offset, and the
+    offset in microseconds, None when it has none
+
+    >>> _instant('2020-05-14T10:20:30-03:00')
+    (1589462430000000, -10800000000)
+    >>> _instant(datetime.datetime(2020, 5, 14, 10, 20, 30, 500000))
+    (1589451630500000, None)
+    """
+    date, _ = _parse(value, at_least="%Y")
+    offset = date.utcoffset()
+    if offset is not None:
+        date = _naive_utc(date)
+    key = _epoch_seconds(date) * 1000000 + date.microsecond
+    return (key, None if offset is None else offset // datetime.timedelta(microseconds=1))
+
+
+def _bucket(key: int, unit: str) -> Tuple[int, int]:
+    """
+    Microseconds of the start_of the unit the key falls on, and of the start of the next one,
+    which is right after its end_of
+
+    >>> _bucket(1589451630000000, '%Y-%m')
+    (1588291200000000, 1590969600000000)
+    """
+    days = key // _DAY
+    year, month, day = _from_ordinal(days + _EPOCH)
+    if unit == "%Y":
+        start = _ordinal(year, 1, 1)
+        end = _ordinal(year, 12, 31) + 1
+    elif unit == "%Y-%m":
+        start = _ordinal(year, month, 1)
+        end = start + _days_in_month(year, month)
+    else:
+        start = days + _EPOCH
+        end = start + 1
+    return ((start - _EPOCH) * _DAY, (end - _EPOCH) * _DAY)
+
+
+def _label(start: int, unit: str) -> str:
+    year, month, day = _from_ordinal(start // _DAY + _EPOCH)
+    if unit == "%Y":
+        return str(year)
+    if unit == "%Y-%m":
+        return str(year) + "-" + _TWO_DIGITS[month]
+    return _format_yyyy_mm_dd(year, month, day)
@@ -0,0 +1,179 @@
+"""
+Opt-in counters and timings to find out which functions are hot and where the time goes,
+on `_parse`, `_split_canonical`, `_strftime` and `_add_months`, while it is enabled.
+Canonical strings are mostly split by `_split_canonical` without ever reaching `_parse`,
+those are counted as "native" inputs, with the pattern of their length:
+
+>>> from yyyy_mm_dd import instrumentation
+>>> instrumentation.enable()
+>>> yyyy_mm_dd.move_yyyy_mm(datetime.date(2020, 1, 31), 1)
+datetime.date(2020, 2, 29)
+>>> yyyy_mm_dd.diff_yyyy_mm_dd_hh(datetime.date(2020, 1, 1), '2020-01-02T00')
+24
+>>> yyyy_mm_dd.move_yyyy_mm_dd('2020-01-31', 1), yyyy_mm_dd.yyyy_mm('2020-01-31T10:20:30')
+('2020-02-01', '2020-01')
+>>> snapshot = instrumentation.stats()
+>>> snapshot['calls']['move_yyyy_mm'], snapshot['calls']['_add_months']
+(1, 1)
+>>> snapshot['parse_inputs']
+{'date': 2, 'native': 2, 'str': 1}
+>>> snapshot['parse_patterns']
+{'%Y-%m-%d': 1, '%Y-%m-%dT%H': 1, '%Y-%m-%dT%H:%M:%S': 1, 'date': 1, 'datetime': 1}
+>>> instrumentation.disable()
+
+Enabling swaps the functions on the `yyyy_mm_dd` modules for wrappers, and disabling puts
+the originals back, so while disabled there is no cost at all. The flip side is that a
+function imported with `from yyyy_mm_dd import move_yyyy` before `enable()` is not counted,
+use `import yyyy_mm_dd` and call it as `yyyy_mm_dd.move_yyyy` on the code you want to watch.
+The internal functions are always counted, as the library looks them up on the module.
+"""
+import datetime
+import inspect
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import yyyy_mm_dd
+from yyyy_mm_dd import _PATTERNS_BY_LENGTH
+
+INTERNALS = ("_parse", "_split_canonical", "_strftime", "_add_months")
+
+_MANAGEMENT = {
+    "set_clock", "enable_cache", "disable_cache", "cache_info", "cache_clear",
+}
+
+_originals = {}  # type: Dict[str, Callable]
+_calls = {}  # type: Dict[str, int]
+_seconds = {}  # type: Dict[str, float]
+_histograms = {}  # type: Dict[str, List[int]]
+_parse_inputs = {}  # type: Dict[str, int]
+_parse_patterns = {}  # type: Dict[str, int]
+
+
+def enable() -> None:
+    """
+    Starts counting calls and timing every public function, plus the internals
+    `_parse`, `_split_canonical`, `_strftime` and `_add_months`. Enabling twice does nothing
+    """
+    if _originals:
+        return
+    names = [name for name, value in vars(yyyy_mm_dd).items()
+             if not name.startswith("_") and name not in _MANAGEMENT
+             and inspect.isfunction(value) and value.__module__.startswith("yyyy_mm_dd")]
+    for name in names + list(INTERNALS):
+        _originals[name] = getattr(yyyy_mm_dd, name)
+    _swap({id(original): _wrap(name, original) for name, original in _originals.items()})
+
+
+def disable() -> None:
+    """
+    Puts the original functions back, the stats collected so far are kept until `reset()`
+    """
+    wrapped = {id(getattr(yyyy_mm_dd, name)): original for name, original in _originals.items()}
+    _swap(wrapped)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    """
+    >>> is_enabled()
+    False
+    """
+    return bool(_originals)
+
+
+def stats() -> Dict[str, Any]:
+    """
+    Returns a snapshot of what was collected since the last `reset()`:
+
+    - calls: number of calls by function name
+    - seconds: cumulative wall time by function name, including the functions it calls
+    - histograms: for each function, how many calls took up to each number of
+      nanoseconds, in powers of two
+    - parse_inputs: how many times `_parse` got a str, a date or a datetime, and how
+      many strings were split on the native path, by `_split_canonical`, as "native"
+    - parse_patterns: how many times each format was detected, on both paths
+
+    >>> reset()
+    >>> stats()
+    {'calls': {}, 'seconds': {}, 'histograms': {}, 'parse_inputs': {}, 'parse_patterns': {}}
+    """
+    return {
+        "calls": dict(sorted(_calls.items())),
+        "seconds": dict(sorted(_seconds.items())),
+        "histograms": {
+            name: {2 ** bucket: count for bucket, count in enumerate(buckets) if count}
+            for name, buckets in sorted(_histograms.items())
+        },
+        "parse_inputs": dict(sorted(_parse_inputs.items())),
+        "parse_patterns": dict(sorted(_parse_patterns.items())),
+    }
+
+
+def reset() -> None:
+    """
+    Clears everything collected so far, without changing whether it is enabled
+    """
+    for collected in (_calls, _seconds, _histograms, _parse_inputs, _parse_patterns):
+        collected.clear()
+
+
+def _wrap(name: str, function: Callable) -> Callable:
+    perf_counter = time.perf_counter
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            _record(name, perf_counter() - start)
+        if name == "_parse":
+            _count_parse(args[0], result[1])
+        elif name == "_split_canonical" and result is not None:
+            _count_parse(None, _PATTERNS_BY_LENGTH[len(args[0])])
+        return result
+
+    wrapper.__name__ = function.__name__
+    wrapper.__qualname__ = function.__qualname__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__module__ = function.__module__
+    wrapper.__wrapped__ = function  # type: ignore
+    return wrapper
+
+
+def _record(name: str, seconds: float) -> None:
+    _calls[name] = _calls.get(name, 0) + 1
+    _seconds[name] = _seconds.get(name, 0.0) + seconds
+    buckets = _histograms.get(name)
+    if buckets is None:
+        buckets = _histograms[name] = [0] * 64
+    buckets[min(int(seconds * 1e9).bit_length(), 63)] += 1
+
+
+def _count_parse(value: Any, pattern: str) -> None:
+    # None stands for a string split on the native path
+    if value is None:
+        kind = "native"
+    elif isinstance(value, datetime.datetime):
+        kind = "datetime"
+    elif isinstance(value, datetime.date):
+        kind = "date"
+    else:
+        kind = type(value).__name__
+    _parse_inputs[kind] = _parse_inputs.get(kind, 0) + 1
+    _parse_patterns[pattern] = _parse_patterns.get(pattern, 0) + 1
+
+
+def _swap(replacements: Dict[int, Callable]) -> None:
+    """
+    Replaces the functions by identity on the yyyy_mm_dd modules, so the names bound by
+    the submodules on their own imports are replaced too
+    """
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == "yyyy_mm_dd" or module_name.startswith("yyyy_mm_dd.")):
+            continue
+        namespace = vars(module)
+        for name, value in list(namespace.items()):
+            replacement = replacements.get(id(value))
+            if replacement is not None:
+                namespace[name] = replacement
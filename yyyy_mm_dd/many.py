@@ -0,0 +1,960 @@
+"""
+Batch versions of the move_*, diff_*, start_of_* and end_of_* functions, and of the yyyy, yyyy_mm, yyyy_mm_dd,
+yyyy_ww, yyyy_qq, year, month, day, hour, weekday and to_yyyymmdd extractors, they take a list or a NumPy array of dates and do the work with array arithmetic instead of one Python call per element.
+Requires numpy, which is only imported when one of these functions is called.
+
+Strings in the same canonical format, `datetime64` arrays and lists of `date` or `datetime`
+are computed in bulk, anything else goes through the scalar function for each element,
+so the results and errors are always the same as the scalar functions.
+
+With a `tz`, strings in the same canonical format, all without offset, all with Z or all
+with +HH:MM, are computed in bulk too, looking up the offsets on the transitions table of
+the zone with a binary search for the whole array.
+
+With `workers`, the arrays are split in one slice per worker, computed on a pool of
+processes, or of threads on free-threaded Python, see `yyyy_mm_dd.parallel`.
+"""
+import datetime
+import functools
+from typing import Any, Callable, Optional, Tuple
+
+from yyyy_mm_dd import (
+    _format_offset,
+    _parse,
+    _split_offset,
+    _zone_table,
+    diff_yyyy,
+    diff_yyyy_mm,
+    diff_yyyy_mm_dd,
+    diff_yyyy_mm_dd_hh,
+    diff_yyyy_mm_dd_hh_mm,
+    diff_yyyy_mm_dd_hh_mm_ss,
+    diff_yyyy_qq,
+    diff_yyyy_ww,
+    day,
+    end_of_yyyy,
+    end_of_yyyy_mm,
+    end_of_yyyy_mm_dd,
+    end_of_yyyy_qq,
+    end_of_yyyy_ww,
+    hour,
+    month,
+    move_yyyy,
+    move_yyyy_mm,
+    move_yyyy_mm_dd,
+    move_yyyy_mm_dd_hh,
+    move_yyyy_mm_dd_hh_mm,
+    move_yyyy_mm_dd_hh_mm_ss,
+    move_yyyy_qq,
+    move_yyyy_ww,
+    start_of_yyyy,
+    start_of_yyyy_mm,
+    start_of_yyyy_mm_dd,
+    start_of_yyyy_mm_dd_hh,
+    start_of_yyyy_mm_dd_hh_mm,
+    start_of_yyyy_qq,
+    start_of_yyyy_ww,
+    to_timezone,
+    to_yyyymmdd,
+    weekday,
+    year,
+    yyyy,
+    yyyy_mm,
+    yyyy_mm_dd,
+    yyyy_qq,
+    yyyy_ww,
+)
+
+
+def move_yyyy_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each date by a certain number of years, see `move_yyyy`
+
+    >>> move_yyyy_many(['2020', '2021'], 1)
+    array(['2021', '2022'], dtype='<U4')
+    >>> move_yyyy_many(['2020-02-29', '2020-03-01'], [1, -1])
+    array(['2021-02-28', '2019-03-01'], dtype='<U10')
+    """
+    return _move(dates, by, "%Y", move_yyyy, "Y", tz, workers)
+
+
+def move_yyyy_mm_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each date by a certain number of months, see `move_yyyy_mm`
+
+    >>> move_yyyy_mm_many(['2020-01-31', '2020-01-31T10:20:30'], [1, 25])
+    array(['2020-02-29', '2022-02-28T10:20:30'], dtype='<U19')
+    >>> move_yyyy_mm_many(['2020-01-31', '2020-03-31'], 1)
+    array(['2020-02-29', '2020-04-30'], dtype='<U10')
+    >>> move_yyyy_mm_many([datetime.date(2020, 1, 31)], 1)
+    array([datetime.date(2020, 2, 29)], dtype=object)
+    >>> move_yyyy_mm_many(['2020'], 1)
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not parse date for operation, you should provide at least %Y-%m
+    """
+    return _move(dates, by, "%Y-%m", move_yyyy_mm, "M", tz, workers)
+
+
+def move_yyyy_qq_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each date by a certain number of quarters, see `move_yyyy_qq`
+
+    >>> move_yyyy_qq_many(['2020-11-30', '2020-05-14'], [1, -2])
+    array(['2021-02-28', '2019-11-14'], dtype='<U10')
+    >>> move_yyyy_qq_many(['2020-Q4', '2021-Q1'], 1)
+    array(['2021-Q1', '2021-Q2'], dtype='<U7')
+    """
+    return _move(dates, by, "%Y-%m", move_yyyy_qq, "Q", tz, workers)
+
+
+def move_yyyy_ww_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each date by a certain number of weeks, see `move_yyyy_ww`
+
+    >>> move_yyyy_ww_many(['2020-12-31', '2020-12-31T10:20:30'], [1, -1])
+    array(['2021-01-07', '2020-12-24T10:20:30'], dtype='<U19')
+    >>> move_yyyy_ww_many(['2021-03-21T12:00'], 1, tz='Europe/Berlin')
+    array(['2021-03-28T12:00+02:00'], dtype='<U22')
+    """
+    return _move(dates, by, "%Y-%m-%d", move_yyyy_ww, "W", tz, workers)
+
+
+def move_yyyy_mm_dd_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each date by a certain number of days, see `move_yyyy_mm_dd`
+
+    >>> move_yyyy_mm_dd_many(['2020-12-31', '2020-02-28'], 1)
+    array(['2021-01-01', '2020-02-29'], dtype='<U10')
+    >>> import numpy
+    >>> move_yyyy_mm_dd_many(numpy.array(['2020-02-29T10:20:30'], dtype='datetime64[s]'), 2)
+    array(['2020-03-02T10:20:30'], dtype='datetime64[s]')
+    >>> move_yyyy_mm_dd_many(['9999-12-31'], 1)
+    Traceback (most recent call last):
+        ...
+    OverflowError: date value out of range
+    >>> move_yyyy_mm_dd_many(['2021-03-27T12:00', '2021-03-27T12:00Z'], 1, tz='Europe/Berlin')
+    array(['2021-03-28T12:00+02:00', '2021-03-28T13:00+02:00'], dtype='<U22')
+    >>> move_yyyy_mm_dd_many(['9999-06-01T10:00'], -1, tz='Europe/Berlin')
+    array(['9999-05-31T10:00+02:00'], dtype='<U22')
+    """
+    return _move(dates, by, "%Y-%m-%d", move_yyyy_mm_dd, "D", tz, workers)
+
+
+def move_yyyy_mm_dd_hh_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each datetime by a certain number of hours, see `move_yyyy_mm_dd_hh`
+
+    >>> move_yyyy_mm_dd_hh_many(['2020-12-31T23', '2020-12-31T22'], [1, -1])
+    array(['2021-01-01T00', '2020-12-31T21'], dtype='<U13')
+    >>> move_yyyy_mm_dd_hh_many([datetime.date(2020, 2, 29)], 1)
+    array([datetime.datetime(2020, 2, 29, 1, 0)], dtype=object)
+    >>> move_yyyy_mm_dd_hh_many(['2021-03-28T01:30', '2021-03-28T03:30'], [1, -1], tz='Europe/Berlin')
+    array(['2021-03-28T03:30+02:00', '2021-03-28T01:30+01:00'], dtype='<U22')
+    """
+    return _move(dates, by, "%Y-%m-%dT%H", move_yyyy_mm_dd_hh, "h", tz, workers)
+
+
+def move_yyyy_mm_dd_hh_mm_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each datetime by a certain number of minutes, see `move_yyyy_mm_dd_hh_mm`
+
+    >>> move_yyyy_mm_dd_hh_mm_many(['2020-12-31T23:59'], 1)
+    array(['2021-01-01T00:00'], dtype='<U16')
+    """
+    return _move(dates, by, "%Y-%m-%dT%H:%M", move_yyyy_mm_dd_hh_mm, "m", tz, workers)
+
+
+def move_yyyy_mm_dd_hh_mm_ss_many(dates: Any, by: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Increases or decreases each datetime by a certain number of seconds, see `move_yyyy_mm_dd_hh_mm_ss`
+
+    >>> move_yyyy_mm_dd_hh_mm_ss_many([datetime.datetime(2020, 12, 31, 23, 59, 59)], 1)
+    array([datetime.datetime(2021, 1, 1, 0, 0)], dtype=object)
+    """
+    return _move(dates, by, "%Y-%m-%dT%H:%M:%S", move_yyyy_mm_dd_hh_mm_ss, "s", tz, workers)
+
+
+def diff_yyyy_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of years between each date of A and B, see `diff_yyyy`
+
+    >>> diff_yyyy_many(['2020-02-14T10:20:30', '2021-02-14'], ['2021-02-14T10:20:29', '2020-02-14'])
+    array([ 0, -1])
+    """
+    return _diff(a, b, "%Y", diff_yyyy, "Y", tz, workers)
+
+
+def diff_yyyy_mm_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of months between each date of A and B, see `diff_yyyy_mm`
+
+    >>> diff_yyyy_mm_many(['2020-01-31', '2020-03-31'], ['2020-02-29', '2020-02-29'])
+    array([ 1, -1])
+    >>> diff_yyyy_mm_many('2020-02', ['2021-02', '2020-03-01'])
+    array([12,  1])
+    """
+    return _diff(a, b, "%Y-%m", diff_yyyy_mm, "M", tz, workers)
+
+
+def diff_yyyy_qq_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of quarters between each date of A and B, see `diff_yyyy_qq`
+
+    >>> diff_yyyy_qq_many(['2020-01-31', '2020-01-31', '2021-02'], ['2020-04-30', '2020-04-29', '2020-05'])
+    array([ 1,  0, -3])
+    """
+    return _diff(a, b, "%Y-%m", diff_yyyy_qq, "Q", tz, workers)
+
+
+def diff_yyyy_ww_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of weeks between each date of A and B, see `diff_yyyy_ww`
+
+    >>> diff_yyyy_ww_many('2020-05-28', ['2020-06-11', '2020-05-15', '2020-05-14'])
+    array([ 2, -1, -2])
+    >>> diff_yyyy_ww_many(['2020-W53'], ['2021-W02'])
+    array([2])
+    """
+    return _diff(a, b, "%Y-%m-%d", diff_yyyy_ww, "W", tz, workers)
+
+
+def diff_yyyy_mm_dd_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of days between each date of A and B, see `diff_yyyy_mm_dd`
+
+    >>> diff_yyyy_mm_dd_many(['2020-02-01', '2020-02-14T10'], ['2020-03-01', '2020-02-15T09'])
+    array([29,  0])
+    """
+    return _diff(a, b, "%Y-%m-%d", diff_yyyy_mm_dd, "D", tz, workers)
+
+
+def diff_yyyy_mm_dd_hh_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of hours between each datetime of A and B, see `diff_yyyy_mm_dd_hh`
+
+    >>> diff_yyyy_mm_dd_hh_many(['2020-02-14T10:30'], ['2020-02-14T09:31'])
+    array([-1])
+    >>> diff_yyyy_mm_dd_hh_many('2021-03-28T00:00', ['2021-03-29T00:00', '2021-03-29T00:00+02:00'], tz='Europe/Berlin')
+    array([23, 23])
+    """
+    return _diff(a, b, "%Y-%m-%dT%H", diff_yyyy_mm_dd_hh, "h", tz, workers)
+
+
+def diff_yyyy_mm_dd_hh_mm_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of minutes between each datetime of A and B, see `diff_yyyy_mm_dd_hh_mm`
+
+    >>> diff_yyyy_mm_dd_hh_mm_many(['2020-02-14T10:30'], ['2020-02-14T10:30:30'])
+    array([0])
+    """
+    return _diff(a, b, "%Y-%m-%dT%H:%M", diff_yyyy_mm_dd_hh_mm, "m", tz, workers)
+
+
+def diff_yyyy_mm_dd_hh_mm_ss_many(a: Any, b: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the amount of seconds between each datetime of A and B, see `diff_yyyy_mm_dd_hh_mm_ss`
+
+    >>> diff_yyyy_mm_dd_hh_mm_ss_many(['2020-02-14T10:20:30'], ['2021-02-14T10:20:30'])
+    array([31622400])
+    """
+    return _diff(a, b, "%Y-%m-%dT%H:%M:%S", diff_yyyy_mm_dd_hh_mm_ss, "s", tz, workers)
+
+
+def start_of_yyyy_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the first day of the year of each date, see `start_of_yyyy`
+
+    >>> start_of_yyyy_many(['2020-05-14', '2021-12-31'])
+    array(['2020-01-01', '2021-01-01'], dtype='<U10')
+    """
+    return _boundary(dates, "%Y", start_of_yyyy, "Y", False, tz, workers)
+
+
+def start_of_yyyy_mm_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the first day of the month of each date, see `start_of_yyyy_mm`
+
+    >>> start_of_yyyy_mm_many([datetime.date(2020, 5, 14)])
+    array([datetime.date(2020, 5, 1)], dtype=object)
+    """
+    return _boundary(dates, "%Y-%m", start_of_yyyy_mm, "M", False, tz, workers)
+
+
+def start_of_yyyy_qq_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the first day of the quarter of each date, see `start_of_yyyy_qq`
+
+    >>> start_of_yyyy_qq_many(['2020-05-14', '2020-12-31T10:20:30'])
+    array(['2020-04-01', '2020-10-01'], dtype='<U10')
+    """
+    return _boundary(dates, "%Y-%m", start_of_yyyy_qq, "Q", False, tz, workers)
+
+
+def start_of_yyyy_ww_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the Monday of the ISO week of each date, see `start_of_yyyy_ww`
+
+    >>> start_of_yyyy_ww_many(['2020-05-14', '2021-01-03T10:20:30'])
+    array(['2020-05-11', '2020-12-28'], dtype='<U10')
+    >>> start_of_yyyy_ww_many([datetime.date(2020, 5, 11)])
+    array([datetime.date(2020, 5, 11)], dtype=object)
+    """
+    return _boundary(dates, "%Y-%m-%d", start_of_yyyy_ww, "W", False, tz, workers)
+
+
+def start_of_yyyy_mm_dd_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the first second of the day of each date, see `start_of_yyyy_mm_dd`
+
+    >>> start_of_yyyy_mm_dd_many(['2020-05-14T10:20:30'])
+    array(['2020-05-14T00:00:00'], dtype='<U19')
+    >>> start_of_yyyy_mm_dd_many(['2021-03-28T22:30Z'], tz='Europe/Berlin')
+    array(['2021-03-29T00:00:00+02:00'], dtype='<U25')
+    >>> start_of_yyyy_mm_dd_many(['9999-06-01T10:00'], tz='Europe/Berlin')
+    array(['9999-06-01T00:00:00+02:00'], dtype='<U25')
+    """
+    return _boundary(dates, "%Y-%m-%d", start_of_yyyy_mm_dd, "D", False, tz, workers)
+
+
+def start_of_yyyy_mm_dd_hh_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the first second of the hour of each datetime, see `start_of_yyyy_mm_dd_hh`
+
+    >>> import numpy
+    >>> start_of_yyyy_mm_dd_hh_many(numpy.array(['2020-05-14T10:20:30'], dtype='datetime64[ns]'))
+    array(['2020-05-14T10:00:00.000000000'], dtype='datetime64[ns]')
+    """
+    return _boundary(dates, "%Y-%m-%dT%H", start_of_yyyy_mm_dd_hh, "h", False, tz, workers)
+
+
+def start_of_yyyy_mm_dd_hh_mm_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the first second of the minute of each datetime, see `start_of_yyyy_mm_dd_hh_mm`
+
+    >>> start_of_yyyy_mm_dd_hh_mm_many(['2020-05-14T10:20:30'])
+    array(['2020-05-14T10:20:00'], dtype='<U19')
+    """
+    return _boundary(dates, "%Y-%m-%dT%H:%M", start_of_yyyy_mm_dd_hh_mm, "m", False, tz, workers)
+
+
+def end_of_yyyy_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the last day of the year of each date, see `end_of_yyyy`
+
+    >>> end_of_yyyy_many(['2020', '2021-05'])
+    array(['2020-12-31', '2021-12-31'], dtype='<U10')
+    """
+    return _boundary(dates, "%Y", end_of_yyyy, "Y", True, tz, workers)
+
+
+def end_of_yyyy_mm_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the last day of the month of each date, see `end_of_yyyy_mm`
+
+    >>> end_of_yyyy_mm_many(['2020-02-14', '2021-02-14'])
+    array(['2020-02-29', '2021-02-28'], dtype='<U10')
+    """
+    return _boundary(dates, "%Y-%m", end_of_yyyy_mm, "M", True, tz, workers)
+
+
+def end_of_yyyy_qq_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the last day of the quarter of each date, see `end_of_yyyy_qq`
+
+    >>> end_of_yyyy_qq_many(['2020-05', '2020-12-01'])
+    array(['2020-06-30', '2020-12-31'], dtype='<U10')
+    """
+    return _boundary(dates, "%Y-%m", end_of_yyyy_qq, "Q", True, tz, workers)
+
+
+def end_of_yyyy_ww_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the Sunday of the ISO week of each date, see `end_of_yyyy_ww`
+
+    >>> end_of_yyyy_ww_many(['2020-05-14', '2020-12-31'])
+    array(['2020-05-17', '2021-01-03'], dtype='<U10')
+    >>> end_of_yyyy_ww_many(['2021-03-28T22:30Z'], tz='Europe/Berlin')
+    array(['2021-04-04'], dtype='<U10')
+    """
+    return _boundary(dates, "%Y-%m-%d", end_of_yyyy_ww, "W", True, tz, workers)
+
+
+def end_of_yyyy_mm_dd_many(dates: Any, tz: Optional[str] = None, workers: Optional[int] = None) -> Any:
+    """
+    Returns the last second of the day of each date, see `end_of_yyyy_mm_dd`
+
+    >>> end_of_yyyy_mm_dd_many([datetime.date(2020, 2, 14)])
+    array([datetime.datetime(2020, 2, 14, 23, 59, 59)], dtype=object)
+    """
+    return _boundary(dates, "%Y-%m-%d", end_of_yyyy_mm_dd, "D", True, tz, workers)
+
+
+def yyyy_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the year of each date, see `yyyy`
+
+    >>> yyyy_many(['2020-05-14', '2021-01-03T10:20:30'])
+    array(['2020', '2021'], dtype='<U4')
+    """
+    return _extract(dates, "%Y", yyyy, functools.partial(_labels, fields=1, separator=""), True, workers)
+
+
+def yyyy_mm_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the year and month of each date, see `yyyy_mm`
+
+    >>> yyyy_mm_many([datetime.date(2020, 5, 14), datetime.date(999, 1, 2)])
+    array(['2020-05', '999-01'], dtype='<U7')
+    """
+    return _extract(dates, "%Y-%m", yyyy_mm, functools.partial(_labels, fields=2, separator="-"), True, workers)
+
+
+def yyyy_mm_dd_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the date of each datetime, see `yyyy_mm_dd`
+
+    >>> import numpy
+    >>> yyyy_mm_dd_many(numpy.array(['2020-05-14T10:20:30'], dtype='datetime64[s]'))
+    array(['2020-05-14'], dtype='<U10')
+    """
+    return _extract(dates, "%Y-%m-%d", yyyy_mm_dd, functools.partial(_labels, fields=3, separator="-"), True,
+                    workers)
+
+
+def to_yyyymmdd_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Converts each date to the yyyymmdd format, see `to_yyyymmdd`
+
+    >>> to_yyyymmdd_many(['2020-05-14', '2020-12-31'])
+    array(['20200514', '20201231'], dtype='<U8')
+    """
+    return _extract(dates, "%Y", to_yyyymmdd, functools.partial(_labels, fields=3, separator=""), True, workers)
+
+
+def year_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the year of each date as an int, see `year`
+
+    >>> year_many(['2020-05-14', '2021-01-03'])
+    array([2020, 2021])
+    """
+    return _extract(dates, "%Y", year, _years, False, workers)
+
+
+def month_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the month of each date, see `month`
+
+    >>> month_many(['2020-05-14', '2020-12'])
+    array([ 5, 12])
+    """
+    return _extract(dates, "%Y-%m", month, _months, False, workers)
+
+
+def day_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the day of each date, see `day`
+
+    >>> day_many(['2020-05-14', '2020-02-29'])
+    array([14, 29])
+    """
+    return _extract(dates, "%Y-%m-%d", day, _days, False, workers)
+
+
+def hour_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the hour of each datetime, see `hour`
+
+    >>> hour_many(['2020-05-14T05:10:58', '2020-05-14T23:00:00'])
+    array([ 5, 23])
+    """
+    return _extract(dates, "%Y-%m-%dT%H", hour, _hours, False, workers)
+
+
+def yyyy_qq_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the year and quarter of each date, see `yyyy_qq`
+
+    >>> yyyy_qq_many(['2020-05-14', '2020-12-31'])
+    array(['2020-Q2', '2020-Q4'], dtype='<U7')
+    """
+    return _extract(dates, "%Y-%m", yyyy_qq, _quarters, True, workers)
+
+
+def yyyy_ww_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the ISO year and week of each date, see `yyyy_ww`
+
+    >>> yyyy_ww_many(['2020-05-14', '2021-01-03', '2024-12-30'])
+    array(['2020-W20', '2020-W53', '2025-W01'], dtype='<U8')
+    """
+    return _extract(dates, "%Y-%m-%d", yyyy_ww, _iso_weeks, True, workers)
+
+
+def weekday_many(dates: Any, workers: Optional[int] = None) -> Any:
+    """
+    Extracts the day of the week of each date, from 0 on Monday to 6 on Sunday, see `weekday`
+
+    >>> weekday_many(['2020-05-14', '2020-05-17T10:20:30'])
+    array([3, 6])
+    """
+    return _extract(dates, "%Y-%m-%d", weekday, _weekdays, False, workers)
+
+
+def to_timezone_many(dates: Any, tz: str, workers: Optional[int] = None) -> Any:
+    """
+    Converts each datetime to the local time of a time zone, see `to_timezone`
+
+    >>> to_timezone_many(['2021-10-31T00:30Z', '2021-10-31T01:30Z'], 'Europe/Berlin')
+    array(['2021-10-31T02:30+02:00', '2021-10-31T02:30+01:00'], dtype='<U22')
+    """
+    if workers is not None:
+        return _parallel("to_timezone_many", (dates,), tz, workers)
+    np = _numpy()
+    array = np.asarray(dates)
+    zoned = _to_zoned(np, array, "%Y-%m-%dT%H")
+    if zoned is None:
+        return _fallback(np, functools.partial(to_timezone, tz=tz), (_as_objects(np, array),),
+                         array.dtype.kind == "U")
+    local, offsets, string_unit = zoned
+    utc = local - offsets if offsets is not None else local
+    if not _zoned_range(np, utc):
+        return _fallback(np, functools.partial(to_timezone, tz=tz), (array,), True)
+    offsets = _zone_table(tz).utcoffset_many(np, utc)
+    return _format_zoned(np, utc + offsets, offsets, string_unit)
+
+
+_UNITS_BY_LENGTH = {4: "Y", 7: "M", 10: "D", 13: "h", 16: "m", 19: "s"}
+
+_SECONDS = {"W": 604800, "D": 86400, "h": 3600, "m": 60, "s": 1}
+
+_MONTHS = {"Y": 12, "Q": 3, "M": 1}
+
+# moved and compared on the local time of a tz, the others on UTC
+_CALENDAR_UNITS = ("Y", "Q", "M", "W", "D")
+
+_ZONED_FIRST = (datetime.date(1000, 1, 2) - datetime.date(1970, 1, 1)).days * 86400
+
+_ZONED_LAST = (datetime.date(9997, 12, 31) - datetime.date(1970, 1, 1)).days * 86400
+
+
+def _numpy() -> Any:
+    import numpy
+    return numpy
+
+
+def _move(dates: Any, by: Any, at_least: str, scalar: Callable, unit: str, tz: Optional[str],
+          workers: Optional[int]) -> Any:
+    if workers is not None:
+        return _parallel(scalar.__name__ + "_many", (dates, by), tz, workers)
+    np = _numpy()
+    array = np.asarray(dates)
+    by = np.asarray(by, dtype=np.int64)
+    if tz is not None:
+        return _move_zoned(np, array, by, at_least, functools.partial(scalar, tz=tz), unit, tz)
+    values, kind, string_unit = _to_datetime64(np, array, at_least)
+    if values is None:
+        return _fallback(np, scalar, (array, by), array.dtype.kind == "U")
+
+    if unit in _MONTHS:
+        result = _add_months(np, values, by * _MONTHS[unit])
+    else:
+        result = values + by.astype("timedelta64[%s]" % unit)
+
+    if kind != "datetime64" and not _in_range(np, result, kind):
+        return _fallback(np, scalar, (array, by), kind == "str")
+    return _from_datetime64(np, result, kind, string_unit)
+
+
+def _move_zoned(np: Any, array: Any, by: Any, at_least: str, scalar: Callable, unit: str, tz: str) -> Any:
+    """
+    Moves calendar units on the local time of tz and hours, minutes and seconds on UTC,
+    the same way the scalar functions do with a tz
+    """
+    zoned = _to_zoned(np, array, at_least)
+    if zoned is None:
+        return _fallback(np, scalar, (_as_objects(np, array), by), array.dtype.kind == "U")
+    local, offsets, string_unit = zoned
+    if not _zoned_range(np, local):
+        return _fallback(np, scalar, (array, by), True)
+    table = _zone_table(tz)
+    utc, wall = _utc_and_wall(np, table, local, offsets)
+    if unit in _MONTHS:
+        moved = _add_months(np, wall.astype("datetime64[s]"), by * _MONTHS[unit]).astype(np.int64)
+    elif unit in _CALENDAR_UNITS:
+        moved = wall + by * _SECONDS[unit]
+    else:
+        moved = utc + by * _SECONDS[unit]
+    if not _zoned_range(np, moved):
+        return _fallback(np, scalar, (array, by), True)
+
+    if unit in _CALENDAR_UNITS:
+        moved_offsets = table.wall_offset_many(np, moved)
+        return _format_zoned(np, moved, moved_offsets, string_unit)
+    moved_offsets = table.utcoffset_many(np, moved)
+    return _format_zoned(np, moved + moved_offsets, moved_offsets, string_unit)
+
+
+def _diff(a: Any, b: Any, at_least: str, scalar: Callable, unit: str, tz: Optional[str],
+          workers: Optional[int]) -> Any:
+    if workers is not None:
+        return _parallel(scalar.__name__ + "_many", (a, b), tz, workers)
+    np = _numpy()
+    array_a = np.asarray(a)
+    array_b = np.asarray(b)
+    if tz is not None:
+        values_a, values_b = _diff_zoned(np, array_a, array_b, at_least, unit, tz)
+    else:
+        values_a, _, _ = _to_datetime64(np, array_a, at_least)
+        values_b, _, _ = _to_datetime64(np, array_b, at_least)
+    if values_a is None or values_b is None:
+        if tz is not None:
+            scalar = functools.partial(scalar, tz=tz)
+            array_a, array_b = _as_objects(np, array_a), _as_objects(np, array_b)
+        return _fallback(np, scalar, (array_a, array_b), False).astype(np.int64)
+
+    common = np.promote_types(values_a.dtype, values_b.dtype)
+    values_a = values_a.astype(common)
+    values_b = values_b.astype(common)
+    if unit == "M":
+        return _diff_months(np, values_a, values_b)
+    if unit in _MONTHS:
+        months = _diff_months(np, values_a, values_b)
+        return np.sign(months) * (np.abs(months) // _MONTHS[unit])
+    if unit == "W":
+        days = ((values_b - values_a) // np.timedelta64(1, "D")).astype(np.int64)
+        return np.sign(days) * (np.abs(days) // 7)
+    return ((values_b - values_a) // np.timedelta64(1, unit)).astype(np.int64)
+
+
+def _diff_zoned(np: Any, array_a: Any, array_b: Any, at_least: str, unit: str,
+                tz: str) -> Tuple[Optional[Any], Optional[Any]]:
+    """
+    Both sides on the local time of tz for the calendar units, or on UTC for hours,
+    minutes and seconds, as datetime64[s]
+    """
+    zoned_a = _to_zoned(np, array_a, at_least)
+    zoned_b = _to_zoned(np, array_b, at_least)
+    if zoned_a is None or zoned_b is None or not _zoned_range(np, zoned_a[0]) or not _zoned_range(np, zoned_b[0]):
+        return (None, None)
+    table = _zone_table(tz)
+    sides = []
+    for local, offsets, _ in (zoned_a, zoned_b):
+        utc, wall = _utc_and_wall(np, table, local, offsets)
+        sides.append((wall if unit in _CALENDAR_UNITS else utc).astype("datetime64[s]"))
+    return (sides[0], sides[1])
+
+
+def _boundary(dates: Any, at_least: str, scalar: Callable, unit: str, ceiling: bool, tz: Optional[str],
+              workers: Optional[int]) -> Any:
+    """
+    Truncates each date to the start of its unit, or to its last day or second when
+    ceiling is True, returning the same kinds and formats the scalar functions return
+    """
+    if workers is not None:
+        return _parallel(scalar.__name__ + "_many", (dates,), tz, workers)
+    np = _numpy()
+    array = np.asarray(dates)
+    if tz is not None:
+        return _boundary_zoned(np, array, at_least, functools.partial(scalar, tz=tz), unit, ceiling, tz)
+    values, kind, _ = _to_datetime64(np, array, at_least)
+    if values is None:
+        return _fallback(np, scalar, (array,), array.dtype.kind == "U")
+
+    precision, result = _truncate(np, values, unit, ceiling)
+    if kind != "datetime64" and not _in_range(np, result, kind):
+        return _fallback(np, scalar, (array,), kind == "str")
+    if kind == "datetime64":
+        return result.astype(np.promote_types(values.dtype, result.dtype))
+    if kind == "str":
+        return _from_datetime64(np, result, kind, precision)
+    if kind == "date" and precision == "D":
+        return result.astype(object)
+    return result.astype("datetime64[us]").astype(object)
+
+
+def _boundary_zoned(np: Any, array: Any, at_least: str, scalar: Callable, unit: str, ceiling: bool,
+                    tz: str) -> Any:
+    zoned = _to_zoned(np, array, at_least)
+    if zoned is None:
+        return _fallback(np, scalar, (_as_objects(np, array),), array.dtype.kind == "U")
+    local, offsets, _ = zoned
+    if not _zoned_range(np, local):
+        return _fallback(np, scalar, (array,), True)
+    table = _zone_table(tz)
+    _, wall = _utc_and_wall(np, table, local, offsets)
+    precision, result = _truncate(np, wall.astype("datetime64[s]"), unit, ceiling)
+    seconds = result.astype("datetime64[s]").astype(np.int64)
+    if not _zoned_range(np, seconds):
+        return _fallback(np, scalar, (array,), True)
+    return _format_zoned(np, seconds, table.wall_offset_many(np, seconds), precision)
+
+
+def _truncate(np: Any, values: Any, unit: str, ceiling: bool) -> Tuple[str, Any]:
+    # years, quarters, months and weeks end on a day, days, hours and minutes end on a second
+    precision = "D" if unit in ("Y", "Q", "M", "W") else "s"
+    if unit == "W":
+        # numpy weeks start on Thursday, the weekday of 1970-01-01, ISO weeks on Monday
+        days = values.astype("datetime64[D]")
+        truncated = days - ((days.astype(np.int64) + 3) % 7).astype("timedelta64[D]")
+        following = truncated + np.timedelta64(7, "D")
+    elif unit == "Q":
+        months = values.astype("datetime64[M]")
+        truncated = months - (months.astype(np.int64) % 3).astype("timedelta64[M]")
+        following = truncated + np.timedelta64(3, "M")
+    else:
+        truncated = values.astype("datetime64[%s]" % unit)
+        following = truncated + 1
+    if ceiling:
+        result = following.astype("datetime64[%s]" % precision) - np.timedelta64(1, precision)
+    else:
+        result = truncated.astype("datetime64[%s]" % precision)
+    return (precision, result)
+
+
+def _to_zoned(np: Any, array: Any, at_least: str) -> Optional[Tuple[Any, Optional[Any], str]]:
+    """
+    Splits strings in the same canonical format, all without offset, all with Z or all
+    with +HH:MM, in their local times and UTC offsets in seconds since the epoch, None as
+    the offsets when they have none. Returns None when they are not uniform enough
+    """
+    if array.dtype.kind != "U" or array.size == 0:
+        return None
+    first = str(array.flat[0])
+    split = _split_offset(first)
+    suffix = len(first) - len(split[0]) if split is not None else 0
+    if suffix not in (0, 1, 6) or not (np.char.str_len(array) == len(first)).all():
+        return None
+    # the code points are read on a matrix of one column per character
+    array = array.astype("<U%d" % len(first), copy=False)
+
+    values, _, string_unit = _to_datetime64(np, array.astype("<U%d" % (len(first) - suffix)), at_least)
+    if values is None or string_unit is None:
+        return None
+    local = values.astype("datetime64[s]").astype(np.int64)
+    if suffix == 0:
+        return (local, None, string_unit)
+
+    codes = np.ascontiguousarray(array.reshape(-1)).view(np.uint32).reshape(-1, len(first))[:, -suffix:]
+    if suffix == 1:
+        if not (codes[:, 0] == ord("Z")).all():
+            return None
+        return (local, np.zeros(array.shape, dtype=np.int64), string_unit)
+
+    digits = codes[:, [1, 2, 4, 5]].astype(np.int64) - ord("0")
+    signs = np.where(codes[:, 0] == ord("-"), -1, 1)
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 2] * 10 + digits[:, 3]
+    if not (((codes[:, 0] == ord("+")) | (codes[:, 0] == ord("-"))).all() and (codes[:, 3] == ord(":")).all()
+            and ((digits >= 0) & (digits <= 9)).all() and (hours < 24).all() and (minutes < 60).all()):
+        return None
+    return (local, (signs * (hours * 3600 + minutes * 60)).reshape(array.shape), string_unit)
+
+
+def _utc_and_wall(np: Any, table: Any, local: Any, offsets: Optional[Any]) -> Tuple[Any, Any]:
+    """
+    UTC and local times on the zone of the table, in seconds, of times that are either
+    local on the zone already, when offsets is None, or local on their own offsets
+    """
+    if offsets is None:
+        return (local - table.wall_offset_many(np, local), local)
+    utc = local - offsets
+    return (utc, utc + table.utcoffset_many(np, utc))
+
+
+def _format_zoned(np: Any, wall: Any, offsets: Any, string_unit: str) -> Any:
+    """
+    Formats local times in seconds since the epoch, with their offsets when they have time,
+    formatting each distinct offset only once
+    """
+    text = np.datetime_as_string(wall.astype("datetime64[s]"), unit=string_unit)
+    length = [length for length, unit in _UNITS_BY_LENGTH.items() if unit == string_unit][0]
+    text = text.astype("<U%d" % length)
+    if string_unit in ("Y", "M", "D"):
+        return text
+    unique, inverse = np.unique(offsets, return_inverse=True)
+    suffixes = np.array([_format_offset(datetime.timedelta(seconds=int(offset))) for offset in unique])
+    return np.char.add(text, suffixes[inverse.reshape(offsets.shape)])
+
+
+def _zoned_range(np: Any, seconds: Any) -> bool:
+    # the transitions tables do not reach the last years of the datetime range, checked on
+    # the local times before any lookup, which are less than a day from their UTC times
+    return bool(((seconds >= _ZONED_FIRST) & (seconds < _ZONED_LAST)).all())
+
+
+def _as_objects(np: Any, array: Any) -> Any:
+    # the scalar functions take datetime objects, not numpy datetime64 scalars
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[us]").astype(object)
+    return array
+
+
+def _to_datetime64(np: Any, array: Any, at_least: str) -> Tuple[Optional[Any], str, Optional[str]]:
+    """
+    Converts the input to a datetime64 array, returns None as the array when the input
+    is not uniform enough to be computed in bulk
+    """
+    if array.dtype.kind == "M":
+        if np.datetime_data(array.dtype)[0] in ("Y", "M"):
+            array = array.astype("datetime64[D]")
+        return (array, "datetime64", None)
+
+    if array.dtype.kind == "U":
+        if array.size == 0:
+            return (array.astype("datetime64[D]"), "str", "D")
+        first = str(array.flat[0])
+        unit = _UNITS_BY_LENGTH.get(len(first))
+        # quarters, like 2020-Q2, are as long as months, and are left for the scalar functions too
+        if unit is None or first[5:6] == "Q" or not (np.char.str_len(array) == len(first)).all():
+            return (None, "str", None)
+        # raises the same errors as the scalar functions when the format is not enough
+        _parse(first, at_least)
+        try:
+            values = array.astype("datetime64[%s]" % unit)
+        except ValueError:
+            return (None, "str", None)
+        if not _in_range(np, values, "str") or not (np.datetime_as_string(values, unit=unit) == array).all():
+            return (None, "str", None)
+        return (values, "str", unit)
+
+    if array.dtype.kind == "O" and array.size > 0:
+        items = array.ravel().tolist()
+        if all(type(item) is datetime.datetime and item.tzinfo is None for item in items):
+            return (array.astype("datetime64[us]"), "datetime", None)
+        if all(type(item) is datetime.date for item in items):
+            return (array.astype("datetime64[D]"), "date", None)
+
+    return (None, "object", None)
+
+
+def _from_datetime64(np: Any, values: Any, kind: str, string_unit: Optional[str]) -> Any:
+    if kind == "str":
+        length = [length for length, unit in _UNITS_BY_LENGTH.items() if unit == string_unit][0]
+        return np.datetime_as_string(values, unit=string_unit).astype("<U%d" % length)
+    if kind in ("date", "datetime"):
+        return values.astype(object)
+    return values
+
+
+def _add_months(np: Any, values: Any, months: Any) -> Any:
+    """
+    Adds months to each date, clamping the day to the end of the month the same way
+    relativedelta does, so '2020-01-31' + 1 month is '2020-02-29'
+    """
+    months = months.astype("timedelta64[M]")
+    if np.datetime_data(values.dtype)[0] in ("Y", "M"):
+        return (values.astype("datetime64[M]") + months).astype(values.dtype)
+
+    days = values.astype("datetime64[D]")
+    month_start = values.astype("datetime64[M]")
+    day_of_month = days - month_start.astype("datetime64[D]")
+    time_of_day = values - days
+
+    target_month = month_start + months
+    target_start = target_month.astype("datetime64[D]")
+    days_in_target = (target_month + 1).astype("datetime64[D]") - target_start
+    day_of_month = np.minimum(day_of_month, days_in_target - 1)
+    return (target_start + day_of_month + time_of_day).astype(values.dtype)
+
+
+def _diff_months(np: Any, values_a: Any, values_b: Any) -> Any:
+    """
+    Amount of whole months between each pair of dates, with the same rounding
+    towards zero of relativedelta
+    """
+    months = (values_b.astype("datetime64[M]") - values_a.astype("datetime64[M]")).astype(np.int64)
+    shifted = _add_months(np, values_a, months)
+    forward = values_b >= values_a
+    months = months - (forward & (values_b < shifted))
+    months = months + (~forward & (values_b > shifted))
+    return months
+
+
+def _in_range(np: Any, values: Any, kind: str) -> bool:
+    # strftime does not zero pad years before 1000, so those are left for the scalar functions
+    lowest = "1000-01-01" if kind == "str" else "0001-01-01"
+    return bool(((values >= np.datetime64(lowest)) &
+                 (values <= np.datetime64("9999-12-31T23:59:59.999999"))).all())
+
+
+def _extract(dates: Any, at_least: str, scalar: Callable, compute: Callable, as_strings: bool,
+             workers: Optional[int]) -> Any:
+    """
+    A label or number of each date, from compute on their datetime64 values, or from the
+    scalar function when they cannot be computed in bulk
+    """
+    if workers is not None:
+        return _parallel(scalar.__name__ + "_many", (dates,), None, workers)
+    np = _numpy()
+    array = np.asarray(dates)
+    values, kind, _ = _to_datetime64(np, array, at_least)
+    if values is None or (kind == "datetime64" and not _in_range(np, values, kind)):
+        result = _fallback(np, scalar, (_as_objects(np, array),), as_strings)
+        return result if as_strings else result.astype(np.int64)
+    return compute(np, values)
+
+
+def _years(np: Any, values: Any) -> Any:
+    return values.astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+def _months(np: Any, values: Any) -> Any:
+    return values.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+
+def _days(np: Any, values: Any) -> Any:
+    return (values.astype("datetime64[D]") - values.astype("datetime64[M]")).astype(np.int64) + 1
+
+
+def _hours(np: Any, values: Any) -> Any:
+    return (values.astype("datetime64[h]") - values.astype("datetime64[D]")).astype(np.int64)
+
+
+def _labels(np: Any, values: Any, fields: int, separator: str) -> Any:
+    """
+    The year, month and day of each date joined by separator, up to fields of them, with the
+    years not zero padded, the same way strftime formats them
+    """
+    labels = _years(np, values).astype("<U4")
+    for compute in (_months, _days)[:fields - 1]:
+        labels = np.char.add(np.char.add(labels, separator), np.char.zfill(compute(np, values).astype("<U2"), 2))
+    return labels.astype("<U%d" % (4 + (fields - 1) * (2 + len(separator))))
+
+
+def _weekdays(np: Any, values: Any) -> Any:
+    # 1970-01-01 was a Thursday
+    return (values.astype("datetime64[D]").astype(np.int64) + 3) % 7
+
+
+def _iso_weeks(np: Any, values: Any) -> Any:
+    """
+    ISO week labels, the ISO year being the year of the Thursday of the week
+    """
+    days = values.astype("datetime64[D]").astype(np.int64)
+    thursdays = days - (days + 3) % 7 + 3
+    years = thursdays.astype("datetime64[D]").astype("datetime64[Y]")
+    weeks = (thursdays - years.astype("datetime64[D]").astype(np.int64)) // 7 + 1
+    return np.char.add(np.char.add((years.astype(np.int64) + 1970).astype("<U4"), "-W"),
+                       np.char.zfill(weeks.astype("<U2"), 2))
+
+
+def _quarters(np: Any, values: Any) -> Any:
+    months = values.astype("datetime64[M]").astype(np.int64)
+    return np.char.add(np.char.add((months // 12 + 1970).astype("<U4"), "-Q"), (months % 12 // 3 + 1).astype("<U1"))
+
+
+def _parallel(name: str, arrays: Tuple[Any, ...], tz: Optional[str], workers: int) -> Any:
+    """
+    Runs the _many function with that name on a slice of the arrays per worker, see `yyyy_mm_dd.parallel`
+    """
+    from yyyy_mm_dd.parallel import map_arrays
+    return map_arrays(name, arrays, {} if tz is None else {"tz": tz}, workers)
+
+
+def _fallback(np: Any, scalar: Callable, arrays: Tuple[Any, ...], as_strings: bool) -> Any:
+    result = np.frompyfunc(scalar, len(arrays), 1)(*arrays)
+    if as_strings and result.size > 0 and all(isinstance(item, str) for item in result.ravel().tolist()):
+        return result.astype(str)
+    return result
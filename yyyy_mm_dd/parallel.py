@@ -0,0 +1,145 @@
+"""
+Spreads the work of any yyyy_mm_dd function over several cores, for lists or arrays too
+big for one of them.
+
+The values are split in contiguous chunks, each chunk goes to a worker of a pool, and
+the results are put back together in the same order. Pools are created on first use and
+reused by later calls with the same number of workers, until `shutdown` or the end of the
+program. Processes are used by default, threads on free-threaded Python, where they run
+in parallel too:
+
+>>> parallel_map('move_yyyy_mm', ['2020-01-31', '2020-03-31'], 1, workers=2)
+['2020-02-29', '2020-04-30']
+
+The `_many` functions take `workers` as well, and split their arrays the same way.
+"""
+import atexit
+import os
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import yyyy_mm_dd
+
+_POOLS = {}  # type: Dict[Tuple[str, int], Executor]
+
+# so threads asking for the same pool at once do not each start one
+_POOLS_LOCK = threading.Lock()
+
+# chunks per worker, so a slower chunk does not keep the others waiting at the end
+_CHUNKS_PER_WORKER = 4
+
+
+def parallel_map(function: Union[str, Callable], values: Sequence[Any], *args: Any, workers: Optional[int] = None,
+                 mode: Optional[str] = None, chunk_size: Optional[int] = None) -> List[Any]:
+    """
+    Applies a yyyy_mm_dd function, given by name or itself, to each value followed by args,
+    on workers processes or threads, by default as many as there are cores. Mode is
+    "process" or "thread", by default threads only when Python runs without the GIL.
+    Errors are raised the same as the function would, for the first chunk that fails
+
+    >>> parallel_map(yyyy_mm_dd.diff_yyyy_mm_dd, ['2020-01-01', '2020-02-01'], '2020-03-01', workers=2, mode='thread')
+    [60, 29]
+    >>> parallel_map('_parse', ['2020'])
+    Traceback (most recent call last):
+        ...
+    ValueError: Unknown yyyy_mm_dd function _parse
+    """
+    name = _function_name(function)
+    values = list(values)
+    workers = _workers(workers)
+    if workers == 1 or len(values) < 2:
+        return _map_chunk(name, values, args)
+
+    size = chunk_size or max(1, -(-len(values) // (workers * _CHUNKS_PER_WORKER)))
+    pool = _pool(workers, mode)
+    futures = [pool.submit(_map_chunk, name, values[start:start + size], args) for start in range(0, len(values), size)]
+    results = []  # type: List[Any]
+    for future in futures:
+        results.extend(future.result())
+    return results
+
+
+def map_arrays(name: str, arrays: Tuple[Any, ...], kwargs: Dict[str, Any], workers: int,
+               mode: Optional[str] = None) -> Any:
+    """
+    Calls a _many function on contiguous slices of its arrays, one per worker, and joins
+    the results. Arrays shorter than the longest one, like a single value, are given whole
+    to every slice, for numpy to broadcast them
+    """
+    import numpy as np
+    arrays = tuple(np.asarray(array) for array in arrays)
+    length = max(array.size for array in arrays)
+    workers = _workers(workers)
+    if workers == 1 or length < 2 or any(array.ndim > 1 for array in arrays):
+        return getattr(yyyy_mm_dd, name)(*arrays, **kwargs)
+
+    bounds = [length * i // workers for i in range(workers + 1)]
+    pool = _pool(workers, mode)
+    futures = [
+        pool.submit(_call, name, tuple(array[start:end] if array.size == length else array for array in arrays), kwargs)
+        for start, end in zip(bounds, bounds[1:]) if end > start
+    ]
+    return np.concatenate([future.result() for future in futures])
+
+
+def shutdown() -> None:
+    """
+    Stops the workers of every pool, later calls start new ones
+    """
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def free_threaded() -> bool:
+    """
+    Whether Python runs without the GIL, so threads can use several cores
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _function_name(function: Union[str, Callable]) -> str:
+    name = function if isinstance(function, str) else getattr(function, "__name__", "")
+    if name.startswith("_") or getattr(yyyy_mm_dd, name, None) is None or \
+            (not isinstance(function, str) and getattr(yyyy_mm_dd, name) is not function):
+        raise ValueError("Unknown yyyy_mm_dd function %s" % (name or function))
+    return name
+
+
+def _workers(workers: Optional[int]) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers should be at least 1, got %d" % workers)
+    return workers
+
+
+def _pool(workers: int, mode: Optional[str]) -> Executor:
+    if mode is None:
+        mode = "thread" if free_threaded() else "process"
+    elif mode not in ("process", "thread"):
+        raise ValueError("mode should be process or thread, got %r" % mode)
+    with _POOLS_LOCK:
+        pool = _POOLS.get((mode, workers))
+        if pool is None:
+            executor = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor  # type: Callable[..., Executor]
+            pool = executor(max_workers=workers)
+            _POOLS[(mode, workers)] = pool
+    return pool
+
+
+def _map_chunk(name: str, values: List[Any], args: Tuple[Any, ...]) -> List[Any]:
+    function = getattr(yyyy_mm_dd, name)
+    return [function(value, *args) for value in values]
+
+
+def _call(name: str, arrays: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    return getattr(yyyy_mm_dd, name)(*arrays, **kwargs)
+
+
+atexit.register(shutdown)
@@ -0,0 +1,202 @@
+"""
+Pruning of date partitioned paths, like the keys of a data lake, by a range of days
+without parsing the date of each key.
+
+A range is compiled once into the minimal set of prefixes that cover exactly its days
+for a path template, say `dt=2020` for a whole year and `dt=2020051` for the 10th to
+the 19th of a month. Those prefixes are what to list on the storage, and keys are
+matched against them with a single binary search:
+
+>>> pruner = PartitionPruner('2020-05-10', '2020-07-01', root='events/')
+>>> pruner.prefixes
+['events/dt=2020051', 'events/dt=2020052', 'events/dt=2020053', 'events/dt=202006']
+>>> list(pruner.filter(['events/dt=20200509/a.parquet', 'events/dt=20200614/b.parquet']))
+['events/dt=20200614/b.parquet']
+
+Ranges include the start day and exclude the end day, the same as the range functions,
+so there are `diff_yyyy_mm_dd(start, end)` days in it. The templates can have `{yyyymmdd}`,
+`{yyyy_mm_dd}` or `{yyyy}`, `{mm}` and `{dd}`, in this order.
+"""
+import bisect
+import datetime
+import re
+from typing import Iterable, Iterator, List, Optional, Union
+
+from yyyy_mm_dd import _TWO_DIGITS, _day_ordinal, _from_ordinal, from_yyyymmdd
+
+_FIELDS = {
+    "yyyymmdd": "ymd",
+    "yyyy_mm_dd": "ymd",
+    "yyyy": "y",
+    "mm": "m",
+    "dd": "d",
+}
+
+_FIRST_ORDINAL = datetime.date(1000, 1, 1).toordinal()
+
+_LAST_ORDINAL = datetime.date(9999, 12, 31).toordinal()
+
+
+class PartitionPruner:
+    """
+    Compiled range of days for a path template, reusable for any number of keys
+
+    >>> PartitionPruner('20191230', '20200301', template='{yyyy}/{mm}/{dd}').prefixes
+    ['2019/12/3', '2020/01', '2020/02']
+    """
+    __slots__ = ("template", "root", "prefixes")
+
+    def __init__(self, start: Union[str, datetime.date], end: Union[str, datetime.date],
+                 template: str = "dt={yyyymmdd}", root: str = "") -> None:
+        self.template = template
+        self.root = root
+        self.prefixes = [root + prefix for prefix in partition_prefixes(start, end, template)]
+
+    def matches(self, key: str) -> bool:
+        """
+        Whether the key starts with one of the prefixes
+
+        >>> pruner = PartitionPruner('2020-05-14', '2020-05-15')
+        >>> pruner.matches('dt=20200514/part-0.csv'), pruner.matches('dt=20200515/part-0.csv')
+        (True, False)
+        """
+        # the prefixes are sorted and none is a prefix of another, so the only candidate
+        # is the last one sorting before the key
+        position = bisect.bisect_right(self.prefixes, key)
+        return position > 0 and key.startswith(self.prefixes[position - 1])
+
+    def filter(self, keys: Iterable[str]) -> Iterator[str]:
+        """
+        Keys that fall on the range, lazily
+        """
+        matches = self.matches
+        return (key for key in keys if matches(key))
+
+
+def partition_prefixes(start: Union[str, datetime.date], end: Union[str, datetime.date],
+                       template: str = "dt={yyyymmdd}") -> List[str]:
+    """
+    Minimal sorted set of prefixes of the paths of the days from start up to, but not
+    including, end. Dates can also be given as yyyymmdd
+
+    >>> partition_prefixes('2020-01-01', '2021-01-01')
+    ['dt=2020']
+    >>> partition_prefixes('2020-02-20', '2020-03-02', template='year={yyyy}/month={mm}/day={dd}')
+    ['year=2020/month=02/day=2', 'year=2020/month=03/day=01']
+    >>> partition_prefixes('2020-05', '2020-06', template='{dd}/{mm}/{yyyy}')
+    Traceback (most recent call last):
+        ...
+    ValueError: Partition template should have the year, month and day in this order, got '{dd}/{mm}/{yyyy}'
+    """
+    _check_template(template)
+    first = _bound_ordinal(start)
+    last = _bound_ordinal(end) - 1
+    if last < first:
+        return []
+
+    return _prefixes(template, first, last)
+
+
+def _cover(template: str, low: int, high: int, depth: int, prefixes: List[str]) -> None:
+    """
+    Adds the prefixes covering the days from ordinal low to high, whose paths share their
+    first depth characters. Paths sort in the same order as their days, so the days under a
+    prefix are consecutive, and it covers only days of the range when the days right before
+    and after the block do not start with it. Each block of days sharing one more character
+    is found with a binary search, rendering a few paths per prefix instead of one per day
+
+    >>> import random
+    >>> random.seed(1)
+    >>> bounds = [sorted(random.sample(range(_FIRST_ORDINAL, _FIRST_ORDINAL + 1500), 2)) for _ in range(10)]
+    >>> bounds += [sorted(random.sample(range(_LAST_ORDINAL - 1500, _LAST_ORDINAL + 1), 2)) for _ in range(10)]
+    >>> all(_prefixes(template, first, last) == _prefixes_of_days(template, first, last)
+    ...     for first, last in bounds for template in ('dt={yyyymmdd}', '{yyyy}/{mm}/{dd}', 'd={yyyy_mm_dd}'))
+    True
+    """
+    path = _render(template, low)
+    prefix = path[:depth]
+    before = _render(template, low - 1) if low > _FIRST_ORDINAL else None
+    after = _render(template, high + 1) if high < _LAST_ORDINAL else None
+    if depth == len(path) or ((before is None or not before.startswith(prefix)) and
+                              (after is None or not after.startswith(prefix))):
+        prefixes.append(prefix)
+        return
+
+    start = low
+    while start <= high:
+        head = _render(template, start)[:depth + 1]
+        stop, highest = start, high
+        while stop < highest:
+            middle = (stop + highest + 1) // 2
+            if _render(template, middle)[:depth + 1] == head:
+                stop = middle
+            else:
+                highest = middle - 1
+        _cover(template, start, stop, depth + 1, prefixes)
+        start = stop + 1
+
+
+def _prefixes(template: str, first: int, last: int) -> List[str]:
+    prefixes = []  # type: List[str]
+    _cover(template, first, last, 0, prefixes)
+    return prefixes
+
+
+def _prefixes_of_days(template: str, first: int, last: int) -> List[str]:
+    """
+    The same prefixes as _cover, going through the path of every day, as a reference for it
+    """
+    paths = [_render(template, ordinal) for ordinal in range(first, last + 1)]
+    before = _render(template, first - 1) if first > _FIRST_ORDINAL else None
+    after = _render(template, last + 1) if last < _LAST_ORDINAL else None
+    prefixes = []  # type: List[str]
+    _cover_paths(paths, 0, len(paths), 0, before, after, prefixes)
+    return prefixes
+
+
+def _cover_paths(paths: List[str], low: int, high: int, depth: int, before: Optional[str], after: Optional[str],
+                 prefixes: List[str]) -> None:
+    prefix = paths[low][:depth]
+    if depth == len(paths[low]) or ((before is None or not before.startswith(prefix)) and
+                                    (after is None or not after.startswith(prefix))):
+        prefixes.append(prefix)
+        return
+
+    start = low
+    while start < high:
+        character = paths[start][depth]
+        stop = start + 1
+        while stop < high and paths[stop][depth] == character:
+            stop += 1
+        _cover_paths(paths, start, stop, depth + 1,
+                     paths[start - 1] if start > low else before,
+                     paths[stop] if stop < high else after,
+                     prefixes)
+        start = stop
+
+
+def _check_template(template: str) -> None:
+    fields = re.findall(r"{(\w+)}", template)
+    if any(field not in _FIELDS for field in fields):
+        raise ValueError("Partition template can only have %s, got %r" % (
+            ", ".join("{%s}" % field for field in _FIELDS), template))
+    if "".join(_FIELDS[field] for field in fields) != "ymd":
+        raise ValueError("Partition template should have the year, month and day in this order, got %r" % template)
+
+
+def _bound_ordinal(yyyy_mm_dd: Union[str, datetime.date]) -> int:
+    """
+    Ordinal of a start or end date, which can also be given as yyyymmdd
+    """
+    if isinstance(yyyy_mm_dd, str) and len(yyyy_mm_dd) == 8 and yyyy_mm_dd.isdigit():
+        yyyy_mm_dd = from_yyyymmdd(yyyy_mm_dd)
+    ordinal = _day_ordinal(yyyy_mm_dd)
+    if ordinal < _FIRST_ORDINAL:
+        raise ValueError("Partitions can only be pruned from the year 1000, got %r" % (yyyy_mm_dd,))
+    return ordinal
+
+
+def _render(template: str, ordinal: int) -> str:
+    year, month, day = _from_ordinal(ordinal)
+    yyyy, mm, dd = str(year), _TWO_DIGITS[month], _TWO_DIGITS[day]
+    return template.format(yyyymmdd=yyyy + mm + dd, yyyy_mm_dd=yyyy + "-" + mm + "-" + dd, yyyy=yyyy, mm=mm, dd=dd)
@@ -0,0 +1,230 @@
+"""
+Years, months and days as values of their own, to step through them without parsing and
+formatting a string on every step.
+
+A `Period` keeps only its unit and a single integer: the year for `yyyy`, the months since
+the year 0 for `yyyy_mm` and the proleptic Gregorian ordinal for `yyyy_mm_dd`. Moving is an
+addition, the difference between two periods a subtraction, and the string is only
+formatted when it is asked for, once:
+
+>>> month = Period('2020-11-14', 'yyyy_mm')
+>>> month, month + 2, str(month - 11)
+(Period('2020-11', 'yyyy_mm'), Period('2021-01', 'yyyy_mm'), '2019-12')
+>>> (month + 2).start, (month + 2).end
+('2021-01-01', '2021-01-31')
+>>> Period('2021-03', 'yyyy_mm') - month
+4
+"""
+import datetime
+import numbers
+from typing import Any, Dict, Optional, Union
+
+from yyyy_mm_dd import (
+    _TWO_DIGITS, _days_in_month, _format_yyyy_mm_dd, _from_ordinal, _ordinal, _parse, _split_canonical,
+)
+
+_AT_LEAST = {
+    "yyyy": "%Y",
+    "yyyy_mm": "%Y-%m",
+    "yyyy_mm_dd": "%Y-%m-%d",
+}  # type: Dict[str, str]
+
+_MIN_ORDINAL = {
+    "yyyy": 1,
+    "yyyy_mm": 12,
+    "yyyy_mm_dd": 1,
+}  # type: Dict[str, int]
+
+_MAX_ORDINAL = {
+    "yyyy": 9999,
+    "yyyy_mm": 9999 * 12 + 11,
+    "yyyy_mm_dd": datetime.date.max.toordinal(),
+}  # type: Dict[str, int]
+
+
+class Period:
+    """
+    A year, month or day, from any date or string the library accepts, with unit one of
+    yyyy, yyyy_mm or yyyy_mm_dd. Periods are immutable, with read only unit and ordinal, and
+    hashable, so they can be used as dict keys. They only compare to periods of the same unit
+
+    >>> Period(datetime.date(2020, 5, 14), 'yyyy') == Period('2020', 'yyyy')
+    True
+    >>> Period('2020-05', 'yyyy_mm_dd')
+    Traceback (most recent call last):
+        ...
+    ValueError: Could not parse date for operation, you should provide at least %Y-%m-%d
+    >>> Period('2020', 'yyyy')._ordinal = 2021
+    Traceback (most recent call last):
+        ...
+    AttributeError: Periods are immutable
+    """
+    __slots__ = ("_unit", "_ordinal", "_string")
+
+    def __init__(self, yyyy_mm_dd: Union[str, datetime.date], unit: str = "yyyy_mm_dd") -> None:
+        at_least = _at_least(unit)
+        fields = _split_canonical(yyyy_mm_dd, len(at_least) + 2) if isinstance(yyyy_mm_dd, str) else None
+        if fields is None:
+            date, _ = _parse(yyyy_mm_dd, at_least=at_least)
+            fields = (date.year, date.month, date.day)
+        year, month, day = fields
+        if unit == "yyyy":
+            ordinal = year
+        elif unit == "yyyy_mm":
+            ordinal = year * 12 + month - 1
+        else:
+            ordinal = _ordinal(year, month, day)
+        self._unit = unit
+        self._ordinal = ordinal
+        self._string = None  # type: Optional[str]
+
+    @classmethod
+    def from_ordinal(cls, ordinal: int, unit: str = "yyyy_mm_dd") -> "Period":
+        """
+        The period of a unit with the given ordinal
+
+        >>> Period.from_ordinal(2020 * 12 + 4, 'yyyy_mm')
+        Period('2020-05', 'yyyy_mm')
+        """
+        _at_least(unit)
+        return cls._create(unit, ordinal)
+
+    @classmethod
+    def _create(cls, unit: str, ordinal: int) -> "Period":
+        if not _MIN_ORDINAL[unit] <= ordinal <= _MAX_ORDINAL[unit]:
+            raise OverflowError("date value out of range")
+        period = cls.__new__(cls)
+        object.__setattr__(period, "_unit", unit)
+        object.__setattr__(period, "_ordinal", ordinal)
+        object.__setattr__(period, "_string", None)
+        return period
+
+    @property
+    def unit(self) -> str:
+        return self._unit
+
+    @property
+    def ordinal(self) -> int:
+        return self._ordinal
+
+    @property
+    def start(self) -> str:
+        """
+        The first moment of the period, the same as the start_of function of its unit
+
+        >>> Period('2020-05-14', 'yyyy_mm_dd').start
+        '2020-05-14T00:00:00'
+        """
+        if self._unit == "yyyy":
+            return str(self._ordinal) + "-01-01"
+        if self._unit == "yyyy_mm":
+            year, month = divmod(self._ordinal, 12)
+            return str(year) + "-" + _TWO_DIGITS[month + 1] + "-01"
+        return _format_yyyy_mm_dd(*_from_ordinal(self._ordinal)) + "T00:00:00"
+
+    @property
+    def end(self) -> str:
+        """
+        The last moment of the period, the same as the end_of function of its unit
+
+        >>> Period('2020-02', 'yyyy_mm').end, Period('2020-05-14', 'yyyy_mm_dd').end
+        ('2020-02-29', '2020-05-14T23:59:59')
+        """
+        if self._unit == "yyyy":
+            return str(self._ordinal) + "-12-31"
+        if self._unit == "yyyy_mm":
+            year, month = divmod(self._ordinal, 12)
+            return str(year) + "-" + _TWO_DIGITS[month + 1] + "-" + _TWO_DIGITS[_days_in_month(year, month + 1)]
+        return _format_yyyy_mm_dd(*_from_ordinal(self._ordinal)) + "T23:59:59"
+
+    def __str__(self) -> str:
+        if self._string is None:
+            if self._unit == "yyyy":
+                string = str(self._ordinal)
+            elif self._unit == "yyyy_mm":
+                year, month = divmod(self._ordinal, 12)
+                string = str(year) + "-" + _TWO_DIGITS[month + 1]
+            else:
+                string = _format_yyyy_mm_dd(*_from_ordinal(self._ordinal))
+            object.__setattr__(self, "_string", string)
+        return string
+
+    def __repr__(self) -> str:
+        return "Period(%r, %r)" % (str(self), self._unit)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # only __init__ sets them, so the hash of a period used as a dict key never changes
+        if hasattr(self, name):
+            raise AttributeError("Periods are immutable")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Periods are immutable")
+
+    def __add__(self, by: int) -> "Period":
+        """
+        >>> import numpy
+        >>> Period('2020-05', 'yyyy_mm') + numpy.int64(2)
+        Period('2020-07', 'yyyy_mm')
+        """
+        if not isinstance(by, numbers.Integral):
+            return NotImplemented
+        return Period._create(self._unit, self._ordinal + int(by))
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> Any:
+        """
+        An earlier period when given an int, and the amount of units between the two,
+        the same as the diff function of the unit, when given another period
+
+        >>> Period('2020', 'yyyy') - Period('2018-12-31', 'yyyy')
+        2
+        """
+        if isinstance(other, numbers.Integral):
+            return Period._create(self._unit, self._ordinal - int(other))
+        if isinstance(other, Period):
+            if other._unit != self._unit:
+                raise ValueError("Could not subtract periods of different units, got %s and %s" % (
+                    self._unit, other._unit))
+            return self._ordinal - other._ordinal
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self._unit, self._ordinal))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Period):
+            return NotImplemented
+        return self._unit == other._unit and self._ordinal == other._ordinal
+
+    def __ne__(self, other: Any) -> bool:
+        if not isinstance(other, Period):
+            return NotImplemented
+        return self._unit != other._unit or self._ordinal != other._ordinal
+
+    def __lt__(self, other: Any) -> bool:
+        return self._key(other) < other._ordinal
+
+    def __le__(self, other: Any) -> bool:
+        return self._key(other) <= other._ordinal
+
+    def __gt__(self, other: Any) -> bool:
+        return self._key(other) > other._ordinal
+
+    def __ge__(self, other: Any) -> bool:
+        return self._key(other) >= other._ordinal
+
+    def __reduce__(self) -> Any:
+        return (Period.from_ordinal, (self._ordinal, self._unit))
+
+    def _key(self, other: Any) -> int:
+        if not isinstance(other, Period) or other._unit != self._unit:
+            raise TypeError("Periods can only be compared to periods of the same unit, got %r and %r" % (self, other))
+        return self._ordinal
+
+
+def _at_least(unit: str) -> str:
+    if unit not in _AT_LEAST:
+        raise ValueError("Period unit should be one of %s, got %r" % (", ".join(_AT_LEAST), unit))
+    return _AT_LEAST[unit]
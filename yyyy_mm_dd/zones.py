@@ -0,0 +1,291 @@
+"""
+Tables of UTC offset transitions for IANA time zones, so the functions taking a `tz`
+can resolve offsets with a binary search instead of going through zoneinfo on every call.
+
+A table is built once per zone name and extended a decade at a time, as dates of other
+decades are looked up, leaving out the decades in between. The instants of the transitions are read from the TZif file of the
+zone, the same one zoneinfo loads, and the offsets from zoneinfo itself. After the last
+transition of the file, offsets follow the daylight saving rule of its footer, and those
+changes are found by sampling zoneinfo once a day and bisecting down to the second. Local
+times are resolved with fold=0, the same as zoneinfo: ambiguous times take the offset
+before the transition, and so do times skipped by it.
+
+>>> berlin = zone_table('Europe/Berlin')
+>>> berlin.utcoffset(datetime.datetime(2021, 3, 28, 1, 0))
+7200
+>>> berlin.wall_offset(datetime.datetime(2021, 10, 31, 2, 30))
+7200
+>>> berlin.wall_offset(datetime.datetime(2021, 10, 31, 3, 0))
+3600
+"""
+import bisect
+import datetime
+import functools
+import os
+import struct
+from typing import Any, List, Optional, Set, Tuple
+
+from yyyy_mm_dd import _epoch_seconds
+
+_UTC_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+_DAY = 86400
+
+# a footer rule changes the offset twice a year at most, months apart, so sampling once a
+# day finds every change. Zones without a readable TZif file are sampled the same way
+_STEP = _DAY
+
+# zoneinfo cannot represent the edges of the datetime range, so those go to it directly
+_FIRST_YEAR = 2
+
+_LAST_YEAR = 9998
+
+
+@functools.lru_cache(maxsize=None)
+def zone_table(name: str) -> "ZoneTable":
+    """
+    Returns the table of a zone, creating it the first time
+
+    >>> zone_table('Mars/Olympus_Mons')
+    Traceback (most recent call last):
+        ...
+    ValueError: Unknown time zone Mars/Olympus_Mons
+    """
+    return ZoneTable(name)
+
+
+class ZoneTable:
+    """
+    UTC offsets of a zone, in seconds. `transitions` are the instants, in seconds since
+    the epoch, from which each of the `offsets` apply, and `wall_transitions` the local
+    times from which they apply with fold=0
+    """
+    __slots__ = ("name", "transitions", "offsets", "wall_transitions", "_zone", "_decades", "_arrays",
+                 "_listed", "_ruled")
+
+    def __init__(self, name: str) -> None:
+        zoneinfo = _zoneinfo()
+        try:
+            self._zone = zoneinfo.ZoneInfo(name)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            raise ValueError("Unknown time zone %s" % name)
+        self.name = name
+        self.transitions = []  # type: List[int]
+        self.offsets = []  # type: List[int]
+        self.wall_transitions = []  # type: List[int]
+        # the decades covered, as year // 10, each starting with the offset of its first instant
+        self._decades = set()  # type: Set[int]
+        self._arrays = None  # type: Optional[Any]
+        # transitions listed on the TZif file, and whether a rule changes offsets after them
+        tzif = _tzif(zoneinfo, name)
+        self._listed, self._ruled = _read_tzif(tzif) if tzif is not None else (None, True)
+
+    def __repr__(self) -> str:
+        return "<ZoneTable %s with %d transitions>" % (self.name, len(self.transitions))
+
+    def utcoffset(self, utc: datetime.datetime) -> int:
+        """
+        Offset of the zone at a naive UTC datetime
+        """
+        if not self._cover(utc.year):
+            return _seconds(self._zone.fromutc(utc.replace(tzinfo=self._zone)).utcoffset())
+        return self.offsets[bisect.bisect_right(self.transitions, _epoch_seconds(utc)) - 1]
+
+    def wall_offset(self, wall: datetime.datetime) -> int:
+        """
+        Offset of the zone at a naive local datetime, with fold=0
+        """
+        if not self._cover(wall.year):
+            return _seconds(wall.replace(tzinfo=self._zone, fold=0).utcoffset())
+        return self.offsets[bisect.bisect_right(self.wall_transitions, _epoch_seconds(wall)) - 1]
+
+    def utcoffset_many(self, np: Any, seconds: Any) -> Any:
+        """
+        Offsets at an array of UTC instants in seconds since the epoch
+        """
+        transitions, wall_transitions, offsets = self._numpy(np, seconds)
+        return offsets[np.searchsorted(transitions, seconds, side="right") - 1]
+
+    def wall_offset_many(self, np: Any, seconds: Any) -> Any:
+        """
+        Offsets at an array of local times in seconds since the epoch, with fold=0
+        """
+        transitions, wall_transitions, offsets = self._numpy(np, seconds)
+        return offsets[np.searchsorted(wall_transitions, seconds, side="right") - 1]
+
+    def _numpy(self, np: Any, seconds: Any) -> Any:
+        if seconds.size:
+            years = np.unique(seconds.astype("datetime64[s]").astype("datetime64[Y]").astype(np.int64) + 1970)
+            if years[0] < _FIRST_YEAR or years[-1] > _LAST_YEAR:
+                raise ValueError("Dates with time zone must be between years %d and %d" % (_FIRST_YEAR, _LAST_YEAR))
+            for year in years.tolist():
+                self._cover(year)
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self.transitions, dtype=np.int64),
+                np.array(self.wall_transitions, dtype=np.int64),
+                np.array(self.offsets, dtype=np.int64),
+            )
+        return self._arrays
+
+    def _cover(self, year: int) -> bool:
+        """
+        Extends the table to the decades around year, returns False when it is out of the
+        range the table can hold. Only the missing decades are sampled, so a far year does
+        not fill the years between it and the ones already covered
+
+        >>> table = ZoneTable('Europe/Berlin')
+        >>> table._cover(2021), table._cover(9000), sorted(table._decades)
+        (True, True, [202, 899, 900])
+        >>> table.utcoffset(datetime.datetime(9000, 6, 1)), table.utcoffset(datetime.datetime(2021, 1, 1))
+        (7200, 3600)
+        """
+        if (year - 1) // 10 in self._decades and (year + 1) // 10 in self._decades:
+            return True
+        if year - 1 < _FIRST_YEAR or year + 1 > _LAST_YEAR:
+            return False
+
+        transitions, offsets = self.transitions, self.offsets
+        missing = [decade for decade in range((year - 1) // 10, (year + 1) // 10 + 1) if decade not in self._decades]
+        for first, last in _runs(missing):
+            # each run starts with an entry of its first instant, so it never takes the offset
+            # of the last transition of an earlier decade that is not covered
+            sampled, sampled_offsets = self._sample(max(_FIRST_YEAR, first * 10), min(_LAST_YEAR, last * 10 + 9))
+            position = bisect.bisect_left(transitions, sampled[0])
+            transitions = transitions[:position] + sampled + transitions[position:]
+            offsets = offsets[:position] + sampled_offsets + offsets[position:]
+
+        wall_transitions = [transitions[0] + offsets[0]]
+        for i in range(1, len(transitions)):
+            wall_transitions.append(transitions[i] + max(offsets[i - 1], offsets[i]))
+        self.transitions = transitions
+        self.offsets = offsets
+        self.wall_transitions = wall_transitions
+        self._decades.update(missing)
+        self._arrays = None
+        return True
+
+    def _sample(self, first: int, last: int) -> Tuple[List[int], List[int]]:
+        """
+        Finds the transitions from the start of year first to the end of year last, from
+        the TZif file, and after its last transition or without one by sampling the offset
+        once a day and bisecting each change down to the second
+        """
+        start = _epoch_seconds(datetime.datetime(first, 1, 1))
+        end = _epoch_seconds(datetime.datetime(last + 1, 1, 1))
+        transitions = [start]
+        offsets = [self._offset(start)]
+        if self._listed is not None:
+            for transition in self._listed[bisect.bisect_right(self._listed, start):bisect.bisect_left(self._listed, end)]:
+                offset = self._offset(transition)
+                if offset != offsets[-1]:
+                    transitions.append(transition)
+                    offsets.append(offset)
+            start = max(start, self._listed[-1]) if self._listed else start
+            if not self._ruled or start >= end:
+                return (transitions, offsets)
+
+        previous = start
+        for sample in list(range(start + _STEP, end, _STEP)) + [end - 1]:
+            # more than one change can fall between two samples, each is bisected in turn
+            while self._offset(sample) != offsets[-1]:
+                low, high = previous, sample
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if self._offset(middle) == offsets[-1]:
+                        low = middle
+                    else:
+                        high = middle
+                transitions.append(high)
+                offsets.append(self._offset(high))
+                previous = high
+            previous = sample
+        return (transitions, offsets)
+
+    def _offset(self, seconds: int) -> int:
+        return _seconds((_UTC_EPOCH + datetime.timedelta(seconds=seconds)).astimezone(self._zone).utcoffset())
+
+
+def _runs(decades: List[int]) -> List[Tuple[int, int]]:
+    """
+    First and last of each run of consecutive decades
+
+    >>> _runs([201, 202, 204])
+    [(201, 202), (204, 204)]
+    """
+    runs = []  # type: List[Tuple[int, int]]
+    for decade in decades:
+        if runs and runs[-1][1] == decade - 1:
+            runs[-1] = (runs[-1][0], decade)
+        else:
+            runs.append((decade, decade))
+    return runs
+
+
+def _tzif(zoneinfo: Any, name: str) -> Optional[bytes]:
+    """
+    Contents of the TZif file of a zone, looked up the same way zoneinfo does, on its
+    TZPATH and then on the tzdata package, None when it cannot be found
+    """
+    if os.path.normpath(name) != name or name.startswith("/"):
+        return None
+    for directory in zoneinfo.TZPATH:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as file:
+                return file.read()
+    try:
+        import importlib.resources
+        package, _, resource = ("tzdata.zoneinfo/" + name).rpartition("/")
+        package = package.replace("/", ".")
+        if hasattr(importlib.resources, "files"):
+            return importlib.resources.files(package).joinpath(resource).read_bytes()
+        return importlib.resources.read_binary(package, resource)  # type: ignore
+    except (ImportError, OSError):
+        return None
+
+
+def _read_tzif(data: bytes) -> Tuple[Optional[List[int]], bool]:
+    """
+    Instants of the transitions of a TZif file, RFC 8536, from its 64 bit data when it
+    has some, and whether its footer has a daylight saving rule that changes offsets
+    after them. Returns None as the transitions when the file cannot be read
+
+    >>> header = b'TZif2' + bytes(15) + struct.pack('>6l', 0, 0, 0, 1, 1, 4)
+    >>> v1 = header + struct.pack('>lBlBB', -100, 0, 3600, 0, 0) + b'ABC\\0'
+    >>> _read_tzif(v1 + header + struct.pack('>qBlBB', -100, 0, 3600, 0, 0) + b'ABC\\0' + b'\\nABC-1\\n')
+    ([-100], False)
+    """
+    if data[:4] != b"TZif" or len(data) < 44:
+        return (None, True)
+    version = data[4:5]
+    size = 4
+    position = 0
+    while True:
+        if data[position:position + 4] != b"TZif":
+            return (None, True)
+        isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = struct.unpack(">6l", data[position + 20:position + 44])
+        position += 44
+        length = timecnt * size + timecnt + typecnt * 6 + charcnt + leapcnt * (size + 4) + isstdcnt + isutcnt
+        if version == b"\0" or size == 8:
+            break
+        # version 2 and later repeat the data with 64 bit times after the 32 bit one
+        position += length
+        size = 8
+    transitions = list(struct.unpack(">%d%s" % (timecnt, "q" if size == 8 else "l"),
+                                     data[position:position + timecnt * size]))
+    footer = data[position + length:].strip(b"\n")
+    return (transitions, size == 4 or b"," in footer)
+
+
+def _zoneinfo() -> Any:
+    try:
+        import zoneinfo
+    except ImportError:
+        from backports import zoneinfo  # type: ignore
+    return zoneinfo
+
+
+def _seconds(delta: Optional[datetime.timedelta]) -> int:
+    return (delta.days * _DAY + delta.seconds) if delta is not None else 0
+